@@ -0,0 +1,356 @@
+# benchmark.py
+"""
+Benchmarks del motor de reglas, la IA y la carga de cartas/imágenes.
+
+Todo corre sin internet: el catálogo sale del fixture y la "red" es stub_api.StubAPI.
+Los resultados se imprimen y se pueden guardar en JSON; con --baseline se comparan contra
+una corrida anterior y el programa termina con código 1 si algo empeoró más de la tolerancia.
+Cada métrica es la mediana de --runs corridas (5 con --quick, donde cada corrida dura
+milisegundos y el ruido de la máquina pesa más); con --quick la tolerancia por defecto es 50%.
+
+Ejemplos:
+    python benchmark.py --output baseline.json
+    python benchmark.py --baseline baseline.json --tolerance 0.25
+    python benchmark.py --quick --only fight ai_latency
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(current_dir)
+
+from controller.ai_minimax import MinimaxAI
+from model.async_card_api import SyncCardAPI
+from model.card_catalog import CardCatalog
+from model.card_model import Card, CardAPI
+from model.card_queue import CardQueue
+from model.card_sampler import MonsterSampler
+from model.deck_builder import DeckBuilder
+from model.game_model import GameModel
+from model.http_client import HttpClient
+from stub_api import StubAPI
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Registra una función de benchmark: recibe el contexto y retorna {métrica: (valor, unidad, mejor)}."""
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+def lower(value, unit):
+    return value, unit, "lower"
+
+
+def higher(value, unit):
+    return value, unit, "higher"
+
+
+def best_time(fn, repeat=5):
+    """Mejor tiempo (s) de varias corridas de fn()."""
+    best = None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+class Context:
+    def __init__(self, quick, seed, stub):
+        self.quick = quick
+        self.seed = seed
+        self.stub = stub
+        self.catalog = CardCatalog(db_path=":memory:")
+        self.sampler = MonsterSampler(self.catalog, seed=seed)
+
+    def scale(self, n):
+        return max(1, n // 10) if self.quick else n
+
+    def random_cards(self, n, rng):
+        return [Card(*rng.choice(self.catalog.monster_rows())) for _ in range(n)]
+
+    def position(self, hand_size, queue_size, rng):
+        """Modelo con manos de hand_size cartas y colas de queue_size (para la IA)."""
+        model = GameModel()
+        model.user_cards = self.random_cards(hand_size, rng)
+        model.machine_cards = self.random_cards(hand_size, rng)
+        model.config_queues(queue_size)
+        for card in self.random_cards(queue_size, rng):
+            model.user_queue.push(card)
+        for card in self.random_cards(queue_size, rng):
+            model.machine_queue.push(card)
+        return model
+
+
+# --- Motor de reglas ---
+
+@benchmark("fight")
+def bench_fight(ctx):
+    rng = random.Random(ctx.seed)
+    n = ctx.scale(200000)
+    cards = ctx.random_cards(64, rng)
+    pairs = [(rng.choice(cards), rng.choice(cards), rng.choice(("attack", "defense")), rng.choice(("attack", "defense")))
+             for _ in range(1024)]
+    model = GameModel()
+
+    def run():
+        fight = model.fight_round
+        for k in range(n):
+            u, m, mu, mm = pairs[k & 1023]
+            model.user_life = model.machine_life = 8000
+            fight(u, m, mu, mm, 0, 0)
+
+    metrics = {"fight_round": higher(n / best_time(run, 3), "fights/s")}
+
+    try:
+        import numpy as np
+        from model.fight_batch import fight_round_batch
+    except ImportError:
+        return metrics
+
+    size = ctx.scale(1000000)
+    arr = np.random.default_rng(ctx.seed).integers(0, 4000, size=(4, size))
+    modes = np.random.default_rng(ctx.seed + 1).integers(0, 2, size=(2, size))
+    elapsed = best_time(lambda: fight_round_batch(arr[0], arr[1], arr[2], arr[3], modes[0], modes[1]), 3)
+    metrics["fight_round_batch"] = higher(size / elapsed, "fights/s")
+    return metrics
+
+
+@benchmark("queue")
+def bench_queue(ctx):
+    n = ctx.scale(1000000)
+    card = Card("x", 1000, 1000, None)
+    queue = CardQueue(n)
+
+    def run():
+        push, draw = queue.push, queue.draw
+        for _ in range(n):
+            push(card)
+        for _ in range(n):
+            draw()
+
+    return {"push_draw": higher(2 * n / best_time(run, 3), "ops/s")}
+
+
+# --- IA ---
+
+@benchmark("ai_latency")
+def bench_ai_latency(ctx):
+    metrics = {}
+    positions = ctx.scale(200)
+    depths = (1, 2, 3) if ctx.quick else (1, 2, 3, 4)
+    for hand_size in (5, 8):
+        rng = random.Random(ctx.seed)
+        models = [ctx.position(hand_size, 8, rng) for _ in range(positions)]
+        modes = [rng.choice(("attack", "defense")) for _ in range(positions)]
+        for depth in depths:
+            ai = MinimaxAI(max_depth=depth, seed=ctx.seed)
+            times = []
+            for model, mode in zip(models, modes):
+                t = time.perf_counter()
+                ai.get_best_move(model, model.user_cards[0], mode)
+                times.append((time.perf_counter() - t) * 1000)
+            metrics[f"h{hand_size}_d{depth}_median"] = lower(statistics.median(times), "ms")
+            metrics[f"h{hand_size}_d{depth}_p95"] = lower(percentile(times, 0.95), "ms")
+    return metrics
+
+
+@benchmark("fusion")
+def bench_fusion(ctx):
+    metrics = {}
+    n = ctx.scale(5000)
+    for hand_size in (5, 8, 16):
+        rng = random.Random(ctx.seed)
+        pool = ctx.random_cards(256, rng)
+        hands = [[rng.choice(pool) for _ in range(hand_size)] for _ in range(64)]
+        ai = MinimaxAI(max_depth=1, tt_size=0)
+        model = GameModel()
+
+        def full():
+            for k in range(n):
+                model.machine_cards = hands[k & 63]
+                ai._evaluate_ai_combination(model)
+
+        def incremental():
+            model.machine_cards = list(hands[0])
+            for k in range(n):
+                model.machine_cards[k % hand_size] = pool[k & 255]
+                ai._evaluate_ai_combination(model)
+
+        metrics[f"h{hand_size}_new_hand"] = lower(best_time(full, 5) / n * 1e6, "us")
+        metrics[f"h{hand_size}_one_change"] = lower(best_time(incremental, 5) / n * 1e6, "us")
+    return metrics
+
+
+# --- Carga de cartas ---
+
+@benchmark("cards")
+def bench_cards(ctx):
+    metrics = {}
+    metrics["catalog_import"] = lower(best_time(lambda: CardCatalog(db_path=":memory:").close(), 3) * 1000, "ms")
+
+    builder = DeckBuilder(sampler=ctx.sampler)
+    n = ctx.scale(2000)
+    metrics["deck_build"] = lower(best_time(lambda: [builder.build(5, 8, 8) for _ in range(n)], 3) / n * 1e6, "us")
+
+    # Respaldo por red (contra la API local, sin límite de peticiones)
+    old_random, old_bulk, old_catalog = CardAPI.RANDOM_URL, CardAPI.BULK_URL, CardAPI._catalog
+    old_client = CardAPI._client
+    CardAPI.RANDOM_URL, CardAPI.BULK_URL = ctx.stub.random_url, ctx.stub.cardinfo_url
+    CardAPI.use_client(HttpClient(rate=None))
+    try:
+        remote = DeckBuilder(sampler=MonsterSampler(CardCatalog(db_path=":memory:", fixture_path=None)))
+        metrics["remote_deck_26"] = lower(best_time(lambda: remote.build(5, 8, 8), 3) * 1000, "ms")
+
+        api = SyncCardAPI()
+        remote = DeckBuilder(sampler=MonsterSampler(CardCatalog(db_path=":memory:", fixture_path=None)), api=api)
+        metrics["remote_deck_26_async"] = lower(best_time(lambda: remote.build(5, 8, 8), 3) * 1000, "ms")
+        api.close()
+
+        def full_refresh():
+            CardAPI.use_catalog(CardCatalog(db_path=":memory:", fixture_path=None))
+            CardAPI.refresh_catalog()
+
+        metrics["bulk_refresh"] = lower(best_time(full_refresh, 3) * 1000, "ms")
+        # Con el catálogo ya descargado la petición es condicional (304, sin cuerpo)
+        metrics["bulk_refresh_not_modified"] = lower(best_time(CardAPI.refresh_catalog, 3) * 1000, "ms")
+    finally:
+        CardAPI.RANDOM_URL, CardAPI.BULK_URL = old_random, old_bulk
+        CardAPI.use_catalog(old_catalog)
+        CardAPI.use_client(old_client)
+    return metrics
+
+
+@benchmark("images")
+def bench_images(ctx):
+    from view.image_cache import ImageCache
+
+    metrics = {}
+    ids = [c["id"] for c in ctx.stub.cards][:ctx.scale(40)]
+    urls = [ctx.stub.image_url(card_id) for card_id in ids]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ImageCache(cache_dir=tmp, client=HttpClient(rate=None))
+
+        t = time.perf_counter()
+        for url in urls:
+            cache.load_pil(url, (150, 200))
+        metrics["cold_download_decode"] = lower((time.perf_counter() - t) / len(urls) * 1000, "ms")
+
+        for size in ((150, 200), (90, 130)):
+            elapsed = best_time(lambda: [cache.load_pil(url, size) for url in urls], 3)
+            metrics[f"disk_decode_{size[0]}x{size[1]}"] = lower(elapsed / len(urls) * 1000, "ms")
+    return metrics
+
+
+# --- Comparación y salida ---
+
+def compare(results, baseline, tolerance):
+    """Retorna [(benchmark, métrica, base, actual, cambio, empeoró)] para las métricas en común."""
+    rows = []
+    for name, metrics in results.items():
+        for metric, entry in metrics.items():
+            base = baseline.get(name, {}).get(metric)
+            if not base or not base["value"]:
+                continue
+            ratio = entry["value"] / base["value"]
+            if entry["better"] == "lower":
+                worse = ratio > 1 + tolerance
+            else:
+                worse = ratio < 1 / (1 + tolerance)
+            rows.append((name, metric, base["value"], entry["value"], ratio - 1, worse))
+    return rows
+
+
+def run(names=None, quick=False, seed=0, runs=1):
+    selected = [(name, fn) for name, fn in BENCHMARKS.items() if not names or name in names]
+    samples = {name: [] for name, _ in selected}
+    elapsed = {name: 0.0 for name, _ in selected}
+    with StubAPI(seed=seed) as stub:
+        ctx = Context(quick, seed, stub)
+        # Corridas intercaladas: un momento lento de la máquina afecta una muestra de cada benchmark, no todas
+        for _ in range(runs):
+            for name, fn in selected:
+                t = time.perf_counter()
+                samples[name].append(fn(ctx))
+                elapsed[name] += time.perf_counter() - t
+
+    results = {}
+    for name, _ in selected:
+        print(f"[{name}] {elapsed[name]:.1f} s", file=sys.stderr)
+        first = samples[name][0]
+        results[name] = {metric: {"value": statistics.median(run[metric][0] for run in samples[name]),
+                                  "unit": unit, "better": better}
+                         for metric, (_, unit, better) in first.items()}
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del motor, la IA y la carga de cartas.")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="solo estos benchmarks")
+    parser.add_argument("--quick", action="store_true", help="10 veces menos iteraciones")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--runs", type=int, help="corridas por benchmark; se guarda la mediana (5 con --quick, si no 1)")
+    parser.add_argument("--output", help="guarda los resultados en este JSON (sirve como baseline)")
+    parser.add_argument("--baseline", help="JSON de una corrida anterior para comparar")
+    parser.add_argument("--tolerance", type=float,
+                        help="empeoramiento permitido (0.25 = 25%%, el valor por defecto; 0.5 con --quick)")
+    args = parser.parse_args(argv)
+
+    runs = args.runs or (5 if args.quick else 1)
+    results = run(args.only, args.quick, args.seed, runs)
+    for name, metrics in results.items():
+        for metric, entry in metrics.items():
+            print(f"{name:<12}{metric:<26}{entry['value']:>16,.3f} {entry['unit']}")
+
+    if args.output:
+        report = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "quick": args.quick,
+                "runs": runs,
+                "seed": args.seed,
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        if args.tolerance is None:
+            args.tolerance = 0.5 if args.quick else 0.25
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        rows = compare(results, baseline, args.tolerance)
+        regressions = [r for r in rows if r[5]]
+        print(f"\nComparación contra {args.baseline} (tolerancia {args.tolerance:.0%}):")
+        for name, metric, base, current, change, worse in rows:
+            flag = "  EMPEORÓ" if worse else ""
+            print(f"{name:<12}{metric:<26}{base:>14,.3f} -> {current:>14,.3f} ({change:+.1%}){flag}")
+        if regressions:
+            print(f"{len(regressions)} métricas empeoraron.")
+            return 1
+        print("Sin regresiones.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,80 @@
 import math
 import random
+import time
+
+from model.compact_state import EMPTY, ZOBRIST, CompactState
+from model.game_model import ATTACK, DEFENSE, MODE_CODES, MODE_NAMES, normalize_mode
+from model.instrumentation import traced
+
+from .fusion_index import FusionIndex, top_fusions
+from .matchup_table import MatchupTable, counter_score
+from .transposition_table import EXACT, LOWER, UPPER, TranspositionTable
+
+# Valor de una posición ganada/perdida (mayor que cualquier diferencia de vidas)
+WIN_SCORE = 1000000
+
+def move_to_dict(model, move):
+    """Convierte un movimiento interno ('fight', i, modo) / ('combine', i, j) al diccionario que espera el controlador."""
+    if move[0] == 'fight':
+        return {'type': 'fight', 'index': move[1], 'mode': MODE_NAMES[move[2]]}
+
+    i, j = move[1], move[2]
+    card1, card2 = model.machine_cards[i], model.machine_cards[j]
+    new_atk = max(card1.atk, card2.atk) + 1000
+    new_def = max(card1.defe, card2.defe) + 1000
+    return {
+        'type': 'combine',
+        'slots': (i, j),
+        'new_atk': new_atk,
+        'new_def': new_def,
+        'score': new_atk + new_def - (card1.atk + card1.defe + card2.atk + card2.defe),
+    }
+
+
+class _SearchTimeout(Exception):
+    """Se acabó el tiempo de la decisión en medio de una iteración."""
+
 
 class MinimaxAI:
     
-    def __init__(self, max_depth=2):
+    def __init__(self, max_depth=2, node_budget=5000, tt_size=1 << 16, time_budget_ms=None, seed=None, fusion_width=3):
+        # max_depth = jugadas (plies) que mira hacia adelante; 1 = solo la heurística de contraataque
         self.max_depth = max_depth
+        # Límite de nodos por decisión: al llegarle, los nodos se evalúan sin seguir bajando (None = sin límite).
+        # En modo anytime no se usa: ahí el límite es time_budget_ms
+        self.node_budget = node_budget if node_budget is not None else math.inf
+        # Modo "anytime": profundización iterativa hasta max_depth o hasta agotar este tiempo
+        self.time_budget_ms = time_budget_ms
+        # Tabla de transposición compartida entre decisiones (tt_size=0 la desactiva)
+        self.tt = TranspositionTable(tt_size) if tt_size else None
+        # Enfrentamientos precalculados entre las manos actuales (se actualiza solo lo que cambió)
+        self.matchups = MatchupTable()
+        # Mano de la IA ordenada por ATK/DEF para encontrar fusiones sin probar todas las parejas
+        self.fusions = FusionIndex()
+        # Fusiones que se consideran en cada nodo de la búsqueda (las de mayor ganancia; None = todas)
+        self.fusion_width = fusion_width
+        # Generador propio para desempates: con seed las decisiones son reproducibles
+        self.rng = random.Random(seed)
+
+        # Estadísticas de la última decisión (nodos, cortes alfa-beta, tiempo)
+        self.last_stats = {}
+        self._nodes = 0
+        self._cutoffs = 0
+        self._truncations = 0
+        self._deadline = None
+        self._budget = self.node_budget
+        self._prev_pv = []
 
     # Función principal que decide el mejor movimiento de la IA
+    @traced("ai.minimax.get_best_move")
     def get_best_move(self, model, opponent_card, opponent_mode):
         """
         Decide si la IA combina cartas o realiza un movimiento de ataque/defensa.
+        Con max_depth > 1 (o con time_budget_ms) hace una búsqueda minimax con poda alfa-beta.
         """
 
-        
+        if self.max_depth > 1 or self.time_budget_ms:
+            return self.search(model, opponent_card, opponent_mode)
         
         if hasattr(model, 'can_combine_this_turn') and model.can_combine_this_turn:
             # Evalúa si existe una buena combinación
@@ -33,36 +95,42 @@ class MinimaxAI:
         para contrarrestar la carta del usuario.
         """
 
+        self.matchups.sync(model)
+        u_slot = self._find_slot(model.user_cards, user_card)
+        u_mode = MODE_CODES.get(normalize_mode(user_mode))
+
         best_score = -float('inf')
-        best_move = None
+        best_moves = []
+
+        # Recorre todas las cartas de la IA en ambos modos; el puntaje sale de la tabla
+        for index, card in enumerate(model.machine_cards):
+            if card is None:
+                continue
+            for mode in (ATTACK, DEFENSE):
+                if u_mode is None:
+                    score = 0
+                elif u_slot is not None:
+                    score = self.matchups.score(index, mode, u_slot, u_mode)
+                else:
+                    # La carta del usuario no está en su mano: se calcula directo
+                    score = counter_score(card.atk, card.defe, mode, user_card.atk, user_card.defe, u_mode)
 
-        # Obtiene todos los movimientos posibles de la IA
-        possible_moves = self.get_valid_moves(model)
+                if score > best_score:
+                    best_score = score
+                    best_moves = [(index, mode)]
+                elif score == best_score:
+                    best_moves.append((index, mode))
 
-       
-        if not possible_moves:
+        if not best_moves:
             return None
 
-        # Recorre todos los movimientos posibles
-        for move in possible_moves:
-            # Calcula un puntaje heurístico que indica qué tan bueno es el movimiento
-            score = self.evaluate_counter_move(move, user_card, user_mode)
-
-        
-            if score > best_score:
-                best_score = score
-                best_move = move
-
-
-        
-        if best_move:
-            return {
-                'type': 'fight',          
-                'index': best_move['index'],  
-                'mode': best_move['mode'],    
-            }
-
-        return None
+        # Entre movimientos igual de buenos se elige uno al azar (evita decisiones idénticas)
+        index, mode = self.rng.choice(best_moves)
+        return {
+            'type': 'fight',
+            'index': index,
+            'mode': MODE_NAMES[mode],
+        }
 
     
     def _evaluate_ai_combination(self, model):
@@ -71,38 +139,23 @@ class MinimaxAI:
         """
 
         best_combination = None
-        max_power_gain = 0
 
-        # Recorre todas las parejas posibles de cartas
-        for i in range(5):
-            for j in range(i + 1, 5):
-                card1 = model.machine_cards[i]
-                card2 = model.machine_cards[j]
-
-                
-                if card1 and card2:
-                    # Simula la fusión: toma el mayor ataque/defensa y suma 1000
-                    new_atk = max(card1.atk, card2.atk) + 1000
-                    new_def = max(card1.defe, card2.defe) + 1000
-
-                    
-                    current_power = card1.atk + card1.defe + card2.atk + card2.defe
-
-                   
-                    new_power = new_atk + new_def
-
-                
-                    power_gain = new_power - current_power
-
-                    if power_gain > max_power_gain:
-                        max_power_gain = power_gain
-                        best_combination = {
-                            'type': 'combine',   
-                            'slots': (i, j),     
-                            'new_atk': new_atk,  
-                            'new_def': new_def,  
-                            'score': power_gain 
-                        }
+        # El índice se actualiza solo en los slots que cambiaron desde la última consulta
+        self.fusions.sync(model.machine_cards)
+        best = self.fusions.best()
+
+        if best:
+            power_gain, i, j = best
+            card1 = model.machine_cards[i]
+            card2 = model.machine_cards[j]
+            # Simula la fusión: toma el mayor ataque/defensa y suma 1000
+            best_combination = {
+                'type': 'combine',
+                'slots': (i, j),
+                'new_atk': max(card1.atk, card2.atk) + 1000,
+                'new_def': max(card1.defe, card2.defe) + 1000,
+                'score': power_gain
+            }
 
         # La IA solo combina si la ganancia de poder es muy alta
         if best_combination and best_combination['score'] > 4000:
@@ -192,6 +245,340 @@ class MinimaxAI:
         
 
         # Factor de aleatoriedad para evitar decisiones idénticas
-        score += random.randint(0, 5)
+        score += self.rng.randint(0, 5)
 
         return score
+
+    # ------------------------------------------------------------------
+    # Búsqueda minimax con poda alfa-beta
+    # ------------------------------------------------------------------
+
+    def search(self, model, opponent_card, opponent_mode):
+        """
+        Busca la mejor respuesta a la carta/modo del usuario mirando max_depth jugadas:
+        respuesta de la IA, siguiente jugada del usuario, respuesta de la IA, etc.
+        Considera peleas, fusiones y las cartas que entran desde las colas.
+
+        Con time_budget_ms usa profundización iterativa: busca a profundidad 1, 2, 3...
+        y retorna la mejor jugada de la última iteración completa dentro del tiempo.
+        La variante principal de cada iteración se prueba primero en la siguiente.
+        """
+        start = time.perf_counter()
+        self._nodes = 0
+        self._cutoffs = 0
+        self._truncations = 0
+        self._deadline = None
+        self._prev_pv = []
+        # En modo anytime el límite es el reloj: cortar subárboles por nodos haría que cada
+        # iteración más profunda "termine" con evaluaciones estáticas (y sin jugada en la raíz)
+        self._budget = self.node_budget if self.time_budget_ms is None else math.inf
+        tt_before = dict(self.tt.stats) if self.tt else None
+
+        # Estado compacto: los movimientos se hacen y deshacen sobre los mismos arreglos
+        state = CompactState.from_model(model)
+        self.matchups.sync(model)
+        u_slot = self._find_slot(model.user_cards, opponent_card)
+        u_mode = MODE_CODES.get(normalize_mode(opponent_mode), ATTACK)
+        user_move = (u_slot, u_mode, (opponent_card.atk, opponent_card.defe))
+
+        if self.time_budget_ms is None:
+            best_score, pv = self._max_node(state, self.max_depth, -math.inf, math.inf, user_move, 0, False, root=True)
+            depth_reached = self.max_depth
+        else:
+            best_score, pv, depth_reached = None, [], 0
+            for depth in range(1, self.max_depth + 1):
+                # La profundidad 1 siempre termina: así nunca nos quedamos sin jugada
+                if depth > 1:
+                    self._deadline = start + self.time_budget_ms / 1000.0
+                try:
+                    score, new_pv = self._max_node(state, depth, -math.inf, math.inf, user_move, 0, True, root=True)
+                except _SearchTimeout:
+                    break
+                # Una raíz sin variante no es una iteración completa: nos quedamos con la anterior
+                if not new_pv and pv:
+                    break
+                best_score, pv, depth_reached = score, new_pv, depth
+                self._prev_pv = pv
+                # Resultado forzado (ganar/perder): más profundidad no cambia la decisión
+                if abs(best_score) >= WIN_SCORE:
+                    break
+
+        self.last_stats = {
+            'nodes': self._nodes,
+            'cutoffs': self._cutoffs,
+            'truncated': self._truncations,
+            'depth': depth_reached,
+            'score': best_score,
+            'pv': pv,
+            'time_ms': (time.perf_counter() - start) * 1000,
+        }
+        if self.tt:
+            probes = self.tt.stats['probes'] - tt_before['probes']
+            hits = self.tt.stats['hits'] - tt_before['hits']
+            self.last_stats['tt_probes'] = probes
+            self.last_stats['tt_hits'] = hits
+            self.last_stats['tt_hit_rate'] = hits / probes if probes else 0.0
+
+        if not pv:
+            return None
+        # Si la búsqueda se cortó por tiempo, el estado quedó a medio deshacer: usamos el del modelo
+        return self._to_move_dict(model, pv[0])
+
+    def stats_text(self):
+        """Resumen de la última decisión para el log del controlador."""
+        stats = self.last_stats
+        if not stats:
+            return ""
+        return (f"IA BUSQUEDA: profundidad {stats['depth']}, {stats['nodes']} nodos, "
+                f"{stats['cutoffs']} cortes, TT {stats.get('tt_hit_rate', 0):.0%}, {stats['time_ms']:.1f} ms")
+
+    @staticmethod
+    def _find_slot(cards, card):
+        for i, c in enumerate(cards):
+            if c is card:
+                return i
+        return None
+
+    def _to_move_dict(self, model, move):
+        return move_to_dict(model, move)
+
+    @staticmethod
+    def _evaluate(state, winner):
+        """Puntaje desde el punto de vista de la máquina: vidas y poder de las manos."""
+        if winner == "machine":
+            return WIN_SCORE
+        if winner == "user":
+            return -WIN_SCORE
+
+        # Poder de una carta = su mejor estadística
+        H = state.hand_size
+        atk, defe, ids = state.atk, state.defe, state.ids
+        power = 0
+        for i in range(2 * H):
+            if ids[i] != EMPTY:
+                p = atk[i] if atk[i] > defe[i] else defe[i]
+                power += p if i >= H else -p
+        return (state.lives[1] - state.lives[0]) + power // 4
+
+    def _combos(self, state, side):
+        """Mejores fusiones que ganan poder para un lado: lista de (ganancia, ('combine', i, j))."""
+        H = state.hand_size
+        base = side * H
+        atk, defe, ids = state.atk, state.defe, state.ids
+        by_atk = sorted((atk[base + i], defe[base + i], i) for i in range(H) if ids[base + i] != EMPTY)
+        if len(by_atk) < 2:
+            return []
+        by_def = sorted((d, i) for _, d, i in by_atk)
+        # Solo fusiones que ganan poder (las demás nunca convienen y ensanchan el árbol),
+        # y de ellas las fusion_width mejores, sin recorrer todas las parejas
+        width = self.fusion_width if self.fusion_width is not None else len(by_atk) * (len(by_atk) - 1) // 2
+        return [(gain, ('combine', i, j)) for gain, i, j in top_fusions(by_atk, by_def, width)]
+
+    def _machine_moves(self, state, user_move, table=None):
+        """
+        Movimientos de la IA ordenados de mejor a peor según la heurística de contraataque.
+        Con table (la MatchupTable sincronizada con la raíz) los puntajes se leen de la tabla.
+        """
+        u_slot, u_mode, (atk_u, def_u) = user_move
+        if u_slot is None:
+            table = None
+        H = state.hand_size
+        atk, defe, ids = state.atk, state.defe, state.ids
+        scored = []
+
+        for i in range(H):
+            if ids[H + i] == EMPTY:
+                continue
+            for mode in (ATTACK, DEFENSE):
+                if table is not None:
+                    score = table.score(i, mode, u_slot, u_mode)
+                else:
+                    score = counter_score(atk[H + i], defe[H + i], mode, atk_u, def_u, u_mode)
+                scored.append((score, ('fight', i, mode)))
+
+        if state.can_combine[1]:
+            scored.extend(self._combos(state, 1))
+
+        scored.sort(key=lambda x: x[0], reverse=True)
+        return [m for _, m in scored]
+
+    def _user_moves(self, state):
+        """Movimientos posibles del usuario, primero los más fuertes."""
+        H = state.hand_size
+        atk, defe, ids = state.atk, state.defe, state.ids
+        scored = []
+
+        for i in range(H):
+            if ids[i] == EMPTY:
+                continue
+            scored.append((atk[i], ('fight', i, ATTACK)))
+            scored.append((defe[i], ('fight', i, DEFENSE)))
+
+        scored.sort(key=lambda x: x[0], reverse=True)
+        moves = [m for _, m in scored]
+
+        # Las fusiones del usuario van al final: casi nunca son la jugada que más daño hace
+        if state.can_combine[0]:
+            combos = self._combos(state, 0)
+            combos.sort(key=lambda x: x[0], reverse=True)
+            moves.extend(m for _, m in combos)
+
+        return moves
+
+    # --- Tabla de transposición ---
+
+    def _tt_probe(self, key, depth, alpha, beta):
+        """
+        Consulta la tabla. Retorna (score_o_None, alpha, beta, movimiento_guardado).
+        Si el score no es None, el nodo se puede resolver sin buscar.
+        """
+        if self.tt is None:
+            return None, alpha, beta, None
+
+        entry = self.tt.probe(key)
+        if entry is None:
+            return None, alpha, beta, None
+
+        _, entry_depth, score, flag, move = entry
+        if entry_depth >= depth:
+            if flag == EXACT:
+                return score, alpha, beta, move
+            if flag == LOWER:
+                alpha = max(alpha, score)
+            elif flag == UPPER:
+                beta = min(beta, score)
+            if alpha >= beta:
+                return score, alpha, beta, move
+        return None, alpha, beta, move
+
+    def _tt_store(self, key, depth, score, alpha_orig, beta_orig, move):
+        if self.tt is None:
+            return
+        if score <= alpha_orig:
+            flag = UPPER
+        elif score >= beta_orig:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.store(key, depth, score, flag, move)
+
+    @staticmethod
+    def _move_first(moves, move):
+        """Pone el movimiento indicado al principio (si es válido en este nodo)."""
+        if move is not None and move in moves:
+            moves.remove(move)
+            moves.insert(0, move)
+        return moves
+
+    def _ordered(self, moves, tt_move, ply, on_pv):
+        """Orden final: variante principal anterior, luego el movimiento de la tabla, luego la heurística."""
+        self._move_first(moves, tt_move)
+        pv_move = self._prev_pv[ply] if on_pv and ply < len(self._prev_pv) else None
+        self._move_first(moves, pv_move)
+        return moves, pv_move
+
+    def _enter_node(self):
+        self._nodes += 1
+        # Revisar el reloj cada 64 nodos es suficiente y casi gratis
+        if self._deadline is not None and not (self._nodes & 63) and time.perf_counter() > self._deadline:
+            raise _SearchTimeout()
+
+    def _is_leaf(self, depth, winner):
+        """Nodo que se evalúa sin bajar más: fin de la profundidad, partida terminada o límite de nodos."""
+        if depth <= 0 or winner is not None:
+            return True
+        if self._nodes >= self._budget:
+            self._truncations += 1
+            return True
+        return False
+
+    # --- Nodos ---
+    # Cada nodo retorna (score, variante_principal) donde la variante es la lista de
+    # movimientos esperados desde ese nodo (el primero es el mejor movimiento).
+
+    def _max_node(self, state, depth, alpha, beta, user_move, ply, on_pv, root=False):
+        """Turno de la IA: responde a user_move (slot, modo, (atk, def)) del usuario."""
+        self._enter_node()
+        winner = state.winner()
+        if self._is_leaf(depth, winner):
+            return self._evaluate(state, winner), []
+
+        u_slot, u_mode, u_stats = user_move
+        key = state.hash ^ ZOBRIST.user_move(u_slot, u_mode, u_stats)
+        alpha_orig, beta_orig = alpha, beta
+        if root:
+            # En la raíz la tabla solo ordena: con una cota guardada la jugada elegida podría
+            # valer solo esa cota, así que se busca con la ventana completa
+            tt_move = self._tt_probe(key, depth, alpha, beta)[3]
+        else:
+            tt_score, alpha, beta, tt_move = self._tt_probe(key, depth, alpha, beta)
+            if tt_score is not None:
+                return tt_score, [tt_move] if tt_move else []
+        truncations = self._truncations
+
+        best_score = -math.inf
+        best_pv = []
+        moves, pv_move = self._ordered(self._machine_moves(state, user_move, self.matchups if root else None), tt_move, ply, on_pv)
+
+        for move in moves:
+            if move[0] == 'fight':
+                undo = state.make_fight(u_slot, u_mode, move[1], move[2], u_stats)
+            else:
+                undo = state.make_combine(1, move[1], move[2])
+
+            score, child_pv = self._min_node(state, depth - 1, alpha, beta, ply + 1, on_pv and move == pv_move)
+            state.unmake(undo)
+
+            if score > best_score:
+                best_score = score
+                best_pv = [move] + child_pv
+            alpha = max(alpha, best_score)
+            if alpha >= beta:
+                self._cutoffs += 1
+                break
+
+        # Si el límite de nodos cortó algún subárbol, el valor no es de profundidad 'depth': no se guarda
+        if self._truncations == truncations:
+            self._tt_store(key, depth, best_score, alpha_orig, beta_orig, best_pv[0] if best_pv else None)
+        return best_score, best_pv
+
+    def _min_node(self, state, depth, alpha, beta, ply, on_pv):
+        """Turno del usuario: elige carta y modo (o combina y vuelve a elegir)."""
+        self._enter_node()
+        winner = state.winner()
+        if self._is_leaf(depth, winner):
+            return self._evaluate(state, winner), []
+
+        key = state.hash ^ ZOBRIST.min_node
+        alpha_orig, beta_orig = alpha, beta
+        tt_score, alpha, beta, tt_move = self._tt_probe(key, depth, alpha, beta)
+        if tt_score is not None:
+            return tt_score, [tt_move] if tt_move else []
+        truncations = self._truncations
+
+        best_score = math.inf
+        best_pv = []
+        moves, pv_move = self._ordered(self._user_moves(state), tt_move, ply, on_pv)
+
+        for move in moves:
+            child_on_pv = on_pv and move == pv_move
+            if move[0] == 'fight':
+                user_move = (move[1], move[2], (state.atk[move[1]], state.defe[move[1]]))
+                score, child_pv = self._max_node(state, depth - 1, alpha, beta, user_move, ply + 1, child_on_pv)
+            else:
+                undo = state.make_combine(0, move[1], move[2])
+                score, child_pv = self._min_node(state, depth - 1, alpha, beta, ply + 1, child_on_pv)
+                state.unmake(undo)
+
+            if score < best_score:
+                best_score = score
+                best_pv = [move] + child_pv
+            beta = min(beta, best_score)
+            if alpha >= beta:
+                self._cutoffs += 1
+                break
+
+        # Si el límite de nodos cortó algún subárbol, el valor no es de profundidad 'depth': no se guarda
+        if self._truncations == truncations:
+            self._tt_store(key, depth, best_score, alpha_orig, beta_orig, best_pv[0] if best_pv else None)
+        return best_score, best_pv
@@ -0,0 +1,235 @@
+# controller/ai_montecarlo.py
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from model.compact_state import EMPTY, CompactState
+from model.game_model import ATTACK, DEFENSE, MODE_CODES, normalize_mode
+from model.instrumentation import traced
+
+from .ai_minimax import move_to_dict
+from .matchup_table import counter_score
+
+
+class MonteCarloAI:
+    """
+    IA por simulación: cada movimiento candidato (pelea o fusión) se evalúa jugando
+    muchas partidas rápidas al azar hasta el final con las reglas sin interfaz (CompactState).
+
+    - El presupuesto de simulaciones se reparte con UCB1: los movimientos prometedores reciben más.
+    - Información oculta: en cada simulación se barajan las cartas de las colas que no se ven
+      (todas menos las 'visible_queue' primeras), así no se juega con el orden real del mazo.
+    - Con workers > 1 las simulaciones se reparten entre procesos y se suman los resultados.
+
+    Mismo contrato que MinimaxAI.get_best_move (retorna el diccionario de movimiento).
+    """
+
+    def __init__(self, rollouts=400, max_rollout_turns=60, workers=1, seed=None,
+                 time_budget_ms=None, visible_queue=4, exploration=1.4, epsilon=0.2, combine_prob=0.1):
+        self.rollouts = rollouts
+        self.max_rollout_turns = max_rollout_turns
+        self.workers = workers
+        self.time_budget_ms = time_budget_ms
+        self.visible_queue = visible_queue
+        self.exploration = exploration
+        # Políticas de las simulaciones: la IA pelea con la heurística de contraataque
+        # (al azar con probabilidad epsilon); el usuario juega al azar y a veces combina.
+        self.epsilon = epsilon
+        self.combine_prob = combine_prob
+        self.rng = random.Random(seed)
+
+        self.last_stats = {}
+        self._pool = None
+
+    @traced("ai.montecarlo.get_best_move")
+    def get_best_move(self, model, opponent_card, opponent_mode):
+        start = time.perf_counter()
+        state = CompactState.from_model(model)
+
+        u_slot = None
+        for i, card in enumerate(model.user_cards):
+            if card is opponent_card:
+                u_slot = i
+        u_mode = MODE_CODES.get(normalize_mode(opponent_mode), ATTACK)
+        user_move = (u_slot, u_mode, (opponent_card.atk, opponent_card.defe))
+
+        candidates = machine_candidates(state)
+        if not candidates:
+            return None
+
+        params = (self.max_rollout_turns, self.visible_queue, self.exploration, self.epsilon, self.combine_prob)
+        deadline = start + self.time_budget_ms / 1000.0 if self.time_budget_ms else None
+
+        if len(candidates) == 1:
+            wins, visits = [0.0], [0]
+        elif self.workers > 1:
+            wins, visits = self._run_parallel(state, user_move, candidates, params, deadline)
+        else:
+            wins, visits = run_rollouts(state, user_move, candidates, self.rollouts,
+                                        self.rng.getrandbits(32), params, deadline)
+
+        # Movimiento más visitado (el más robusto); empates por mejor promedio
+        best = max(range(len(candidates)),
+                   key=lambda k: (visits[k], wins[k] / visits[k] if visits[k] else 0.0))
+
+        self.last_stats = {
+            'rollouts': sum(visits),
+            'candidates': len(candidates),
+            'win_rate': wins[best] / visits[best] if visits[best] else 0.0,
+            'time_ms': (time.perf_counter() - start) * 1000,
+        }
+        return move_to_dict(model, candidates[best])
+
+    def _run_parallel(self, state, user_move, candidates, params, deadline=None):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+        # Cada proceso recibe el tiempo que queda (no el deadline: perf_counter es de cada proceso)
+        budget_s = max(0.0, deadline - time.perf_counter()) if deadline is not None else None
+        share = max(1, self.rollouts // self.workers)
+        futures = [self._pool.submit(run_rollouts_for, state, user_move, candidates, share,
+                                     self.rng.getrandbits(32), params, budget_s)
+                   for _ in range(self.workers)]
+
+        wins = [0.0] * len(candidates)
+        visits = [0] * len(candidates)
+        for future in futures:
+            w, v = future.result()
+            for k in range(len(candidates)):
+                wins[k] += w[k]
+                visits[k] += v[k]
+        return wins, visits
+
+    def stats_text(self):
+        stats = self.last_stats
+        if not stats:
+            return ""
+        return (f"IA MONTECARLO: {stats['rollouts']} simulaciones, {stats['candidates']} candidatos, "
+                f"victoria estimada {stats['win_rate']:.0%}, {stats['time_ms']:.1f} ms")
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+# --- Simulaciones (funciones de módulo para poder ejecutarlas en otros procesos) ---
+
+def machine_candidates(state):
+    """Peleas de cada carta de la IA en ambos modos, y fusiones que ganan poder si puede combinar."""
+    H = state.hand_size
+    moves = []
+    for i in range(H):
+        if state.ids[H + i] != EMPTY:
+            moves.append(('fight', i, ATTACK))
+            moves.append(('fight', i, DEFENSE))
+
+    if state.can_combine[1]:
+        for i in range(H):
+            for j in range(i + 1, H):
+                a, b = H + i, H + j
+                if state.ids[a] == EMPTY or state.ids[b] == EMPTY:
+                    continue
+                if 2000 - min(state.atk[a], state.atk[b]) - min(state.defe[a], state.defe[b]) > 0:
+                    moves.append(('combine', i, j))
+    return moves
+
+
+def run_rollouts_for(state, user_move, candidates, rollouts, seed, params, budget_s=None):
+    """run_rollouts con un presupuesto en segundos contado desde que el proceso empieza (None = sin límite)."""
+    deadline = time.perf_counter() + budget_s if budget_s is not None else None
+    return run_rollouts(state, user_move, candidates, rollouts, seed, params, deadline)
+
+
+def run_rollouts(state, user_move, candidates, rollouts, seed, params, deadline=None):
+    """
+    Reparte 'rollouts' simulaciones entre los candidatos con UCB1.
+    Retorna (victorias, visitas) por candidato; una victoria vale 1 y una partida sin terminar
+    vale según la diferencia de vidas.
+    """
+    max_turns, visible, exploration, epsilon, combine_prob = params
+    rng = random.Random(seed)
+    n = len(candidates)
+    wins = [0.0] * n
+    visits = [0] * n
+
+    for t in range(rollouts):
+        if deadline is not None and t >= n and time.perf_counter() > deadline:
+            break
+
+        if t < n:
+            k = t
+        else:
+            log_t = math.log(t)
+            k = max(range(n), key=lambda c: wins[c] / visits[c] + exploration * math.sqrt(log_t / visits[c]))
+
+        _shuffle_hidden(state, visible, rng)
+        wins[k] += _rollout(state, user_move, candidates[k], rng, max_turns, epsilon, combine_prob)
+        visits[k] += 1
+    return wins, visits
+
+
+def _shuffle_hidden(state, visible, rng):
+    """Baraja la parte no visible de cada cola (las cartas que nadie conoce todavía)."""
+    for side in (0, 1):
+        start = state.cursor[side] + visible
+        q_atk, q_def, q_ids = state.q_atk[side], state.q_def[side], state.q_ids[side]
+        for k in range(len(q_ids) - 1, start, -1):
+            r = rng.randint(start, k)
+            q_atk[k], q_atk[r] = q_atk[r], q_atk[k]
+            q_def[k], q_def[r] = q_def[r], q_def[k]
+            q_ids[k], q_ids[r] = q_ids[r], q_ids[k]
+
+
+def _rollout(state, user_move, move, rng, max_turns, epsilon, combine_prob):
+    """Aplica el movimiento candidato, juega al azar hasta el final y deshace todo. Retorna el valor para la IA."""
+    H = state.hand_size
+    ids, atk, defe = state.ids, state.atk, state.defe
+    undos = []
+
+    u_slot, u_mode, u_stats = user_move
+    if move[0] == 'fight':
+        undos.append(state.make_fight(u_slot, u_mode, move[1], move[2], u_stats))
+    else:
+        undos.append(state.make_combine(1, move[1], move[2]))
+
+    winner = state.winner()
+    turns = 0
+    while winner is None and turns < max_turns:
+        turns += 1
+        user_slots = [i for i in range(H) if ids[i] != EMPTY]
+
+        # Usuario: a veces combina dos cartas al azar, luego pelea con una carta y modo al azar
+        if state.can_combine[0] and len(user_slots) >= 2 and rng.random() < combine_prob:
+            i, j = rng.sample(user_slots, 2)
+            undos.append(state.make_combine(0, i, j))
+            user_slots = [i for i in range(H) if ids[i] != EMPTY]
+        u = rng.choice(user_slots)
+        mode = ATTACK if rng.random() < 0.5 else DEFENSE
+
+        # IA: mejor contraataque (o una pelea al azar con probabilidad epsilon)
+        machine_slots = [i for i in range(H) if ids[H + i] != EMPTY]
+        if rng.random() < epsilon:
+            m, m_mode = rng.choice(machine_slots), (ATTACK if rng.random() < 0.5 else DEFENSE)
+        else:
+            best = None
+            for i in machine_slots:
+                for ai_mode in (ATTACK, DEFENSE):
+                    score = counter_score(atk[H + i], defe[H + i], ai_mode, atk[u], defe[u], mode)
+                    if best is None or score > best:
+                        best, m, m_mode = score, i, ai_mode
+
+        undos.append(state.make_fight(u, mode, m, m_mode))
+        winner = state.winner()
+
+    if winner == "machine":
+        value = 1.0
+    elif winner == "user":
+        value = 0.0
+    else:
+        value = 0.5 + (state.lives[1] - state.lives[0]) / 16000.0
+
+    for undo in reversed(undos):
+        state.unmake(undo)
+    return value
@@ -0,0 +1,143 @@
+# controller/fusion_index.py
+import heapq
+from bisect import insort
+
+from model.compact_state import FUSION_BONUS
+
+
+def top_fusions(by_atk, by_def, k, min_gain=0):
+    """
+    Las k fusiones con mayor ganancia (> min_gain) de una mano dada como
+    by_atk = [(atk, def, slot)] y by_def = [(def, slot)], ambas ordenadas.
+    Retorna [(ganancia, i, j)] con i < j, de mejor a peor (empates: pareja menor primero).
+
+    Para cada carta p (por ATK ascendente) el costo de la pareja con una q posterior es
+    atk_p + min(def_p, def_q):
+    - las q con DEF menor que def_p se recorren por DEF ascendente (costo creciente);
+    - las demás cuestan atk_p + def_p y, a igual costo, el desempate prefiere el slot de q menor.
+    En los dos recorridos cada pareja es peor o igual que la anterior, así que al primer
+    intento que no entra entre las k mejores se deja de buscar.
+    """
+    n = len(by_atk)
+    if k <= 0 or n < 2:
+        return []
+
+    pos = {slot: p for p, (_, _, slot) in enumerate(by_atk)}
+    slots = sorted(pos)
+
+    # Menor DEF a la derecha de cada posición (en el orden por ATK)
+    suffix_def = [0] * n
+    best = None
+    for p in range(n - 1, -1, -1):
+        suffix_def[p] = best
+        d = by_atk[p][1]
+        best = d if best is None or d < best else best
+    min_def = by_def[0][0]
+
+    # "cost" = menor ATK + menor DEF de la pareja (menor costo = mayor ganancia)
+    max_cost = 2 * FUSION_BONUS - min_gain
+    heap = []   # max-heap por (costo, i, j) con los k mejores vistos
+
+    def offer(cost, slot_p, slot_q):
+        """Intenta guardar la pareja; False si no mejora a la peor de las k guardadas."""
+        if cost >= max_cost:
+            return False
+        i, j = (slot_p, slot_q) if slot_p < slot_q else (slot_q, slot_p)
+        entry = (-cost, -i, -j)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+        else:
+            return False
+        return True
+
+    for p in range(n - 1):
+        atk_p, def_p, slot_p = by_atk[p]
+        limit = -heap[0][0] if len(heap) == k else max_cost
+        # Los ATK solo crecen: ninguna p posterior puede bajar de este costo
+        if atk_p + min_def > limit:
+            break
+        lower = atk_p + (def_p if def_p < suffix_def[p] else suffix_def[p])
+        if lower > limit:
+            continue
+
+        # q con DEF menor que la de p: costo atk_p + def_q
+        for def_q, slot_q in by_def:
+            if def_q >= def_p:
+                break
+            if pos[slot_q] > p and not offer(atk_p + def_q, slot_p, slot_q):
+                break
+
+        # Resto de las q: todas cuestan atk_p + def_p
+        for slot_q in slots:
+            if pos[slot_q] > p and by_atk[pos[slot_q]][1] >= def_p and not offer(atk_p + def_p, slot_p, slot_q):
+                break
+
+    result = sorted((-c, -i, -j) for c, i, j in heap)
+    return [(2 * FUSION_BONUS - cost, i, j) for cost, i, j in result]
+
+
+class FusionIndex:
+    """
+    Índice de la mano para encontrar las mejores fusiones sin probar todas las parejas.
+
+    Ganancia de fusionar i y j = (mayor ATK + mayor DEF + 2*bono) - (suma de las dos cartas)
+                               = 2*bono - menor ATK - menor DEF.
+    Recorriendo las cartas por ATK ascendente, la carta p pone el menor ATK de cualquier pareja
+    con una carta posterior q, y su mejor pareja es la de menor DEF entre las posteriores.
+    Con eso se acota cada p y se cortan las que no pueden mejorar el resultado.
+
+    La mano se mantiene ordenada por ATK y por DEF y se actualiza por slot (set / sync).
+    Los empates se resuelven como la fuerza bruta: primero la pareja (i, j) menor.
+    """
+
+    def __init__(self):
+        self.stats = {}          # slot -> (atk, def)
+        self.by_atk = []         # [(atk, def, slot)] ordenado
+        self.by_def = []         # [(def, slot)] ordenado
+
+    def __len__(self):
+        return len(self.stats)
+
+    def set(self, slot, stats):
+        """Una carta entra (stats=(atk, def)) o sale (None) del slot. Retorna si cambió algo."""
+        old = self.stats.get(slot)
+        if old == stats:
+            return False
+        if old is not None:
+            self.by_atk.remove((old[0], old[1], slot))
+            self.by_def.remove((old[1], slot))
+            del self.stats[slot]
+        if stats is not None:
+            self.stats[slot] = stats
+            insort(self.by_atk, (stats[0], stats[1], slot))
+            insort(self.by_def, (stats[1], slot))
+        return True
+
+    def sync(self, cards):
+        """Pone el índice al día con una mano (lista de Card o None). Retorna cuántos slots cambiaron."""
+        changed = 0
+        for slot, card in enumerate(cards):
+            changed += self.set(slot, (card.atk, card.defe) if card else None)
+        for slot in [s for s in self.stats if s >= len(cards)]:
+            changed += self.set(slot, None)
+        return changed
+
+    @staticmethod
+    def gain(stats1, stats2):
+        min_atk = stats1[0] if stats1[0] < stats2[0] else stats2[0]
+        min_def = stats1[1] if stats1[1] < stats2[1] else stats2[1]
+        return 2 * FUSION_BONUS - min_atk - min_def
+
+    def top_k(self, k, min_gain=0):
+        """
+        Las k fusiones con mayor ganancia (> min_gain), como [(ganancia, i, j)] con i < j,
+        de mejor a peor (empates: pareja menor primero).
+        """
+        return top_fusions(self.by_atk, self.by_def, k, min_gain)
+
+    def best(self, min_gain=0):
+        """La mejor fusión (ganancia, i, j) con ganancia > min_gain, o None."""
+        top = self.top_k(1, min_gain)
+        return top[0] if top else None
@@ -1,24 +1,43 @@
 import sys
 import os
+from collections import deque
 from tkinter import messagebox, simpledialog
 
 # Aseguramos que Python encuentre las carpetas correctas
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from model.async_card_api import get_sync_card_api
 from model.card_model import CardAPI
 from model.game_model import GameModel
+from model.deck_builder import DeckBuilder
+from model.game_engine import GameEngine
+from model.instrumentation import TRACER, traced
+from model.replay_log import DEFAULT_REPLAY_DIR, ReplayLog
 from .ai_minimax import MinimaxAI 
 
 class GameController:
 
-    def __init__(self, view):
+    def __init__(self, view, ai=None, seed=None, replay_dir=DEFAULT_REPLAY_DIR, prefetch_depth=3):
         self.view = view
         self.model = GameModel()
-        # IA Nivel 3 para que piense bien sus jugadas
-        self.ai = MinimaxAI(max_depth=3)
+        # Reglas del juego (sin interfaz); el controlador solo refleja los cambios en la vista
+        self.engine = GameEngine(self.model)
+        # Con seed, el sorteo de cartas y los desempates de la IA son reproducibles
+        self.seed = seed
+        if seed is not None:
+            CardAPI.seed(seed)
+        # Cada partida se registra en replay_dir (None = sin registro); ver replay.py
+        self.replay_dir = replay_dir
+        # IA Nivel 3 para que piense bien sus jugadas (o cualquier IA con get_best_move, p. ej. MonteCarloAI)
+        self.ai = ai or MinimaxAI(max_depth=3, seed=seed)
+        # Si faltan cartas en el catálogo, se piden todas a la vez con la API asyncio
+        self.deck_builder = DeckBuilder(api=get_sync_card_api())
+        # Imágenes que se precargan: las próximas 'prefetch_depth' cartas de cada cola y el arte de fusiones
+        self.prefetch_depth = prefetch_depth
+        # Resumen de las últimas búsquedas de la IA (se ve con el botón Log)
+        self.ai_log = deque(maxlen=5)
         
         self.selected_fusion_slots = [] 
-        self.fusion_counter = 0 
         
         self.userBattleMode = None
         self.machineBattleMode = None
@@ -36,15 +55,25 @@ class GameController:
 
         self.start_new_game()
 
+    @traced("controller.start_new_game")
     def start_new_game(self):
+        self.view.cancel_prefetch()
         self.model.reset()
-        self.load_queue_cards()
-        self.load_initial_hands()
+
+        # Todas las cartas de la partida (manos + colas) se piden en un solo lote
+        deck = self.deck_builder.build(
+            hand_size=5,
+            user_queue_size=self.model.user_queue.free,
+            machine_queue_size=self.model.machine_queue.free,
+        )
+        self._start_replay(deck)
+        self.load_queue_cards(deck)
+        self.load_initial_hands(deck)
         
         self.selected_fusion_slots = [] # Resetear
         self.view.update_card_selection(self.selected_fusion_slots)
         
-        self.fusion_counter = 0 # Reiniciar el contador de fusiones
+        self.engine.fusion_counter = 0 # Reiniciar el contador de fusiones
         
         self.userBattleMode = None
         self.machineBattleMode = None
@@ -93,58 +122,29 @@ class GameController:
             self.view.update_card_selection(self.selected_fusion_slots)
             return
             
-        # 1. Calcular ATK/DEF de la nueva carta
-        # ATK/DEF base es el MAYOR entre las dos, más 1000.
-        new_atk = max(card1.atk, card2.atk) + 1000
-        new_def = max(card1.defe, card2.defe) + 1000
-        
-        # 2. Obtener la nueva carta (Nombre y URL aleatorios)
-        new_combined_card_api = CardAPI.get_random_monster()
-        
-        if not new_combined_card_api:
-            messagebox.showerror("Error", "No se pudo obtener una imagen base para la fusión.")
-            return
-        
-        self.fusion_counter += 1
-        new_card_name = f"COMBINACION {self.fusion_counter}"
-
-        # 3. Crear el objeto Card con las estadísticas fusionadas
-        from model.card_model import Card # Import local para evitar circular
-        combined_card = Card(
-            name=new_card_name,
-            atk=new_atk,
-            defe=new_def,
-            img_url=new_combined_card_api.img_url # Usar la imagen de la carta API aleatoria
+        # 1. Fusionar en el motor: ATK/DEF = el MAYOR de las dos + 1000.
+        # La nueva carta ocupa el slot menor y el otro se rellena desde la cola.
+        # El arte sale del catálogo local según las dos cartas: la fusión no usa la red
+        combined_card, target_slot, other_slot = self.engine.combine(
+            True, idx1, idx2, img_url=CardAPI.fusion_art_url(card1, card2)
         )
+        new_atk, new_def = combined_card.atk, combined_card.defe
 
-        # 4. Determinar dónde colocar la nueva carta (reemplazando el slot con menor índice)
-        target_slot = min(idx1, idx2)
-        
-        # 5. Reemplazar las dos cartas por una nueva:
-        # a) La nueva carta ocupa target_slot
-        self.model.add_user_card(target_slot, combined_card)
+        # 2. Reflejar el cambio en la vista
         self.view.user_slots[target_slot].update(combined_card)
+        self._show_hand_slot(other_slot, is_user=True)
+        self._update_queue_views()
         
-        # b) El otro slot se llena con la siguiente carta de la cola (como si se hubiera destruido)
-        # Esto requiere que la lógica de _handle_card_loss se use para el segundo slot
-        other_slot = max(idx1, idx2)
-        self.model.user_cards[other_slot] = None # Marcar para reemplazo
-        self._handle_card_loss(other_slot, is_user=True)
-        
-        # 6. Limpiar el estado de fusión
+        # 3. Limpiar el estado de fusión
         self.selected_fusion_slots = []
         self.view.update_card_selection(self.selected_fusion_slots)
         
-        # --- Desactivar la fusión para este turno ---
-        self.model.user_can_combine = False
-
         messagebox.showinfo("Fusión Exitosa", f"¡Combinación creada! ATK {new_atk}/DEF {new_def}. El slot {other_slot} se rellenó de la cola.")
 
-    def load_initial_hands(self):
+    def load_initial_hands(self, deck):
         """Carga las manos iniciales."""
         # Usuario
-        for i in range(5):
-            card = CardAPI.get_random_monster()
+        for i, card in enumerate(deck.user_hand):
             if card:
                 self.model.add_user_card(i, card)
                 current_life = getattr(card, 'life', 3000) 
@@ -153,26 +153,42 @@ class GameController:
                     self.view.user_slots[i].radio.configure(state="normal")
 
         # Máquina
-        for i in range(5):
-            card = CardAPI.get_random_monster()
+        for i, card in enumerate(deck.machine_hand):
             if card:
                 self.model.add_machine_card(i, card)
                 current_life = getattr(card, 'life', 3000)
                 self.view.machine_slots[i].update(card, card_life=current_life)
 
-    def load_queue_cards(self):
-        """Llena las colas completamente."""
-        # Cola Usuario
-        for i in range(len(self.model.user_queue)):
-            card = CardAPI.get_random_monster()
-            if card:
-                self.model.set_user_queue(i, card)
-
-        # Cola Máquina
-        for i in range(len(self.model.machine_queue)):
-            card = CardAPI.get_random_monster()
-            if card:
-                self.model.set_machine_queue(i, card)
+    def _start_replay(self, deck):
+        """Abre el registro de la partida nueva y anota las cartas repartidas."""
+        if self.engine.replay:
+            self.engine.replay.close()
+            self.engine.replay = None
+        if self.replay_dir is None:
+            return
+        try:
+            self.engine.replay = ReplayLog(ReplayLog.new_path(self.replay_dir), seed=self.seed)
+            self.engine.replay.record_deck(deck)
+        except OSError as e:
+            messagebox.showwarning("Registro", f"No se pudo crear el registro de la partida:\n{e}")
+            self.engine.replay = None
+
+    def load_queue_cards(self, deck=None):
+        """Llena los espacios libres de las colas."""
+        if deck is None:
+            deck = self.deck_builder.build(
+                hand_size=0,
+                user_queue_size=self.model.user_queue.free,
+                machine_queue_size=self.model.machine_queue.free,
+            )
+            if self.engine.replay:
+                self.engine.replay.record_queues(self.model.user_queue.capacity, deck)
+
+        # Las cartas nuevas entran por el final de cada cola (hasta su capacidad)
+        for card in deck.user_queue:
+            self.model.user_queue.push(card)
+        for card in deck.machine_queue:
+            self.model.machine_queue.push(card)
 
         self._update_queue_views()
 
@@ -197,6 +213,7 @@ class GameController:
 
     # game_controller.py (Función fight completa con el Log de la IA)
 
+    @traced("controller.fight")
     def fight(self):
         """Lógica de la pelea, añadiendo una validación de fusión."""
         if self.selected_fusion_slots:
@@ -221,14 +238,16 @@ class GameController:
         # 2. IA Decide entre COMBINAR o PELEAR
         
         # Le pasamos tu carta y tu modo a la IA para que elija su mejor counter o decida combinar
-        ai_move = self.ai.get_best_move(self.model, u_card, self.userBattleMode)
+        ai_move = self.engine.ask_machine(self.ai, u_slot, self.userBattleMode)
+        stats_text = self.ai.stats_text()
+        if stats_text:
+            self.ai_log.append(stats_text)
         
         if ai_move and ai_move.get('type') == 'combine':
             # 2.1. La IA elige COMBINAR
             self.execute_machine_combination(ai_move)
             
             # El turno termina sin pelea. Reiniciamos el estado del juego para el próximo turno.
-            self.model.user_can_combine = True # Habilita al usuario para combinar de nuevo en su turno
             self.userBattleMode = None
             self.view.user_var.set(-1)
             self.update_mode_buttons()
@@ -259,9 +278,9 @@ class GameController:
             self._check_deck_exhaustion()
             return
 
-        # 3. Pelear
-        result, dmg_u, dmg_m = self.model.fight_round(
-            u_card, m_card, self.userBattleMode, self.machineBattleMode, u_slot, m_slot
+        # 3. Pelear (el motor aplica el daño, reemplaza las cartas destruidas y cierra el turno)
+        result, dmg_u, dmg_m = self.engine.resolve_fight(
+            u_slot, self.userBattleMode, m_slot, self.machineBattleMode
         )
 
         # 4. Actualizar interfaz
@@ -282,27 +301,24 @@ class GameController:
         
         messagebox.showinfo("Resultado", msg)
 
-        # 5. Reemplazar cartas perdidas y RELLENAR MAZO
-        if result == "machine_loses":
-            self._handle_card_loss(m_slot, is_user=False)
-        elif result == "user_loses":
-            self._handle_card_loss(u_slot, is_user=True)
-        elif result == "both_lose":
-            self._handle_card_loss(u_slot, is_user=True)
-            self._handle_card_loss(m_slot, is_user=False)
+        # 5. Mostrar las cartas que llegaron desde la cola
+        if result in ("machine_loses", "both_lose"):
+            self._show_hand_slot(m_slot, is_user=False)
+        if result in ("user_loses", "both_lose"):
+            self._show_hand_slot(u_slot, is_user=True)
+        if result != "draw":
+            self._update_queue_views()
 
-        # Resetear estado del turno y las banderas de Fusión
+        # Resetear estado del turno
         self.userBattleMode = None
         self.machineBattleMode = None
         self.update_mode_buttons()
         self.view.user_var.set(-1)
-        
-        # --- Reiniciar la capacidad de Fusión para el siguiente turno ---
-        self.model.user_can_combine = True
-        self.model.machine_can_combine = True
 
         # Verificar ganador
         winner = self.model.check_winner()
+        if winner:
+            self.engine.record_end(winner)
         if winner == "user":
             messagebox.showinfo("Fin", "¡GANASTE LA PARTIDA!")
             self.new_match()
@@ -316,184 +332,105 @@ class GameController:
     def execute_machine_combination(self, ai_move):
         """Ejecuta el movimiento de combinación decidido por la IA."""
         idx1, idx2 = ai_move['slots']
-        new_atk = ai_move['new_atk']
-        new_def = ai_move['new_def']
         
-        # 1. Crear la carta combinada
-        new_combined_card_api = CardAPI.get_random_monster()
-        if not new_combined_card_api:
-            messagebox.showerror("Error", "No se pudo obtener una imagen base para la fusión de la IA.")
-            return
-            
-        self.fusion_counter += 1
-        new_card_name = f"IA COMBINACION {self.fusion_counter}"
-
-        from model.card_model import Card
-        combined_card = Card(
-            name=new_card_name,
-            atk=new_atk,
-            defe=new_def,
-            img_url=new_combined_card_api.img_url
+        # 1. Fusionar en el motor (desactiva la fusión de la IA y habilita de nuevo la del usuario)
+        card1, card2 = self.model.machine_cards[idx1], self.model.machine_cards[idx2]
+        combined_card, target_slot, other_slot = self.engine.combine(
+            False, idx1, idx2, img_url=CardAPI.fusion_art_url(card1, card2)
         )
 
-        # 2. Determinar el slot de destino (el menor índice)
-        target_slot = min(idx1, idx2)
-        other_slot = max(idx1, idx2)
-        
-        # 3. Reemplazar las dos cartas por una nueva:
-        self.model.add_machine_card(target_slot, combined_card)
+        # 2. Reflejar el cambio en la vista
         self.view.machine_slots[target_slot].update(combined_card)
+        self._show_hand_slot(other_slot, is_user=False)
+        self._update_queue_views()
         
-        # 4. El otro slot se llena con la siguiente carta de la cola
-        self.model.machine_cards[other_slot] = None # Marcar para reemplazo
-        self._handle_card_loss(other_slot, is_user=False)
-        
-        # 5. Informar
-        messagebox.showinfo("IA Fusión Exitosa", 
-                            f"¡La IA combinó las cartas {idx1} y {idx2}!\n"
-                            f"Nueva Carta: {new_card_name} (ATK {new_atk}/DEF {new_def}).")
-
-        # 6. Desactivar la fusión para la IA (ya que su turno terminó)
-        self.model.machine_can_combine = False
-            
-    def execute_machine_combination(self, ai_move):
-        """Ejecuta el movimiento de combinación decidido por la IA."""
-        idx1, idx2 = ai_move['slots']
-        new_atk = ai_move['new_atk']
-        new_def = ai_move['new_def']
-        
-        # 1. Crear la carta combinada
-        new_combined_card_api = CardAPI.get_random_monster()
-        if not new_combined_card_api:
-            messagebox.showerror("Error", "No se pudo obtener una imagen base para la fusión de la IA.")
-            return
-            
-        self.fusion_counter += 1
-        new_card_name = f"IA COMBINACION {self.fusion_counter}"
-
-        from model.card_model import Card
-        combined_card = Card(
-            name=new_card_name,
-            atk=new_atk,
-            defe=new_def,
-            img_url=new_combined_card_api.img_url
-        )
-
-        # 2. Determinar el slot de destino (el menor índice)
-        target_slot = min(idx1, idx2)
-        other_slot = max(idx1, idx2)
-        
-        # 3. Reemplazar las dos cartas por una nueva:
-        self.model.add_machine_card(target_slot, combined_card)
-        self.view.machine_slots[target_slot].update(combined_card)
-        
-        # 4. El otro slot se llena con la siguiente carta de la cola
-        self.model.machine_cards[other_slot] = None # Marcar para reemplazo
-        self._handle_card_loss(other_slot, is_user=False)
-        
-        # 5. Informar
+        # 3. Informar
         messagebox.showinfo("IA Fusión Exitosa", 
                             f"¡La IA combinó las cartas {idx1} y {idx2}!\n"
-                            f"Nueva Carta: {new_card_name} (ATK {new_atk}/DEF {new_def}).")
-
-        # 6. Desactivar la fusión para la IA (ya que su turno terminó)
-        self.model.machine_can_combine = False # <--- AHORA EN EL MODELO
-
-    def _handle_card_loss(self, slot_index, is_user):
-        """Maneja la eliminación y RELLENO INFINITO de cartas"""
-        if is_user:
-            self.model.user_cards[slot_index] = None
-            # Sacamos carta de la cola (esto deja un hueco None al final)
-            new_card = self.model.dequeue_user()
-            target_slots = self.view.user_slots
-            
-            # # --- CORRECCIÓN: RELLENAR EL HUECO CON CARTA NUEVA ---
-            # new_random_card = CardAPI.get_random_monster()
-            # if self.model.user_queue:
-            #     self.model.user_queue[-1] = new_random_card
-            # # -----------------------------------------------------
-
-        else:
-            self.model.machine_cards[slot_index] = None
-            new_card = self.model.dequeue_machine()
-            target_slots = self.view.machine_slots
-            
-            # # --- CORRECCIÓN: RELLENAR EL HUECO CON CARTA NUEVA ---
-            # new_random_card = CardAPI.get_random_monster()
-            # if self.model.machine_queue:
-            #     self.model.machine_queue[-1] = new_random_card
-            # # -----------------------------------------------------
+                            f"Nueva Carta: {combined_card.name} (ATK {combined_card.atk}/DEF {combined_card.defe}).")
 
+    def _show_hand_slot(self, slot_index, is_user):
+        """Muestra en la vista la carta que hay en el slot de la mano (o lo vacía)."""
+        cards = self.model.user_cards if is_user else self.model.machine_cards
         target_slots = self.view.user_slots if is_user else self.view.machine_slots
-        
-        if new_card:
-            if is_user: self.model.add_user_card(slot_index, new_card)
-            else: self.model.add_machine_card(slot_index, new_card)
-            target_slots[slot_index].update(new_card)
+        card = cards[slot_index]
+
+        if card:
+            target_slots[slot_index].update(card)
         else:
-            # Esto ya casi no debería pasar gracias al relleno, pero por seguridad:
+            # La cola ya estaba vacía
             target_slots[slot_index].disable()
             if target_slots[slot_index].name_label:
                 target_slots[slot_index].name_label.configure(text="VACÍO")
             target_slots[slot_index].img_label.configure(image=None) 
             
             self._check_deck_exhaustion()
-
-        self._update_queue_views()
         
     def _check_deck_exhaustion(self):
         """Verifica si un jugador se queda sin cartas en mano y sin cola."""
+        user_out, machine_out = self.engine.check_deck_exhaustion()
+        if user_out or machine_out:
+            self.engine.record_end("machine" if user_out else "user")
         
-        # Un jugador pierde si tiene 0 vida O si no tiene cartas en la mano
-        # Y la cola está vacía.
-        
-        user_cards_in_hand = any(self.model.user_cards)
-        machine_cards_in_hand = any(self.model.machine_cards)
-        
-        user_deck_empty = not user_cards_in_hand and not self.model.user_queue
-        machine_deck_empty = not machine_cards_in_hand and not self.model.machine_queue
-        
-        if user_deck_empty and self.model.user_life > 0:
-            self.model.user_life = 0
+        if user_out:
             messagebox.showinfo("Derrota", "¡El usuario pierde! Mazo y mano agotados.")
             self.new_match()
             
-        if machine_deck_empty and self.model.machine_life > 0:
-            self.model.machine_life = 0
+        if machine_out:
             messagebox.showinfo("Derrota", "¡La IA pierde! Mazo y mano agotados.")
             self.new_match()
             return
 
+    @traced("controller.update_queue_views")
     def _update_queue_views(self):
-        """Refresca las colas visuales."""
-        # Usuario
-        for i, slot in enumerate(self.view.user_queue_slots):
-            if i < len(self.model.user_queue):
-                card = self.model.user_queue[i]
-                if card: slot.update(card)
-                else: self._clear_queue_slot(slot)
-            else: self._clear_queue_slot(slot)
-        
-        # Máquina
-        for i, slot in enumerate(self.view.machine_queue_slots):
-            if i < len(self.model.machine_queue):
-                card = self.model.machine_queue[i]
-                if card: slot.update(card)
-                else: self._clear_queue_slot(slot)
-            else: self._clear_queue_slot(slot)
-
-    def _clear_queue_slot(self, slot):
-        """Limpia el slot de forma segura."""
-        # Evitamos el error AttributeError si la etiqueta no existe
-        if slot.name_label:
-            slot.name_label.configure(text="")
-        if slot.img_label:
-            slot.img_label.configure(image=None) 
+        """Refresca las colas visuales (solo los slots cuya carta cambió)."""
+        self._refresh_queue_row(self.view.user_queue_slots, self.model.user_queue)
+        self._refresh_queue_row(self.view.machine_queue_slots, self.model.machine_queue)
+        self._prefetch_upcoming()
+
+    def _refresh_queue_row(self, slots, queue):
+        """
+        Compara lo que muestra cada slot con las próximas cartas de la cola.
+        Si la cola solo avanzó (se robaron cartas del frente) las imágenes ya cargadas se corren
+        hacia adelante y únicamente los slots del final piden imagen nueva.
+        Retorna cuántos slots se tocaron.
+        """
+        n = len(slots)
+        upcoming = queue.peek(n)
+        upcoming += [None] * (n - len(upcoming))
+        shown = [slot.card for slot in slots]
+
+        shift = 0
+        for k in range(1, n if upcoming[0] is not shown[0] else 0):
+            if shown[k] is not None and all(upcoming[i] is shown[i + k] for i in range(n - k)):
+                shift = k
+                break
+
+        touched = 0
+        for i, slot in enumerate(slots):
+            if shift and i < n - shift:
+                touched += slot.take_from(slots[i + shift])
+            else:
+                touched += slot.show(upcoming[i])
+        return touched
+
+    def _prefetch_upcoming(self):
+        """Pide en segundo plano las imágenes que la mano va a necesitar pronto."""
+        user_next = self.model.user_queue.peek(self.prefetch_depth)
+        machine_next = self.model.machine_queue.peek(self.prefetch_depth)
+        urls = []
+        # Intercaladas: la primera de cada cola es la que entra después de la próxima pelea
+        for k in range(self.prefetch_depth):
+            urls.extend(queue[k].img_url for queue in (user_next, machine_next) if k < len(queue))
+        # El arte de las fusiones es un grupo chico y fijo: queda en caché después de la primera vez
+        urls.extend(CardAPI.get_fusion_art().urls)
+        self.view.prefetch_hand_images(urls)
 
     def set_queue(self):
         try:
             size = simpledialog.askinteger("Cola", "Tamaño:", minvalue=1, maxvalue=40)
             if size:
+                self.view.cancel_prefetch()
                 self.model.config_queues(size=size)
                 self.load_queue_cards()
                 messagebox.showinfo("Config", "Cola ajustada.")
@@ -503,7 +440,21 @@ class GameController:
         if messagebox.askyesno("Reiniciar", "¿Jugar de nuevo?"):
             self.start_new_game()
 
+    def close(self):
+        """Al cerrar la ventana: corta las precargas, cierra el registro de la partida y libera la IA (p. ej. el pool de procesos de MonteCarloAI)."""
+        self.view.cancel_prefetch()
+        if self.engine.replay:
+            self.engine.replay.close()
+            self.engine.replay = None
+        close_ai = getattr(self.ai, "close", None)
+        if close_ai is not None:
+            close_ai()
+
     def show_log(self):
         m = self.model
         msg = f"User Score: {m.user_score} (Life: {m.user_life})\nIA Score: {m.machine_score} (Life: {m.machine_life})"
+        if self.ai_log:
+            msg += "\n\nÚltimas decisiones de la IA:\n" + "\n".join(self.ai_log)
+        if TRACER.enabled:
+            msg += "\n\nTiempos por turno:\n" + TRACER.summary_text()
         messagebox.showinfo("Stats", msg)
\ No newline at end of file
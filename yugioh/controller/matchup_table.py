@@ -0,0 +1,106 @@
+# controller/matchup_table.py
+from model.game_model import ATTACK, fight_outcome_code
+
+
+def counter_score(atk_ai, def_ai, ai_mode, atk_user, def_user, user_mode):
+    """Heurística de contraataque de la IA (la de evaluate_counter_move, sin el factor aleatorio)."""
+    if user_mode == ATTACK:
+        if ai_mode == ATTACK:
+            diff = atk_ai - atk_user
+            if diff > 0:
+                return 10000 + diff
+            return 0 if diff == 0 else -10000 + diff
+        diff = def_ai - atk_user
+        if diff > 0:
+            return 5000 + diff
+        return 2000 if diff == 0 else -5000 + diff
+
+    if ai_mode == ATTACK:
+        diff = atk_ai - def_user
+        return 10000 + diff if diff > 0 else -2000 + diff
+    return 0
+
+
+class MatchupTable:
+    """
+    Tabla precalculada de todos los enfrentamientos entre las manos actuales:
+    (slot IA, modo IA) x (slot usuario, modo usuario) -> resultado, daños y puntaje heurístico.
+    Se sincroniza contra la mano: solo se recalculan las filas/columnas de los slots que cambiaron,
+    así que evaluar un movimiento es una consulta a la tabla.
+    """
+
+    def __init__(self, hand_size=5):
+        self.hand_size = hand_size
+        n = hand_size * 2 * hand_size * 2
+        self.result = [0] * n
+        self.dmg_user = [0] * n
+        self.dmg_machine = [0] * n
+        self.scores = [0] * n
+        # (atk, def) de cada slot tal como está en la tabla (None = vacío)
+        self.machine_stats = [None] * hand_size
+        self.user_stats = [None] * hand_size
+        self.stats = {"syncs": 0, "slot_updates": 0}
+
+    def index(self, m_slot, m_mode, u_slot, u_mode):
+        return ((m_slot * 2 + m_mode) * self.hand_size + u_slot) * 2 + u_mode
+
+    # --- Mantenimiento incremental ---
+
+    def _fill(self, m_slot, u_slot):
+        """Recalcula las 4 combinaciones de modo de un par de slots."""
+        m, u = self.machine_stats[m_slot], self.user_stats[u_slot]
+        for m_mode in (0, 1):
+            for u_mode in (0, 1):
+                k = self.index(m_slot, m_mode, u_slot, u_mode)
+                if m is None or u is None:
+                    self.result[k] = self.dmg_user[k] = self.dmg_machine[k] = self.scores[k] = 0
+                    continue
+                self.result[k], self.dmg_user[k], self.dmg_machine[k] = fight_outcome_code(
+                    u[0], u[1], m[0], m[1], u_mode, m_mode)
+                self.scores[k] = counter_score(m[0], m[1], m_mode, u[0], u[1], u_mode)
+
+    def set_machine(self, slot, stats):
+        """Una carta entra (stats=(atk, def)) o sale (None) del slot de la IA."""
+        if self.machine_stats[slot] == stats:
+            return False
+        self.machine_stats[slot] = stats
+        self.stats["slot_updates"] += 1
+        for u_slot in range(self.hand_size):
+            self._fill(slot, u_slot)
+        return True
+
+    def set_user(self, slot, stats):
+        """Una carta entra (stats=(atk, def)) o sale (None) del slot del usuario."""
+        if self.user_stats[slot] == stats:
+            return False
+        self.user_stats[slot] = stats
+        self.stats["slot_updates"] += 1
+        for m_slot in range(self.hand_size):
+            self._fill(m_slot, slot)
+        return True
+
+    def sync(self, model):
+        """Pone la tabla al día con las manos del modelo. Retorna cuántos slots cambiaron."""
+        size = max(len(model.machine_cards), len(model.user_cards))
+        if size != self.hand_size:
+            # Cambió el tamaño de la mano: se arma la tabla de nuevo
+            stats = self.stats
+            self.__init__(size)
+            self.stats = stats
+        self.stats["syncs"] += 1
+        changed = 0
+        for slot, card in enumerate(model.machine_cards):
+            changed += self.set_machine(slot, (card.atk, card.defe) if card else None)
+        for slot, card in enumerate(model.user_cards):
+            changed += self.set_user(slot, (card.atk, card.defe) if card else None)
+        return changed
+
+    # --- Consultas ---
+
+    def score(self, m_slot, m_mode, u_slot, u_mode):
+        return self.scores[self.index(m_slot, m_mode, u_slot, u_mode)]
+
+    def outcome(self, m_slot, m_mode, u_slot, u_mode):
+        """(resultado, daño_usuario, daño_maquina), igual que fight_outcome_code."""
+        k = self.index(m_slot, m_mode, u_slot, u_mode)
+        return self.result[k], self.dmg_user[k], self.dmg_machine[k]
@@ -0,0 +1,69 @@
+# controller/transposition_table.py
+# Tipo de valor guardado (resultado de alfa-beta)
+EXACT = 0
+LOWER = 1   # el valor real es >= score (hubo corte beta)
+UPPER = 2   # el valor real es <= score (ningún movimiento superó alfa)
+
+
+class TranspositionTable:
+    """
+    Tabla de transposición de tamaño fijo (potencia de 2).
+    Cada bucket tiene dos entradas:
+    - "profundidad": solo se reemplaza por una búsqueda igual o más profunda.
+    - "siempre": se reemplaza siempre (guarda lo más reciente).
+    Cada entrada es (clave, profundidad, score, tipo, mejor_movimiento).
+    """
+
+    def __init__(self, size=1 << 16):
+        # Redondeamos a potencia de 2 para indexar con una máscara
+        bits = max(1, (size - 1).bit_length())
+        self.size = 1 << bits
+        self.mask = self.size - 1
+        self.clear()
+
+    def clear(self):
+        self.depth_slots = [None] * self.size
+        self.always_slots = [None] * self.size
+        self.stats = {"probes": 0, "hits": 0, "stores": 0, "overwrites": 0}
+
+    def probe(self, key):
+        """Retorna la entrada guardada para la clave, o None."""
+        self.stats["probes"] += 1
+        index = key & self.mask
+
+        entry = self.depth_slots[index]
+        if entry is not None and entry[0] == key:
+            self.stats["hits"] += 1
+            return entry
+
+        entry = self.always_slots[index]
+        if entry is not None and entry[0] == key:
+            self.stats["hits"] += 1
+            return entry
+        return None
+
+    def store(self, key, depth, score, flag, move):
+        self.stats["stores"] += 1
+        index = key & self.mask
+        entry = (key, depth, score, flag, move)
+
+        current = self.depth_slots[index]
+        if current is None or current[0] == key or depth >= current[1]:
+            if current is not None and current[0] != key:
+                self.stats["overwrites"] += 1
+                # La entrada desplazada sigue siendo útil en el bucket "siempre"
+                self.always_slots[index] = current
+            self.depth_slots[index] = entry
+        else:
+            if self.always_slots[index] is not None and self.always_slots[index][0] != key:
+                self.stats["overwrites"] += 1
+            self.always_slots[index] = entry
+
+    def hit_rate(self):
+        probes = self.stats["probes"]
+        return self.stats["hits"] / probes if probes else 0.0
+
+    def usage(self):
+        """Fracción de buckets ocupados."""
+        used = sum(1 for e in self.depth_slots if e is not None)
+        return used / self.size
@@ -8,6 +8,7 @@ sys.path.append(current_dir)
 try:
     from view.game_view import GameView
     from controller.game_controller import GameController
+    from model.instrumentation import TRACER
 except ImportError as e:
     print(f"Error de importación: {e}")
     print("Asegúrate de que las carpetas se llamen 'view' y 'controller' (sin s) y estén junto a main.py")
@@ -32,6 +33,15 @@ def main():
     # Opcional: También puedes hacer app.controller = controller
 
     app.mainloop()
+    controller.close()
+
+    # Con YUGIOH_TRACE=1 se guardan los tiempos de la sesión (resumen JSON y trace de Chrome)
+    if TRACER.enabled:
+        trace_dir = os.path.join(current_dir, "model", "data", "traces")
+        os.makedirs(trace_dir, exist_ok=True)
+        TRACER.export_json(os.path.join(trace_dir, "summary.json"))
+        TRACER.export_chrome_trace(os.path.join(trace_dir, "trace.json"))
+        print(TRACER.summary_text())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
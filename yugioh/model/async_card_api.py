@@ -0,0 +1,136 @@
+# model/async_card_api.py
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from model.card_model import CardAPI
+from model.instrumentation import traced
+
+
+class AsyncCardAPI:
+    """
+    Versión asyncio de CardAPI: las mismas consultas como corrutinas, más get_many para
+    pedir muchas cartas a la vez.
+
+    El catálogo local (SQLite) y el cliente HTTP compartido de CardAPI son bloqueantes, así que
+    cada operación corre en un pool de hilos propio de 'concurrency' hilos (el de asyncio por defecto
+    depende de los núcleos) y un semáforo limita cuántas hay a la vez (no más que las conexiones
+    del pool del cliente). Así decenas de búsquedas se solapan
+    sobre las mismas conexiones keep-alive en lugar de hacerse una detrás de otra.
+    """
+
+    def __init__(self, concurrency=8, max_attempts=5):
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self._semaphore = None
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="card-api")
+
+    async def _run(self, fn, *args):
+        # El semáforo se crea dentro del loop que lo usa
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def get_cards_list(self):
+        """Lista de nombres de cartas Monster."""
+        return await self._run(CardAPI.get_cards_list)
+
+    async def get_card_by_name(self, name):
+        """Carta por nombre: del catálogo local, o de la API si no está (y queda guardada)."""
+        card = await self._run(CardAPI.get_card_by_name, name)
+        if card is not None:
+            return card
+        return CardAPI._card_from_row(await self._run(CardAPI._fetch_row_by_name, name))
+
+    async def get_random_monster(self):
+        return await self._run(CardAPI.get_random_monster)
+
+    async def get_many(self, names):
+        """Cartas para cada nombre, en el mismo orden (None si no existe). Cada nombre se busca una vez."""
+        unique = list(dict.fromkeys(names))
+        cards = await asyncio.gather(*(self.get_card_by_name(name) for name in unique))
+        by_name = dict(zip(unique, cards))
+        return [by_name[name] for name in names]
+
+    async def fetch_random_rows(self, n):
+        """n filas al azar pedidas a la API en paralelo (hasta max_attempts intentos cada una)."""
+        async def one():
+            for _ in range(self.max_attempts):
+                row = await self._run(CardAPI._fetch_random_row)
+                if row is not None:
+                    return row
+            return None
+
+        rows = await asyncio.gather(*(one() for _ in range(n)))
+        return [row for row in rows if row is not None]
+
+    async def refresh_catalog(self):
+        return await self._run(CardAPI.refresh_catalog)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+class SyncCardAPI:
+    """
+    Fachada sincrónica de AsyncCardAPI para el controlador (que corre en el hilo de Tk):
+    las corrutinas se ejecutan en un loop propio en un hilo de fondo y cada método espera el resultado.
+    """
+
+    def __init__(self, api=None):
+        self.api = api or AsyncCardAPI()
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="card-api", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+    def get_cards_list(self):
+        return self.run(self.api.get_cards_list())
+
+    def get_card_by_name(self, name):
+        return self.run(self.api.get_card_by_name(name))
+
+    def get_random_monster(self):
+        return self.run(self.api.get_random_monster())
+
+    @traced("cardapi.get_many")
+    def get_many(self, names):
+        return self.run(self.api.get_many(names))
+
+    @traced("cardapi.fetch_random_rows")
+    def fetch_random_rows(self, n):
+        return self.run(self.api.fetch_random_rows(n))
+
+    def refresh_catalog(self):
+        return self.run(self.api.refresh_catalog())
+
+    def close(self):
+        with self._lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+                self._loop.close()
+                self._loop = None
+        self.api.close()
+
+
+_shared_api = None
+
+
+def get_sync_card_api():
+    """Fachada compartida (un solo loop de fondo para todo el juego)."""
+    global _shared_api
+    if _shared_api is None:
+        _shared_api = SyncCardAPI()
+    return _shared_api
@@ -0,0 +1,148 @@
+# model/card_catalog.py
+import json
+import os
+import sqlite3
+import threading
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Archivo con cartas en el formato de ygoprodeck ({"data": [...]}) que viaja con el juego
+FIXTURE_PATH = os.path.join(DATA_DIR, "cards_fixture.json")
+
+# Base SQLite generada a partir del fixture (o de un refresco por HTTP)
+DEFAULT_DB_PATH = os.path.join(DATA_DIR, "cards.db")
+
+
+class CardCatalog:
+    """
+    Catálogo local de cartas guardado en SQLite.
+    Se llena una sola vez (importando JSON) y luego todas las consultas son locales.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, fixture_path=FIXTURE_PATH):
+        self.db_path = db_path
+        self.fixture_path = fixture_path
+        self._lock = threading.Lock()
+
+        # Aumenta cada vez que cambia el contenido (MonsterSampler lo usa para recargar su índice)
+        self.version = 0
+
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._create_schema()
+
+        # Si la base está vacía, usamos el fixture incluido (funciona sin internet)
+        if self.count() == 0 and fixture_path and os.path.exists(fixture_path):
+            self.import_file(fixture_path)
+
+    def _create_schema(self):
+        with self._lock:
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS cards (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    is_monster INTEGER NOT NULL,
+                    atk INTEGER NOT NULL,
+                    def INTEGER NOT NULL,
+                    img_url TEXT NOT NULL
+                )"""
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cards_name ON cards(name)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cards_monster ON cards(is_monster)")
+            # Datos sueltos del catálogo (p. ej. los validadores HTTP de la última descarga)
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self.conn.commit()
+
+    # --- Importación ---
+
+    def import_cards(self, cards, replace=False):
+        """
+        Importa una lista de cartas con el formato de la API de ygoprodeck.
+        Retorna la cantidad de cartas guardadas.
+        """
+        rows = []
+        for c in cards:
+            try:
+                images = c.get("card_images") or []
+                if not images:
+                    continue
+                card_type = c.get("type", "")
+                rows.append((
+                    int(c["id"]),
+                    c["name"],
+                    card_type,
+                    1 if "Monster" in card_type else 0,
+                    c.get("atk") or 0,
+                    c.get("def") or 0,
+                    images[0]["image_url"],
+                ))
+            except (KeyError, TypeError, ValueError):
+                # Carta incompleta: la ignoramos
+                continue
+
+        with self._lock:
+            if replace:
+                self.conn.execute("DELETE FROM cards")
+            self.conn.executemany("INSERT OR REPLACE INTO cards VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self.conn.commit()
+
+        self.version += 1
+        return len(rows)
+
+    def import_file(self, path, replace=False):
+        """Importa un archivo JSON ({"data": [...]} o una lista de cartas)."""
+        with open(path, encoding="utf-8") as f:
+            payload = json.load(f)
+        cards = payload["data"] if isinstance(payload, dict) else payload
+        return self.import_cards(cards, replace=replace)
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+            self.conn.commit()
+
+    # --- Consultas ---
+
+    def count(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM cards").fetchone()[0]
+
+    def get_by_id(self, card_id):
+        """Retorna (name, atk, def, img_url) o None."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT name, atk, def, img_url FROM cards WHERE id = ?", (card_id,)
+            ).fetchone()
+
+    def get_by_name(self, name):
+        """Retorna (name, atk, def, img_url) o None."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT name, atk, def, img_url FROM cards WHERE name = ? COLLATE NOCASE LIMIT 1", (name,)
+            ).fetchone()
+
+    def list_monster_names(self, limit=30, offset=0):
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT name FROM cards WHERE is_monster = 1 ORDER BY id LIMIT ? OFFSET ?", (limit, offset)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def monster_rows(self):
+        """Retorna todas las cartas Monster como lista de (name, atk, def, img_url)."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT name, atk, def, img_url FROM cards WHERE is_monster = 1 ORDER BY id"
+            ).fetchall()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
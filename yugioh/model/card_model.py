@@ -1,7 +1,18 @@
 # model/card_model.py
+import json
+
 import requests
 
+from model.card_catalog import CardCatalog
+from model.card_sampler import MonsterSampler
+from model.fusion_art import FusionArtPool
+from model.http_client import HttpClient, get_http_client
+from model.instrumentation import traced
+
 class Card:
+    # Sin __dict__ por instancia: una cola de 40 cartas ocupa mucho menos memoria
+    __slots__ = ("name", "atk", "defe", "img_url", "life")
+
     def __init__(self, name, atk, defe, img_url):
         self.name = name
         self.atk = atk
@@ -11,45 +22,145 @@ class Card:
 
 class CardAPI:
 
+    BULK_URL = "https://db.ygoprodeck.com/api/v7/cardinfo.php"
+    RANDOM_URL = "https://db.ygoprodeck.com/api/v7/randomcard.php"
+
+    # Catálogo local compartido (se crea la primera vez que se necesita)
+    _catalog = None
+    _sampler = None
+    _fusion_art = None
+
+    # Cliente HTTP compartido (keep-alive, timeouts, reintentos y límite de peticiones; ver http_client)
+    _client = None
+    # (conexión, lectura) en segundos: un host caído falla rápido sin cortar descargas lentas
+    TIMEOUT = (5, 10)
+
     @staticmethod
-    def get_cards_list():
-        """Retorna lista de nombres de cartas Monster."""
-        try:
-            url = "https://db.ygoprodeck.com/api/v7/cardinfo.php?num=30&offset=20"
-            data = requests.get(url).json()["data"]
+    def get_catalog():
+        if CardAPI._catalog is None:
+            CardAPI._catalog = CardCatalog()
+        return CardAPI._catalog
 
-            return [c["name"] for c in data if "Monster" in c["type"]]
+    @staticmethod
+    def use_catalog(catalog):
+        """Permite cambiar el catálogo (por ejemplo uno en memoria con otro fixture)."""
+        CardAPI._catalog = catalog
+        CardAPI._sampler = None
+        CardAPI._fusion_art = None
 
-        except:
-            return []
+    @staticmethod
+    def get_client():
+        if CardAPI._client is None:
+            CardAPI._client = get_http_client()
+        return CardAPI._client
 
     @staticmethod
-    def get_card_by_name(name):
-        try:
-            url = f"https://db.ygoprodeck.com/api/v7/cardinfo.php?name={requests.utils.quote(name)}"
-            card = requests.get(url).json()["data"][0]
+    def use_client(client):
+        """Permite cambiar el cliente HTTP (por ejemplo sin límite de peticiones contra stub_api)."""
+        CardAPI._client = client
+
+    @staticmethod
+    def get_sampler():
+        if CardAPI._sampler is None:
+            CardAPI._sampler = MonsterSampler(CardAPI.get_catalog(), fallback=CardAPI._fetch_random_row)
+        return CardAPI._sampler
+
+    @staticmethod
+    def get_fusion_art():
+        if CardAPI._fusion_art is None:
+            CardAPI._fusion_art = FusionArtPool(CardAPI.get_catalog().monster_rows())
+        return CardAPI._fusion_art
 
-            atk = card.get("atk", 0)
-            defe = card.get("def", 0)
-            img = card["card_images"][0]["image_url"]
+    @staticmethod
+    def fusion_art_url(card1, card2):
+        """Imagen para la fusión de dos cartas, elegida del catálogo local (sin red, siempre la misma)."""
+        return CardAPI.get_fusion_art().pick(card1, card2)
 
-            return Card(card["name"], atk, defe, img)
+    @staticmethod
+    def seed(seed):
+        """Fija la semilla del sorteo de cartas (partidas reproducibles)."""
+        CardAPI.get_sampler().seed(seed)
 
-        except:
+    @staticmethod
+    def _card_from_row(row):
+        if row is None:
             return None
+        name, atk, defe, img = row
+        return Card(name, atk, defe, img)
 
     @staticmethod
-    def get_random_monster():
-        """Obtiene una carta Monster aleatoria."""
-        while True:
-            url = "https://db.ygoprodeck.com/api/v7/randomcard.php"
-            card = requests.get(url).json()["data"][0]
+    @traced("cardapi.refresh_catalog")
+    def refresh_catalog():
+        """
+        Descarga TODAS las cartas de ygoprodeck en una sola petición y las guarda
+        en el catálogo local. Es el único camino que usa la red.
+        La petición es condicional (ETag/Last-Modified de la última descarga): si nada cambió
+        no se descarga ni se importa de nuevo.
+        Retorna la cantidad de cartas importadas, o las que ya había si no cambió nada (0 si falló).
+        """
+        catalog = CardAPI.get_catalog()
+        try:
+            validators = json.loads(catalog.get_meta("bulk_validators") or "{}")
+            response = CardAPI.get_client().get(CardAPI.BULK_URL, timeout=CardAPI.TIMEOUT, validators=validators)
+            if response.status_code == 304:
+                return catalog.count()
+            data = response.json()["data"]
+        except (requests.RequestException, ValueError, KeyError):
+            return 0
+
+        count = catalog.import_cards(data, replace=True)
+        catalog.set_meta("bulk_validators", json.dumps(HttpClient.validators(response)))
+        return count
+
+    @staticmethod
+    @traced("cardapi.get_cards_list")
+    def get_cards_list():
+        """Retorna lista de nombres de cartas Monster."""
+        return CardAPI.get_catalog().list_monster_names(limit=30)
 
+    @staticmethod
+    @traced("cardapi.get_card_by_name")
+    def get_card_by_name(name):
+        return CardAPI._card_from_row(CardAPI.get_catalog().get_by_name(name))
+
+    @staticmethod
+    @traced("cardapi.fetch_random_row")
+    def _fetch_random_row():
+        """
+        Respaldo: UNA petición a randomcard.php.
+        Retorna None si falla o si la carta no es Monster (el sampler limita los reintentos).
+        """
+        try:
+            card = CardAPI.get_client().get_json(CardAPI.RANDOM_URL, timeout=CardAPI.TIMEOUT)["data"][0]
             if "Monster" not in card["type"]:
-                continue
+                return None
+            return (card["name"], card.get("atk") or 0, card.get("def") or 0, card["card_images"][0]["image_url"])
+        except (requests.RequestException, ValueError, KeyError, IndexError):
+            return None
+
+    @staticmethod
+    @traced("cardapi.fetch_row_by_name")
+    def _fetch_row_by_name(name):
+        """
+        Respaldo: busca la carta por nombre exacto en la API y la guarda en el catálogo local.
+        Retorna (name, atk, def, img_url) o None si no existe o falla.
+        """
+        try:
+            data = CardAPI.get_client().get_json(CardAPI.BULK_URL, params={"name": name}, timeout=CardAPI.TIMEOUT)["data"]
+        except (requests.RequestException, ValueError, KeyError):
+            return None
+        if not CardAPI.get_catalog().import_cards(data):
+            return None
+        return CardAPI.get_catalog().get_by_name(name)
 
-            atk = card.get("atk", 0)
-            defe = card.get("def", 0)
-            img = card["card_images"][0]["image_url"]
+    @staticmethod
+    @traced("cardapi.get_random_monster")
+    def get_random_monster():
+        """Obtiene una carta Monster aleatoria del catálogo local."""
+        return CardAPI._card_from_row(CardAPI.get_sampler().draw())
 
-            return Card(card["name"], atk, defe, img)
+    @staticmethod
+    @traced("cardapi.sample_monsters")
+    def sample_monsters(n):
+        """Obtiene n cartas Monster aleatorias sin repetir (ver MonsterSampler.sample)."""
+        return [CardAPI._card_from_row(row) for row in CardAPI.get_sampler().sample(n)]
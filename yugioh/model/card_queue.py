@@ -0,0 +1,69 @@
+# model/card_queue.py
+from collections import deque
+from itertools import islice
+
+
+class CardQueue:
+    """
+    Cola de espera de cartas con capacidad fija (la usan el usuario y la máquina).
+    Sobre un deque: sacar del frente y rellenar por el final son O(1).
+    Solo guarda cartas reales (sin None de relleno): len() es lo que queda por sacar.
+    """
+
+    __slots__ = ("capacity", "_cards")
+
+    def __init__(self, capacity=0, cards=()):
+        self.capacity = capacity
+        self._cards = deque()
+        for card in cards:
+            self.push(card)
+
+    def __len__(self):
+        return len(self._cards)
+
+    def __bool__(self):
+        return bool(self._cards)
+
+    def __iter__(self):
+        return iter(self._cards)
+
+    def __getitem__(self, index):
+        return self._cards[index]
+
+    def __repr__(self):
+        return f"CardQueue({len(self._cards)}/{self.capacity})"
+
+    @property
+    def free(self):
+        """Espacios libres hasta la capacidad."""
+        return self.capacity - len(self._cards)
+
+    def is_full(self):
+        return len(self._cards) >= self.capacity
+
+    def push(self, card):
+        """Agrega una carta al final. Retorna False si la cola está llena o la carta es None."""
+        if card is None or len(self._cards) >= self.capacity:
+            return False
+        self._cards.append(card)
+        return True
+
+    def set(self, slot, card):
+        """Reemplaza la carta en 'slot'; si el slot es el siguiente libre, la agrega al final."""
+        if 0 <= slot < len(self._cards):
+            self._cards[slot] = card
+        elif slot == len(self._cards):
+            self.push(card)
+
+    def draw(self):
+        """Saca la primera carta (None si la cola está vacía)."""
+        if not self._cards:
+            return None
+        return self._cards.popleft()
+
+    def peek(self, k=1):
+        """Las siguientes k cartas, sin sacarlas."""
+        return list(islice(self._cards, k))
+
+    def clear(self):
+        self._cards.clear()
@@ -0,0 +1,81 @@
+# model/card_sampler.py
+import random
+
+
+class MonsterSampler:
+    """
+    Sorteo de cartas Monster sobre un índice ya filtrado del catálogo.
+    Cada sorteo es O(1) y no descarta cartas (no hay bucle de "reintentar hasta que salga Monster").
+    """
+
+    def __init__(self, catalog, seed=None, fallback=None, max_fallback_attempts=5):
+        self.catalog = catalog
+        self.rng = random.Random(seed)
+
+        # fallback: función sin argumentos que retorna una fila (name, atk, def, img_url) o None.
+        # Solo se usa si el índice local está vacío y se intenta como máximo max_fallback_attempts veces.
+        self.fallback = fallback
+        self.max_fallback_attempts = max_fallback_attempts
+
+        self._rows = []
+        self._version = None
+        self._reload()
+
+    def _reload(self):
+        """Carga en memoria las filas de las cartas Monster del catálogo."""
+        self._rows = self.catalog.monster_rows()
+        self._version = self.catalog.version
+
+    def _check_catalog(self):
+        # Si el catálogo se refrescó, reconstruimos el índice
+        if self._version != self.catalog.version:
+            self._reload()
+
+    def seed(self, seed):
+        self.rng.seed(seed)
+
+    def __len__(self):
+        self._check_catalog()
+        return len(self._rows)
+
+    def draw(self):
+        """Retorna una carta Monster aleatoria (name, atk, def, img_url) o None."""
+        self._check_catalog()
+        if self._rows:
+            return self._rows[self.rng.randrange(len(self._rows))]
+        return self._draw_fallback()
+
+    def sample(self, n):
+        """
+        Retorna n cartas Monster sin repetir.
+        Si se piden más cartas que las que hay en el índice, se hacen varias rondas
+        y cada ronda es sin reemplazo (como barajar varios mazos iguales).
+        """
+        self._check_catalog()
+        if n <= 0:
+            return []
+
+        if not self._rows:
+            result = []
+            for _ in range(n):
+                row = self._draw_fallback()
+                if row is None:
+                    break
+                result.append(row)
+            return result
+
+        result = []
+        while len(result) < n:
+            k = min(n - len(result), len(self._rows))
+            result.extend(self.rng.sample(self._rows, k))
+        return result
+
+    def _draw_fallback(self):
+        """Política de respaldo acotada: nunca entra en un bucle infinito."""
+        if not self.fallback:
+            return None
+        for _ in range(self.max_fallback_attempts):
+            row = self.fallback()
+            if row is not None:
+                return row
+        return None
@@ -0,0 +1,317 @@
+# model/compact_state.py
+import random
+from array import array
+
+from model.card_model import Card
+from model.card_queue import CardQueue
+from model.game_model import MACHINE_LOSES, USER_LOSES, fight_outcome_code
+
+FUSION_BONUS = 1000
+
+EMPTY = -1   # slot vacío
+FUSED = -2   # carta creada por una fusión (no está en la tabla de cartas)
+
+
+MASK64 = (1 << 64) - 1
+
+
+def splitmix64(x):
+    """Mezcla de 64 bits (SplitMix64): entradas parecidas dan salidas sin relación."""
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+def _mix(x):
+    """
+    Mezcla rápida (un producto y un xorshift) para las claves de cada make/unmake.
+    Es biyectiva: dos entradas distintas nunca dan la misma clave. El xorshift baja los bits
+    altos, que son los que el producto mezcla bien, a los bajos que indexan la tabla de transposición.
+    """
+    x = (x * 0x9E3779B97F4A7C15) & MASK64
+    return x ^ (x >> 32)
+
+
+class ZobristKeys:
+    """
+    Claves de 64 bits para el hashing de Zobrist.
+    Las tablas son fijas (una clave por slot, por lado y por bandera, con una semilla fija);
+    los valores variables (ATK/DEF, vidas, cursor de la cola) se mezclan con esa clave
+    (_mix en cada movimiento, splitmix64 en lo que se calcula una vez), así la memoria no crece con las cartas o vidas que aparezcan en una sesión larga.
+    """
+
+    def __init__(self, seed=20240611, max_slots=64):
+        rng = random.Random(seed)
+        self.slots = [rng.getrandbits(64) for _ in range(max_slots)]
+        self.slot_overflow = rng.getrandbits(64)
+        self.lives = (rng.getrandbits(64), rng.getrandbits(64))
+        self.queues = (rng.getrandbits(64), rng.getrandbits(64))
+        self.user_combine = rng.getrandbits(64)
+        self.machine_combine = rng.getrandbits(64)
+        self.min_node = rng.getrandbits(64)
+        self.user_move_base = rng.getrandbits(64)
+
+    def slot(self, i, atk, defe):
+        base = self.slots[i] if i < len(self.slots) else splitmix64(self.slot_overflow ^ i)
+        return _mix(base ^ ((atk & 0xFFFFFFFF) << 32 | (defe & 0xFFFFFFFF)))
+
+    def life(self, side, value):
+        return _mix(self.lives[side] ^ (value & MASK64))
+
+    def queue_base(self, side, queue_id):
+        """Clave de una cola concreta; queue() la combina con la posición del cursor."""
+        return splitmix64(self.queues[side] ^ (queue_id & MASK64))
+
+    @staticmethod
+    def queue(base, cursor):
+        return _mix(base ^ cursor)
+
+    def user_move(self, u_slot, u_mode, stats):
+        """Carta/modo que jugó el usuario (lo que responde un nodo de la IA)."""
+        slot = 0xFF if u_slot is None else u_slot & 0xFF
+        x = slot | (u_mode << 8) | ((stats[0] & 0xFFFFFF) << 16) | ((stats[1] & 0xFFFFFF) << 40)
+        return _mix(self.user_move_base ^ x)
+
+
+ZOBRIST = ZobristKeys()
+
+
+class CompactState:
+    """
+    Estado del juego en arreglos de enteros de ancho fijo.
+    Manos: atk/defe/ids con los slots del usuario en [0, H) y los de la máquina en [H, 2H).
+    Colas: un arreglo por lado con un cursor (sacar carta = mover el cursor).
+    Los movimientos se aplican con make_* y se deshacen con unmake en O(1), sin copiar el estado.
+    'hash' es la clave de Zobrist y se actualiza en cada cambio.
+    """
+
+    __slots__ = ("hand_size", "atk", "defe", "ids", "q_atk", "q_def", "q_ids", "q_keys",
+                 "cursor", "lives", "scores", "can_combine", "cards", "hash")
+
+    def __init__(self, hand_size=5):
+        self.hand_size = hand_size
+        self.atk = array('i', [0] * (2 * hand_size))
+        self.defe = array('i', [0] * (2 * hand_size))
+        self.ids = array('i', [EMPTY] * (2 * hand_size))
+        self.q_atk = [array('i'), array('i')]
+        self.q_def = [array('i'), array('i')]
+        self.q_ids = [array('i'), array('i')]
+        self.q_keys = [0, 0]         # clave de Zobrist de cada cola (ZOBRIST.queue_base)
+        self.cursor = array('i', [0, 0])
+        self.lives = array('i', [8000, 8000])
+        self.scores = array('i', [0, 0])
+        self.can_combine = array('b', [1, 1])
+        self.cards = []              # tabla id -> Card, para volver al GameModel
+        self.hash = 0
+
+    # --- Conversión desde/hacia GameModel ---
+
+    @staticmethod
+    def from_model(model):
+        st = CompactState(len(model.user_cards))
+        H = st.hand_size
+
+        def card_id(card):
+            if card is None:
+                return EMPTY
+            st.cards.append(card)
+            return len(st.cards) - 1
+
+        for side, hand in ((0, model.user_cards), (1, model.machine_cards)):
+            for slot, card in enumerate(hand):
+                i = side * H + slot
+                st.ids[i] = card_id(card)
+                if card:
+                    st.atk[i], st.defe[i] = card.atk, card.defe
+
+        for side, queue in ((0, model.user_queue), (1, model.machine_queue)):
+            for card in queue:
+                st.q_ids[side].append(card_id(card))
+                st.q_atk[side].append(card.atk if card else 0)
+                st.q_def[side].append(card.defe if card else 0)
+            st.q_keys[side] = ZOBRIST.queue_base(side, hash((st.q_atk[side].tobytes(), st.q_def[side].tobytes(),
+                                                             st.q_ids[side].tobytes())))
+
+        st.lives[0], st.lives[1] = model.user_life, model.machine_life
+        st.scores[0], st.scores[1] = model.user_score, model.machine_score
+        st.can_combine[0] = 1 if model.user_can_combine else 0
+        st.can_combine[1] = 1 if model.machine_can_combine else 0
+        st.hash = st.full_hash()
+        return st
+
+    def _card(self, card_id, atk, defe):
+        if card_id == EMPTY:
+            return None
+        if card_id == FUSED:
+            return Card("COMBINACION", atk, defe, None)
+        return self.cards[card_id]
+
+    def to_model(self, model):
+        """Escribe este estado en un GameModel (manos, colas restantes, vidas, puntajes y banderas)."""
+        H = self.hand_size
+        model.user_cards = [self._card(self.ids[i], self.atk[i], self.defe[i]) for i in range(H)]
+        model.machine_cards = [self._card(self.ids[H + i], self.atk[H + i], self.defe[H + i]) for i in range(H)]
+
+        for side, old in ((0, model.user_queue), (1, model.machine_queue)):
+            cards = [self._card(self.q_ids[side][k], self.q_atk[side][k], self.q_def[side][k])
+                     for k in range(self.cursor[side], len(self.q_ids[side]))]
+            queue = CardQueue(max(old.capacity, len(cards)), cards)
+            if side == 0:
+                model.user_queue = queue
+            else:
+                model.machine_queue = queue
+
+        model.user_life, model.machine_life = self.lives[0], self.lives[1]
+        model.user_score, model.machine_score = self.scores[0], self.scores[1]
+        model.user_can_combine = bool(self.can_combine[0])
+        model.machine_can_combine = bool(self.can_combine[1])
+        return model
+
+    # --- Hash de Zobrist ---
+
+    def _slot_key(self, i):
+        return ZOBRIST.slot(i, self.atk[i], self.defe[i])
+
+    def full_hash(self):
+        """Calcula el hash desde cero (los movimientos lo actualizan de forma incremental)."""
+        h = 0
+        for i in range(2 * self.hand_size):
+            if self.ids[i] != EMPTY:
+                h ^= self._slot_key(i)
+        h ^= ZOBRIST.life(0, self.lives[0]) ^ ZOBRIST.life(1, self.lives[1])
+        h ^= ZOBRIST.queue(self.q_keys[0], self.cursor[0]) ^ ZOBRIST.queue(self.q_keys[1], self.cursor[1])
+        if self.can_combine[0]:
+            h ^= ZOBRIST.user_combine
+        if self.can_combine[1]:
+            h ^= ZOBRIST.machine_combine
+        return h
+
+    # --- Consultas ---
+
+    def card(self, i):
+        """(atk, def) del slot absoluto i, o None si está vacío."""
+        if self.ids[i] == EMPTY:
+            return None
+        return self.atk[i], self.defe[i]
+
+    def queue_remaining(self, side):
+        return len(self.q_ids[side]) - self.cursor[side]
+
+    def hand_empty(self, side):
+        H = self.hand_size
+        for i in range(side * H, side * H + H):
+            if self.ids[i] != EMPTY:
+                return False
+        return True
+
+    def winner(self):
+        if self.lives[1] <= 0:
+            return "user"
+        if self.lives[0] <= 0:
+            return "machine"
+        if self.hand_empty(0) and self.queue_remaining(0) <= 0:
+            return "machine"
+        if self.hand_empty(1) and self.queue_remaining(1) <= 0:
+            return "user"
+        return None
+
+    # --- make / unmake ---
+    # El registro de deshacer guarda solo lo que un movimiento puede cambiar:
+    # (hash, vidas, puntajes, banderas, cursores, y hasta dos slots con su valor anterior).
+
+    def _snapshot(self):
+        return [self.hash, self.lives[0], self.lives[1], self.scores[0], self.scores[1],
+                self.can_combine[0], self.can_combine[1], self.cursor[0], self.cursor[1]]
+
+    def _set_slot(self, i, card_id, atk, defe, undo):
+        undo.append((i, self.ids[i], self.atk[i], self.defe[i]))
+        if self.ids[i] != EMPTY:
+            self.hash ^= self._slot_key(i)
+        self.ids[i], self.atk[i], self.defe[i] = card_id, atk, defe
+        if card_id != EMPTY:
+            self.hash ^= self._slot_key(i)
+
+    def _refill(self, side, slot, undo):
+        """Como GameEngine.handle_card_loss: el slot recibe la siguiente carta de la cola (o queda vacío)."""
+        i = side * self.hand_size + slot
+        k = self.cursor[side]
+        if k < len(self.q_ids[side]):
+            self.hash ^= ZOBRIST.queue(self.q_keys[side], k) ^ ZOBRIST.queue(self.q_keys[side], k + 1)
+            self.cursor[side] = k + 1
+            self._set_slot(i, self.q_ids[side][k], self.q_atk[side][k], self.q_def[side][k], undo)
+        else:
+            self._set_slot(i, EMPTY, 0, 0, undo)
+
+    def _set_lives(self, user_life, machine_life):
+        if user_life != self.lives[0]:
+            self.hash ^= ZOBRIST.life(0, self.lives[0]) ^ ZOBRIST.life(0, user_life)
+            self.lives[0] = user_life
+        if machine_life != self.lives[1]:
+            self.hash ^= ZOBRIST.life(1, self.lives[1]) ^ ZOBRIST.life(1, machine_life)
+            self.lives[1] = machine_life
+
+    def _set_flags(self, user_can_combine, machine_can_combine):
+        if user_can_combine != self.can_combine[0]:
+            self.hash ^= ZOBRIST.user_combine
+            self.can_combine[0] = user_can_combine
+        if machine_can_combine != self.can_combine[1]:
+            self.hash ^= ZOBRIST.machine_combine
+            self.can_combine[1] = machine_can_combine
+
+    def make_fight(self, u_slot, u_mode, m_slot, m_mode, u_stats=None):
+        """
+        Pelea + reemplazo de la carta destruida + fin de turno. Modos con códigos (ATTACK/DEFENSE).
+        u_stats permite pelear con una carta del usuario que no está en la mano (u_slot None).
+        Retorna el registro para unmake.
+        """
+        undo = self._snapshot()
+        H = self.hand_size
+        if u_stats is not None:
+            atkU, defU = u_stats
+        else:
+            atkU, defU = self.atk[u_slot], self.defe[u_slot]
+        m = H + m_slot
+
+        result, dmg_u, dmg_m = fight_outcome_code(atkU, defU, self.atk[m], self.defe[m], u_mode, m_mode)
+
+        life_u = self.lives[0] - dmg_u
+        life_m = self.lives[1] - dmg_m
+        self._set_lives(life_u if life_u > 0 else 0, life_m if life_m > 0 else 0)
+
+        if result == MACHINE_LOSES:
+            self.scores[0] += 1
+            self._refill(1, m_slot, undo)
+        elif result == USER_LOSES:
+            self.scores[1] += 1
+            if u_slot is not None:
+                self._refill(0, u_slot, undo)
+
+        self._set_flags(1, 1)
+        return undo
+
+    def make_combine(self, side, i, j):
+        """Fusión: la carta nueva queda en el slot menor y el mayor se rellena de la cola."""
+        undo = self._snapshot()
+        base = side * self.hand_size
+        a, b = base + i, base + j
+        new_atk = (self.atk[a] if self.atk[a] > self.atk[b] else self.atk[b]) + FUSION_BONUS
+        new_def = (self.defe[a] if self.defe[a] > self.defe[b] else self.defe[b]) + FUSION_BONUS
+
+        self._set_slot(base + min(i, j), FUSED, new_atk, new_def, undo)
+        self._refill(side, max(i, j), undo)
+
+        if side == 0:
+            self._set_flags(0, self.can_combine[1])
+        else:
+            # Como en el controlador: la IA terminó su turno combinando
+            self._set_flags(1, 0)
+        return undo
+
+    def unmake(self, undo):
+        """Deshace el último make_* (los registros se deshacen en orden inverso)."""
+        for k in range(len(undo) - 1, 8, -1):
+            i, card_id, atk, defe = undo[k]
+            self.ids[i], self.atk[i], self.defe[i] = card_id, atk, defe
+        (self.hash, self.lives[0], self.lives[1], self.scores[0], self.scores[1],
+         self.can_combine[0], self.can_combine[1], self.cursor[0], self.cursor[1]) = undo[:9]
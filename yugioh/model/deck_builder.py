@@ -0,0 +1,87 @@
+# model/deck_builder.py
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from model.card_model import CardAPI
+from model.instrumentation import span, traced
+
+
+class Deck:
+    """Cartas de una partida: manos y colas de ambos jugadores, más los tiempos de cada etapa."""
+
+    def __init__(self, user_hand, machine_hand, user_queue, machine_queue, timings):
+        self.user_hand = user_hand
+        self.machine_hand = machine_hand
+        self.user_queue = user_queue
+        self.machine_queue = machine_queue
+        self.timings = timings
+
+    def timings_text(self):
+        return " | ".join(f"{stage}: {ms:.2f} ms" for stage, ms in self.timings.items())
+
+
+class DeckBuilder:
+    """
+    Arma todas las cartas de una partida en UN solo lote:
+    1. Sortea del catálogo local todas las cartas que se necesitan (sin repetir).
+    2. Si el catálogo no alcanza, pide las que faltan a la API en paralelo, con un pool acotado
+       (o con la API asyncio si se pasa 'api', un SyncCardAPI) y el cliente HTTP compartido de CardAPI.
+    3. Reparte el lote entre manos y colas.
+    """
+
+    def __init__(self, sampler=None, fetch_row=None, max_workers=8, max_attempts=5, api=None):
+        self.sampler = sampler
+        self.api = api
+        self.fetch_row = fetch_row or CardAPI._fetch_random_row
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+
+    def _fetch_one(self, _):
+        for _ in range(self.max_attempts):
+            row = self.fetch_row()
+            if row is not None:
+                return row
+        return None
+
+    def fetch_remote(self, n):
+        """Pide n cartas a la API en paralelo (las que fallen se descartan)."""
+        if n <= 0:
+            return []
+        if self.api is not None:
+            return self.api.fetch_random_rows(n)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, n)) as pool:
+            return [row for row in pool.map(self._fetch_one, range(n)) if row is not None]
+
+    @traced("deck_builder.build")
+    def build(self, hand_size=5, user_queue_size=0, machine_queue_size=0):
+        timings = {}
+        start = time.perf_counter()
+        total = 2 * hand_size + user_queue_size + machine_queue_size
+
+        # 1. Lote local
+        t = time.perf_counter()
+        with span("deck_builder.sample"):
+            sampler = self.sampler if self.sampler is not None else CardAPI.get_sampler()
+            rows = sampler.sample(total) if len(sampler) else []
+        timings["sample"] = (time.perf_counter() - t) * 1000
+
+        # 2. Faltantes por red (solo si el catálogo está vacío)
+        t = time.perf_counter()
+        with span("deck_builder.remote"):
+            rows.extend(self.fetch_remote(total - len(rows)))
+        timings["remote"] = (time.perf_counter() - t) * 1000
+
+        # 3. Crear las cartas y repartirlas
+        t = time.perf_counter()
+        cards = [CardAPI._card_from_row(row) for row in rows]
+        cards.extend([None] * (total - len(cards)))
+
+        pos = 0
+        parts = []
+        for size in (hand_size, hand_size, user_queue_size, machine_queue_size):
+            parts.append(cards[pos:pos + size])
+            pos += size
+        timings["cards"] = (time.perf_counter() - t) * 1000
+
+        timings["total"] = (time.perf_counter() - start) * 1000
+        return Deck(parts[0], parts[1], parts[2], parts[3], timings)
@@ -0,0 +1,36 @@
+# model/fight_batch.py
+import numpy as np
+
+from model.game_model import ATTACK, DRAW, MACHINE_LOSES, USER_LOSES
+
+
+def fight_round_batch(atkU, defU, atkM, defM, mode_user, mode_machine):
+    """
+    Versión vectorizada de fight_outcome_code: resuelve muchas peleas a la vez.
+    Recibe arreglos (o escalares, se hace broadcast) de ATK/DEF y códigos de modo (ATTACK/DEFENSE).
+    Retorna (resultado, daño_usuario, daño_maquina) como arreglos int64.
+    No toca vidas ni puntajes.
+
+    Las reglas se reducen a comparar un valor por lado:
+    el ATK si la carta ataca y la DEF si defiende. Si ninguno ataca no pasa nada;
+    si no, el que tiene el valor mayor hace daño por la diferencia
+    (penetración si ataca, rebote si defiende), y solo pierde la carta
+    el lado que estaba atacando (o el que defiende frente a un ataque mayor).
+    """
+    atkU = np.asarray(atkU, dtype=np.int64)
+    defU = np.asarray(defU, dtype=np.int64)
+    atkM = np.asarray(atkM, dtype=np.int64)
+    defM = np.asarray(defM, dtype=np.int64)
+    user_attacks = np.asarray(mode_user) == ATTACK
+    machine_attacks = np.asarray(mode_machine) == ATTACK
+
+    diff = np.where(user_attacks, atkU, defU) - np.where(machine_attacks, atkM, defM)
+    active = user_attacks | machine_attacks
+
+    damage_to_machine = np.where(active, np.maximum(diff, 0), 0)
+    damage_to_user = np.where(active, np.maximum(-diff, 0), 0)
+
+    result = np.full(diff.shape, DRAW, dtype=np.int64)
+    result[active & user_attacks & (diff > 0)] = MACHINE_LOSES
+    result[active & machine_attacks & (diff < 0)] = USER_LOSES
+    return result, damage_to_user, damage_to_machine
@@ -0,0 +1,28 @@
+# model/fusion_art.py
+import zlib
+
+
+class FusionArtPool:
+    """
+    Arte para las cartas fusionadas, sin red: un grupo fijo de imágenes del catálogo local
+    (repartidas a lo largo de todo el catálogo) y una elección determinista según las cartas
+    que se fusionan. La misma pareja siempre da la misma imagen y el grupo es chico,
+    así que sus imágenes se pueden precargar una vez por sesión.
+    """
+
+    def __init__(self, rows=(), size=16):
+        urls = [row[3] for row in rows if row[3]]
+        step = max(1, len(urls) // size) if size else 1
+        self.urls = urls[::step][:size]
+
+    @staticmethod
+    def key(card1, card2):
+        """Clave estable entre procesos (hash() de str cambia con cada ejecución) e independiente del orden."""
+        parts = sorted(f"{c.name}|{c.atk}|{c.defe}" for c in (card1, card2))
+        return zlib.crc32("||".join(parts).encode("utf-8"))
+
+    def pick(self, card1, card2):
+        """URL de la imagen para la fusión de card1 y card2 (None si el catálogo está vacío)."""
+        if not self.urls:
+            return None
+        return self.urls[self.key(card1, card2) % len(self.urls)]
@@ -0,0 +1,251 @@
+# model/game_engine.py
+import random
+
+from model.card_model import Card
+from model.game_model import GameModel
+from model.instrumentation import traced
+
+
+class GameEngine:
+    """
+    Reglas completas del juego SIN interfaz gráfica (no importa tkinter).
+    El GameController lo usa para cambiar el estado y luego actualiza la vista;
+    las simulaciones lo usan directamente con políticas de jugador.
+    """
+
+    HAND_SIZE = 5
+    FUSION_BONUS = 1000
+
+    def __init__(self, model=None, replay=None):
+        self.model = model or GameModel()
+        self.fusion_counter = 0
+        # Registro de la partida (model/replay_log.py); None = no se registra
+        self.replay = replay
+
+    # --- Preparación ---
+
+    def new_game(self, deck):
+        """Reinicia el modelo y reparte un Deck (ver model/deck_builder.py)."""
+        self.model.reset()
+        self.fusion_counter = 0
+        if self.replay:
+            self.replay.record_deck(deck)
+        self.model.config_queues(max(len(deck.user_queue), len(deck.machine_queue)))
+
+        for i, card in enumerate(deck.user_queue):
+            if card:
+                self.model.set_user_queue(i, card)
+        for i, card in enumerate(deck.machine_queue):
+            if card:
+                self.model.set_machine_queue(i, card)
+        for i, card in enumerate(deck.user_hand):
+            if card:
+                self.model.add_user_card(i, card)
+        for i, card in enumerate(deck.machine_hand):
+            if card:
+                self.model.add_machine_card(i, card)
+
+    # --- Fusión ---
+
+    @staticmethod
+    def fusion_stats(card1, card2):
+        """ATK/DEF de la carta fusionada: el MAYOR de cada una, más 1000."""
+        new_atk = max(card1.atk, card2.atk) + GameEngine.FUSION_BONUS
+        new_def = max(card1.defe, card2.defe) + GameEngine.FUSION_BONUS
+        return new_atk, new_def
+
+    def combine(self, is_user, idx1, idx2, img_url=None):
+        """
+        Fusiona dos cartas de la mano: la nueva ocupa el slot menor y el otro
+        se rellena desde la cola. Retorna (carta_combinada, target_slot, other_slot).
+        """
+        cards = self.model.user_cards if is_user else self.model.machine_cards
+        card1, card2 = cards[idx1], cards[idx2]
+        new_atk, new_def = self.fusion_stats(card1, card2)
+        if self.replay:
+            self.replay.record_combine(is_user, idx1, idx2, img_url)
+
+        self.fusion_counter += 1
+        prefix = "COMBINACION" if is_user else "IA COMBINACION"
+        combined_card = Card(name=f"{prefix} {self.fusion_counter}", atk=new_atk, defe=new_def, img_url=img_url)
+
+        target_slot = min(idx1, idx2)
+        other_slot = max(idx1, idx2)
+
+        if is_user:
+            self.model.add_user_card(target_slot, combined_card)
+            self.model.user_can_combine = False
+        else:
+            self.model.add_machine_card(target_slot, combined_card)
+            self.model.machine_can_combine = False
+            # La IA terminó el turno combinando: el usuario puede volver a combinar
+            self.model.user_can_combine = True
+
+        self.handle_card_loss(other_slot, is_user)
+        return combined_card, target_slot, other_slot
+
+    # --- Pérdida de cartas y fin de partida ---
+
+    @traced("engine.handle_card_loss")
+    def handle_card_loss(self, slot_index, is_user):
+        """Saca la carta del slot y lo rellena con la siguiente de la cola. Retorna la nueva carta o None."""
+        if is_user:
+            self.model.user_cards[slot_index] = None
+            new_card = self.model.dequeue_user()
+            if new_card:
+                self.model.add_user_card(slot_index, new_card)
+        else:
+            self.model.machine_cards[slot_index] = None
+            new_card = self.model.dequeue_machine()
+            if new_card:
+                self.model.add_machine_card(slot_index, new_card)
+        return new_card
+
+    def check_deck_exhaustion(self):
+        """
+        Un jugador pierde si no tiene cartas en la mano Y su cola está vacía.
+        Retorna (usuario_agotado, maquina_agotada) y deja en 0 la vida del que perdió.
+        """
+        user_cards_in_hand = any(self.model.user_cards)
+        machine_cards_in_hand = any(self.model.machine_cards)
+
+        user_out = not user_cards_in_hand and not self.model.user_queue and self.model.user_life > 0
+        machine_out = not machine_cards_in_hand and not self.model.machine_queue and self.model.machine_life > 0
+
+        if user_out:
+            self.model.user_life = 0
+        if machine_out:
+            self.model.machine_life = 0
+        return user_out, machine_out
+
+    # --- Pelea ---
+
+    def resolve_fight(self, u_slot, u_mode, m_slot, m_mode):
+        """
+        Pelea completa: daño, reemplazo de cartas destruidas y fin del turno.
+        Retorna (resultado, daño_usuario, daño_maquina).
+        """
+        u_card = self.model.user_cards[u_slot]
+        m_card = self.model.machine_cards[m_slot]
+        result, dmg_u, dmg_m = self.model.fight_round(u_card, m_card, u_mode, m_mode, u_slot, m_slot)
+        if self.replay:
+            self.replay.record_fight(u_slot, u_mode, m_slot, m_mode, result, dmg_u, dmg_m)
+
+        if result == "machine_loses":
+            self.handle_card_loss(m_slot, is_user=False)
+        elif result == "user_loses":
+            self.handle_card_loss(u_slot, is_user=True)
+        elif result == "both_lose":
+            self.handle_card_loss(u_slot, is_user=True)
+            self.handle_card_loss(m_slot, is_user=False)
+
+        self.end_turn()
+        return result, dmg_u, dmg_m
+
+    def ask_machine(self, policy, u_slot, u_mode):
+        """Pide a la IA su respuesta a la carta/modo del usuario (y la registra en la repetición)."""
+        move = policy.get_best_move(self.model, self.model.user_cards[u_slot], u_mode)
+        if self.replay:
+            self.replay.record_decision(u_slot, u_mode, move)
+        return move
+
+    def record_end(self, winner):
+        if self.replay:
+            self.replay.record_end(winner, self.model)
+
+    def end_turn(self):
+        self.model.user_can_combine = True
+        self.model.machine_can_combine = True
+
+    def winner(self):
+        """'user', 'machine' o None, según vidas y agotamiento de mazo."""
+        winner = self.model.check_winner()
+        if winner:
+            return winner
+        user_out, machine_out = self.check_deck_exhaustion()
+        if user_out:
+            return "machine"
+        if machine_out:
+            return "user"
+        return None
+
+    # --- Simulación ---
+
+    def play_turn(self, user_policy, machine_policy):
+        """
+        Un turno completo sin interfaz:
+        el usuario puede combinar y luego elige carta/modo; la IA responde
+        combinando (termina el turno) o peleando.
+        """
+        move = user_policy.choose_user_move(self.model)
+        if move and move["type"] == "combine" and self.model.user_can_combine:
+            self.combine(True, *move["slots"])
+            move = user_policy.choose_user_move(self.model)
+
+        if not move or move["type"] != "fight" or not self.model.user_cards[move["index"]]:
+            return None
+
+        u_slot, u_mode = move["index"], move["mode"]
+
+        ai_move = self.ask_machine(machine_policy, u_slot, u_mode)
+        if ai_move and ai_move.get("type") == "combine":
+            self.combine(False, *ai_move["slots"])
+            return "combine"
+
+        if ai_move:
+            m_slot, m_mode = ai_move.get("index", 0), ai_move.get("mode", "attack")
+        else:
+            m_slot, m_mode = first_card_slot(self.model.machine_cards), "defense"
+
+        if m_slot is None or not self.model.machine_cards[m_slot]:
+            return None
+
+        result, _, _ = self.resolve_fight(u_slot, u_mode, m_slot, m_mode)
+        return result
+
+    def play_game(self, user_policy, machine_policy, max_turns=1000):
+        """Juega hasta que haya ganador. Retorna (ganador, turnos); ganador None si se llegó a max_turns."""
+        for turn in range(1, max_turns + 1):
+            self.play_turn(user_policy, machine_policy)
+            winner = self.winner()
+            if winner:
+                self.record_end(winner)
+                return winner, turn
+        self.record_end(None)
+        return None, max_turns
+
+
+def first_card_slot(cards):
+    for i, card in enumerate(cards):
+        if card:
+            return i
+    return None
+
+
+class RandomUserPolicy:
+    """Usuario que elige carta y modo al azar (y a veces combina)."""
+
+    def __init__(self, seed=None, combine_prob=0.1):
+        self.rng = random.Random(seed)
+        self.combine_prob = combine_prob
+
+    def choose_user_move(self, model):
+        slots = [i for i, c in enumerate(model.user_cards) if c]
+        if not slots:
+            return None
+        if model.user_can_combine and len(slots) >= 2 and self.rng.random() < self.combine_prob:
+            return {"type": "combine", "slots": tuple(self.rng.sample(slots, 2))}
+        return {"type": "fight", "index": self.rng.choice(slots), "mode": self.rng.choice(("attack", "defense"))}
+
+
+class RandomMachinePolicy:
+    """Máquina que responde al azar (mismo contrato que MinimaxAI.get_best_move)."""
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def get_best_move(self, model, opponent_card, opponent_mode):
+        slots = [i for i, c in enumerate(model.machine_cards) if c]
+        if not slots:
+            return None
+        return {"type": "fight", "index": self.rng.choice(slots), "mode": self.rng.choice(("attack", "defense"))}
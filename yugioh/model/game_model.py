@@ -1,4 +1,5 @@
 # model/game_model.py
+from model.card_queue import CardQueue
 
 class GameModel:
 
@@ -10,9 +11,9 @@ class GameModel:
         self.user_life = 8000
         self.machine_life = 8000
 
-        # colas/espera fijas (8 espacios)
-        self.user_queue = []
-        self.machine_queue = []
+        # colas de espera (capacidad fija, ver config_queues)
+        self.user_queue = CardQueue()
+        self.machine_queue = CardQueue()
 
         self.user_score = 0
         self.machine_score = 0
@@ -24,8 +25,8 @@ class GameModel:
         self.machine_can_combine = True
 
     def config_queues(self, size):
-        self.user_queue = [None] * size
-        self.machine_queue = [None] * size
+        self.user_queue = CardQueue(size)
+        self.machine_queue = CardQueue(size)
 
     def add_user_card(self, slot, card):
         self.user_cards[slot] = card
@@ -35,26 +36,18 @@ class GameModel:
 
 
     def set_user_queue(self, slot, card):
-        if 0 <= slot < len(self.user_queue):
-            self.user_queue[slot] = card
+        self.user_queue.set(slot, card)
 
     def set_machine_queue(self, slot, card):
-        if 0 <= slot < len(self.machine_queue):
-            self.machine_queue[slot] = card
+        self.machine_queue.set(slot, card)
 
     def dequeue_user(self):
         """Saca la primera carta de la cola del usuario."""
-        if not self.user_queue:
-            return None
-        card = self.user_queue.pop(0)
-        return card
+        return self.user_queue.draw()
 
     def dequeue_machine(self):
         """Saca la primera carta de la cola de la máquina."""
-        if not self.machine_queue:
-            return None
-        card = self.machine_queue.pop(0)
-        return card
+        return self.machine_queue.draw()
 
     def fight_round(self, u_card, m_card, mode_user, mode_machine, u_slot, m_slot):
         """
@@ -65,67 +58,14 @@ class GameModel:
         if not u_card or not m_card:
             return "draw", 0, 0
 
-        atkU, defU = u_card.atk, u_card.defe
-        atkM, defM = m_card.atk, m_card.defe
-
-        damage_to_user = 0
-        damage_to_machine = 0
-        result = "draw"
-
-        # Normalizamos a minúsculas
-        mode_user = mode_user.lower()
-        mode_machine = mode_machine.lower()
-
-        # Mapeo de términos
-        if mode_user == "atk": mode_user = "attack"
-        if mode_user == "def": mode_user = "defense"
-        if mode_machine == "atk": mode_machine = "attack"
-        if mode_machine == "def": mode_machine = "defense"
-
-        # --- CASO 1: AMBOS ATACAN ---
-        if mode_user == "attack" and mode_machine == "attack":
-            if atkU > atkM:
-                damage_to_machine = atkU - atkM
-                result = "machine_loses"
-                self.user_score += 1
-            elif atkM > atkU:
-                damage_to_user = atkM - atkU
-                result = "user_loses"
-                self.machine_score += 1
-            else:
-                result = "draw" # Empate, ambas mueren (opcionalmente)
-
-        # --- CASO 2: TÚ ATACAS vs IA DEFENSA ---
-        elif mode_user == "attack" and mode_machine == "defense":
-            if atkU > defM:
-                # ANTES: damage_to_machine = 0
-                # AHORA: Calculamos la diferencia para bajar vida (Piercing Damage)
-                damage_to_machine = atkU - defM 
-                result = "machine_loses"
-                self.user_score += 1
-            else:
-                # Si la defensa de la IA es mayor que tu ataque, TÚ recibes daño (rebote)
-                if defM > atkU:
-                    damage_to_user = defM - atkU
-                result = "draw" # Nadie muere, pero tú recibes daño
-
-        # --- CASO 3: TÚ DEFIENDES vs IA ATACA ---
-        elif mode_user == "defense" and mode_machine == "attack":
-            if atkM > defU:
-                # ANTES: damage_to_user = 0
-                # AHORA: La IA también te hace daño de penetración si rompe tu defensa
-                damage_to_user = atkM - defU
-                result = "user_loses"
-                self.machine_score += 1
-            else:
-                # Si tu defensa es mayor, la IA recibe daño (rebote)
-                if defU > atkM:
-                    damage_to_machine = defU - atkM
-                result = "draw" # Nadie muere
-
-        # --- CASO 4: AMBOS DEFIENDEN (Nada pasa usualmente) ---
-        else:
-            result = "draw"
+        result, damage_to_user, damage_to_machine = fight_outcome(
+            u_card.atk, u_card.defe, m_card.atk, m_card.defe, mode_user, mode_machine
+        )
+
+        if result == "machine_loses":
+            self.user_score += 1
+        elif result == "user_loses":
+            self.machine_score += 1
 
         # Aplicar daño a las vidas globales
         self.user_life -= damage_to_user
@@ -147,4 +87,71 @@ class GameModel:
         return None
 
     def reset(self):
-        self.__init__()
\ No newline at end of file
+        self.__init__()
+
+
+def normalize_mode(mode):
+    """'atk'/'ATK'/'attack' -> 'attack', 'def'/'defense' -> 'defense'."""
+    mode = mode.lower()
+    if mode == "atk": return "attack"
+    if mode == "def": return "defense"
+    return mode
+
+
+# Códigos enteros de modo y resultado (para simulaciones y búsqueda rápidas)
+ATTACK = 0
+DEFENSE = 1
+MODE_CODES = {"attack": ATTACK, "defense": DEFENSE}
+MODE_NAMES = ("attack", "defense")
+
+DRAW = 0
+USER_LOSES = 1
+MACHINE_LOSES = 2
+RESULT_NAMES = ("draw", "user_loses", "machine_loses")
+
+
+def fight_outcome(atkU, defU, atkM, defM, mode_user, mode_machine):
+    """
+    Reglas de una pelea SIN efectos secundarios (no toca vidas ni puntajes).
+    Retorna (resultado, daño_usuario, daño_maquina).
+    """
+    code_user = MODE_CODES.get(normalize_mode(mode_user))
+    code_machine = MODE_CODES.get(normalize_mode(mode_machine))
+    if code_user is None or code_machine is None:
+        return "draw", 0, 0
+
+    result, damage_to_user, damage_to_machine = fight_outcome_code(atkU, defU, atkM, defM, code_user, code_machine)
+    return RESULT_NAMES[result], damage_to_user, damage_to_machine
+
+
+def fight_outcome_code(atkU, defU, atkM, defM, mode_user, mode_machine):
+    """
+    Igual que fight_outcome pero con códigos enteros (ATTACK/DEFENSE -> DRAW/USER_LOSES/MACHINE_LOSES).
+    Con daño de penetración (romper defensa baja vida) y daño de rebote.
+    """
+    # --- CASO 1: AMBOS ATACAN ---
+    if mode_user == ATTACK and mode_machine == ATTACK:
+        if atkU > atkM:
+            return MACHINE_LOSES, 0, atkU - atkM
+        if atkM > atkU:
+            return USER_LOSES, atkM - atkU, 0
+        return DRAW, 0, 0 # Empate, ambas mueren (opcionalmente)
+
+    # --- CASO 2: TÚ ATACAS vs IA DEFENSA ---
+    if mode_user == ATTACK:
+        if atkU > defM:
+            # Daño de penetración: la diferencia baja la vida de la IA
+            return MACHINE_LOSES, 0, atkU - defM
+        # Si la defensa de la IA es mayor que tu ataque, TÚ recibes daño (rebote)
+        return DRAW, (defM - atkU if defM > atkU else 0), 0
+
+    # --- CASO 3: TÚ DEFIENDES vs IA ATACA ---
+    if mode_machine == ATTACK:
+        if atkM > defU:
+            # La IA también te hace daño de penetración si rompe tu defensa
+            return USER_LOSES, atkM - defU, 0
+        # Si tu defensa es mayor, la IA recibe daño (rebote)
+        return DRAW, 0, (defU - atkM if defU > atkM else 0)
+
+    # --- CASO 4: AMBOS DEFIENDEN (Nada pasa usualmente) ---
+    return DRAW, 0, 0
@@ -0,0 +1,181 @@
+# model/http_client.py
+import random
+import threading
+import time
+
+import requests
+
+from model.instrumentation import Tracer, span
+
+# Estados que vale la pena reintentar (límite de peticiones y errores temporales del servidor)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    """
+    Limitador de peticiones: 'rate' fichas por segundo, hasta 'capacity' acumuladas (ráfaga).
+    acquire() bloquea el hilo hasta que haya ficha y retorna cuánto esperó (s).
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self):
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+
+class HttpClient:
+    """
+    Cliente HTTP compartido por CardAPI y la caché de imágenes:
+    - Sesión con keep-alive y pool de conexiones (pool_maxsize conexiones por host).
+    - Timeout en cada petición (conexión, lectura).
+    - Reintentos con espera exponencial y jitter ante errores de red, 429 y 5xx
+      (respeta Retry-After); los demás 4xx no se reintentan.
+    - Limitador de fichas compartido entre hilos (ygoprodeck permite unas 20 peticiones/s).
+    - Peticiones condicionales: get(url, validators=...) envía If-None-Match / If-Modified-Since
+      y un 304 se retorna tal cual (el que llama ya tiene los datos).
+    - Métricas: contadores en 'stats' y latencias por petición en 'metrics' (un Tracer propio).
+    """
+
+    def __init__(self, timeout=(5, 10), retries=3, backoff=0.25, max_backoff=4.0,
+                 rate=20, burst=None, pool_maxsize=16, session=None, seed=None, sleep=time.sleep):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.limiter = TokenBucket(rate, burst, sleep=sleep) if rate else None
+        self._sleep = sleep
+        self._rng = random.Random(seed)
+
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "ok": 0, "not_modified": 0, "retries": 0, "failures": 0,
+                      "throttled_s": 0.0}
+        self.metrics = Tracer(enabled=True, max_events=0)
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    @staticmethod
+    def validators(response):
+        """Validadores de una respuesta para repetir la petición como condicional."""
+        result = {}
+        if response.headers.get("ETag"):
+            result["etag"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            result["last_modified"] = response.headers["Last-Modified"]
+        return result
+
+    def _retry_delay(self, attempt, response=None):
+        if response is not None and response.headers.get("Retry-After"):
+            try:
+                return min(self.max_backoff, float(response.headers["Retry-After"]))
+            except ValueError:
+                pass
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        return delay * (0.5 + self._rng.random() / 2)
+
+    def get(self, url, params=None, timeout=None, validators=None):
+        """
+        GET con reintentos. Retorna la respuesta (2xx o 304).
+        timeout: (conexión, lectura) o un solo número para ambos; None usa el del cliente.
+        Lanza requests.RequestException si falla después de los reintentos.
+        """
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        with span("http.get"):
+            for attempt in range(self.retries + 1):
+                if self.limiter is not None:
+                    waited = self.limiter.acquire()
+                    if waited:
+                        self._count("throttled_s", waited)
+
+                self._count("requests")
+                start = time.perf_counter_ns()
+                response = None
+                try:
+                    response = self.session.get(url, params=params, headers=headers,
+                                                timeout=self.timeout if timeout is None else timeout)
+                    error = None
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error = e
+                self.metrics.record("http.latency", start, time.perf_counter_ns() - start)
+
+                if error is None and response.status_code not in RETRY_STATUSES:
+                    if response.status_code == 304:
+                        self._count("not_modified")
+                        return response
+                    try:
+                        response.raise_for_status()
+                    except requests.HTTPError:
+                        self._count("failures")
+                        raise
+                    self._count("ok")
+                    return response
+
+                if attempt == self.retries:
+                    self._count("failures")
+                    if error is not None:
+                        raise error
+                    response.raise_for_status()
+
+                self._count("retries")
+                self._sleep(self._retry_delay(attempt, response))
+
+    def get_json(self, url, params=None, timeout=None):
+        return self.get(url, params=params, timeout=timeout).json()
+
+    def metrics_summary(self):
+        """Contadores más percentiles de latencia (ms)."""
+        with self._lock:
+            result = dict(self.stats)
+        result.update(self.metrics.summary().get("http.latency", {}))
+        return result
+
+    def close(self):
+        self.session.close()
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client():
+    """Cliente compartido por todo el juego (conexiones y limitador comunes)."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
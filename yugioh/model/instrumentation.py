@@ -0,0 +1,186 @@
+# model/instrumentation.py
+import functools
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+
+# Histogramas en escala logarítmica: 4 cubetas por cada potencia de 2 (error de ~19% en percentiles)
+BUCKETS_PER_OCTAVE = 4
+
+
+class _Histogram:
+    __slots__ = ("count", "total_ns", "min_ns", "max_ns", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.buckets = {}
+
+    def add(self, dur_ns):
+        self.count += 1
+        self.total_ns += dur_ns
+        if self.min_ns is None or dur_ns < self.min_ns:
+            self.min_ns = dur_ns
+        if dur_ns > self.max_ns:
+            self.max_ns = dur_ns
+        b = int(math.log2(dur_ns) * BUCKETS_PER_OCTAVE) if dur_ns > 0 else 0
+        self.buckets[b] = self.buckets.get(b, 0) + 1
+
+    def percentile(self, p):
+        """Límite superior de la cubeta donde cae el percentil p (acotado por el máximo real)."""
+        target = p * self.count
+        seen = 0
+        for b in sorted(self.buckets):
+            seen += self.buckets[b]
+            if seen >= target:
+                return min(2 ** ((b + 1) / BUCKETS_PER_OCTAVE), self.max_ns)
+        return self.max_ns
+
+
+class _NullSpan:
+    """Span que no hace nada (cuando la instrumentación está apagada)."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "start")
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.start, time.perf_counter_ns() - self.start)
+        return False
+
+
+class Tracer:
+    """
+    Mide cuánto tarda cada parte de un turno (IA, red, imágenes, vista).
+    Apagado por defecto: span() retorna un objeto que no hace nada y traced() solo revisa una bandera.
+    Encendido, cada span suma su duración al histograma de su nombre y guarda el evento
+    (los últimos max_events) para exportarlo como trace de Chrome (chrome://tracing, Perfetto).
+    """
+
+    def __init__(self, enabled=False, max_events=200000):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._events = deque(maxlen=max_events)
+        self._origin_ns = time.perf_counter_ns()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+            self._events.clear()
+            self._origin_ns = time.perf_counter_ns()
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, start_ns, dur_ns):
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = _Histogram()
+            hist.add(dur_ns)
+            self._events.append((name, start_ns, dur_ns, threading.get_ident()))
+
+    # --- Resumen y exportación ---
+
+    def summary(self):
+        """{nombre: {count, total_ms, mean_ms, min_ms, max_ms, p50_ms, p95_ms, p99_ms}}"""
+        with self._lock:
+            items = list(self._histograms.items())
+        result = {}
+        for name, h in items:
+            result[name] = {
+                "count": h.count,
+                "total_ms": h.total_ns / 1e6,
+                "mean_ms": h.total_ns / h.count / 1e6,
+                "min_ms": h.min_ns / 1e6,
+                "max_ms": h.max_ns / 1e6,
+                "p50_ms": h.percentile(0.50) / 1e6,
+                "p95_ms": h.percentile(0.95) / 1e6,
+                "p99_ms": h.percentile(0.99) / 1e6,
+            }
+        return result
+
+    def summary_text(self, limit=12):
+        """Tabla corta (los spans con más tiempo total primero)."""
+        rows = sorted(self.summary().items(), key=lambda kv: kv[1]["total_ms"], reverse=True)[:limit]
+        if not rows:
+            return "Sin mediciones (activa YUGIOH_TRACE=1)."
+        lines = [f"{'span':<28}{'n':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"]
+        for name, s in rows:
+            lines.append(f"{name[:28]:<28}{s['count']:>6}{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}{s['p99_ms']:>9.1f}")
+        return "\n".join(lines)
+
+    def export_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def export_chrome_trace(self, path):
+        """Formato "Trace Event" (eventos completos 'X', tiempos en microsegundos)."""
+        with self._lock:
+            events = list(self._events)
+            origin = self._origin_ns
+        pid = os.getpid()
+        trace = [{"name": name, "ph": "X", "ts": (start - origin) / 1000, "dur": dur / 1000, "pid": pid, "tid": tid}
+                 for name, start, dur, tid in events]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+
+
+# Instrumentación compartida por todo el juego (se enciende con la variable de entorno YUGIOH_TRACE=1)
+TRACER = Tracer(enabled=os.environ.get("YUGIOH_TRACE") == "1")
+
+
+def span(name):
+    """with span("ia.get_best_move"): ..."""
+    if not TRACER.enabled:
+        return _NULL_SPAN
+    return _Span(TRACER, name)
+
+
+def traced(name=None):
+    """Decorador: mide cada llamada a la función con el nombre dado (por defecto, su __qualname__)."""
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                TRACER.record(label, start, time.perf_counter_ns() - start)
+        return wrapper
+    return decorate
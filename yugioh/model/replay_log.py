@@ -0,0 +1,193 @@
+# model/replay_log.py
+import json
+import os
+import time
+
+from model.card_model import Card
+from model.deck_builder import Deck
+from model.game_model import MODE_CODES, MODE_NAMES, normalize_mode
+
+# Carpeta donde el juego guarda las repeticiones (no se versiona)
+DEFAULT_REPLAY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "replays")
+
+REPLAY_VERSION = 1
+
+# Eventos (una lista JSON por línea, el primer elemento es el tipo):
+#   ["S", versión, semilla]                                   inicio del registro
+#   ["D", mano_usuario, mano_maquina, cola_usuario, cola_maquina]   cartas repartidas
+#        (cada carta es [nombre, atk, def, img_url] o null)
+#   ["Q", capacidad, cola_usuario, cola_maquina]               colas reconfiguradas a mitad de partida
+#   ["C", lado, i, j, img_url]                                fusión (lado 0 = usuario, 1 = IA)
+#   ["A", u_slot, u_modo, jugada]                             decisión de la IA
+#        (jugada = ["fight", slot, modo] | ["combine", i, j] | null)
+#   ["F", u_slot, u_modo, m_slot, m_modo, resultado, daño_u, daño_m]   pelea
+#   ["E", ganador, vida_u, vida_m, puntaje_u, puntaje_m]     fin de la partida
+# Los modos se guardan como códigos (ATTACK/DEFENSE).
+
+
+class ReplayMismatch(ValueError):
+    """La repetición no reprodujo el mismo resultado que el registro."""
+
+
+class ReplayLog:
+    """
+    Registro de solo-agregar de una partida: qué cartas se repartieron, qué jugó cada lado y
+    qué resultado dio cada pelea. Con path, cada evento se escribe al archivo en el momento
+    (JSON Lines), así el registro sobrevive aunque el juego se cierre a mitad de partida.
+    """
+
+    def __init__(self, path=None, seed=None):
+        self.path = path
+        self.events = []
+        self._file = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._file = open(path, "a", encoding="utf-8")
+        self.append(["S", REPLAY_VERSION, seed])
+
+    @staticmethod
+    def new_path(replay_dir=DEFAULT_REPLAY_DIR):
+        """Nombre de archivo nuevo para una partida (fecha y hora)."""
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return os.path.join(replay_dir, f"{stamp}-{int(time.time() * 1000) % 1000:03d}.jsonl")
+
+    def append(self, event):
+        self.events.append(event)
+        if self._file:
+            self._file.write(json.dumps(event, separators=(",", ":")) + "\n")
+            self._file.flush()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    @property
+    def seed(self):
+        return self.events[0][2] if self.events else None
+
+    # --- Registro ---
+
+    @staticmethod
+    def _row(card):
+        return [card.name, card.atk, card.defe, card.img_url] if card else None
+
+    def record_deck(self, deck):
+        self.append(["D"] + [[self._row(c) for c in part]
+                             for part in (deck.user_hand, deck.machine_hand, deck.user_queue, deck.machine_queue)])
+
+    def record_queues(self, capacity, deck):
+        self.append(["Q", capacity, [self._row(c) for c in deck.user_queue], [self._row(c) for c in deck.machine_queue]])
+
+    def record_combine(self, is_user, idx1, idx2, img_url):
+        self.append(["C", 0 if is_user else 1, idx1, idx2, img_url])
+
+    def record_decision(self, u_slot, u_mode, move):
+        self.append(["A", u_slot, MODE_CODES[normalize_mode(u_mode)], compact_move(move)])
+
+    def record_fight(self, u_slot, u_mode, m_slot, m_mode, result, dmg_u, dmg_m):
+        self.append(["F", u_slot, MODE_CODES[normalize_mode(u_mode)], m_slot,
+                     MODE_CODES[normalize_mode(m_mode)], result, dmg_u, dmg_m])
+
+    def record_end(self, winner, model):
+        self.append(["E", winner, model.user_life, model.machine_life, model.user_score, model.machine_score])
+
+    # --- Lectura ---
+
+    @staticmethod
+    def load(path):
+        log = ReplayLog.__new__(ReplayLog)
+        log.path, log._file = path, None
+        with open(path, encoding="utf-8") as f:
+            log.events = [json.loads(line) for line in f if line.strip()]
+        return log
+
+
+def compact_move(move):
+    """Diccionario de jugada de la IA -> ["fight", slot, modo] / ["combine", i, j] / None."""
+    if move is None:
+        return None
+    if move.get("type") == "combine":
+        return ["combine", move["slots"][0], move["slots"][1]]
+    return ["fight", move.get("index", 0), MODE_CODES[normalize_mode(move.get("mode", "attack"))]]
+
+
+def deck_from_event(event):
+    """Reconstruye el Deck de un evento "D"."""
+    parts = [[Card(*row) if row else None for row in part] for part in event[1:5]]
+    return Deck(parts[0], parts[1], parts[2], parts[3], timings={})
+
+
+class ReplayResult:
+    def __init__(self, engine):
+        self.engine = engine
+        self.winner = None
+        self.fights = 0
+        self.decisions = 0
+        # Decisiones en las que la IA de prueba eligió otra jugada: (n_decisión, registrada, nueva)
+        self.divergences = []
+        self.ai_time_ms = 0.0
+        self.time_ms = 0.0
+
+
+def replay(log, engine, machine_policy=None):
+    """
+    Vuelve a ejecutar la partida del registro sobre un GameEngine sin interfaz y verifica que
+    cada pelea y el final den exactamente lo mismo (si no, lanza ReplayMismatch).
+
+    Con machine_policy, en cada decisión registrada se le pregunta también a esa IA y se
+    anotan las jugadas distintas y el tiempo que tardó (sirve para comparar versiones de la IA).
+    La partida sigue siempre las jugadas registradas.
+    """
+    if isinstance(log, str):
+        log = ReplayLog.load(log)
+
+    start = time.perf_counter()
+    saved, engine.replay = engine.replay, None
+    result = ReplayResult(engine)
+    model = engine.model
+
+    try:
+        for n, event in enumerate(log.events):
+            kind = event[0]
+            if kind == "D":
+                engine.new_game(deck_from_event(event))
+            elif kind == "Q":
+                _, capacity, user_rows, machine_rows = event
+                model.config_queues(capacity)
+                for row in user_rows:
+                    model.user_queue.push(Card(*row) if row else None)
+                for row in machine_rows:
+                    model.machine_queue.push(Card(*row) if row else None)
+            elif kind == "C":
+                _, side, i, j, img_url = event
+                engine.combine(side == 0, i, j, img_url=img_url)
+            elif kind == "A":
+                result.decisions += 1
+                if machine_policy is not None:
+                    _, u_slot, u_mode, recorded = event
+                    t = time.perf_counter()
+                    move = machine_policy.get_best_move(model, model.user_cards[u_slot], MODE_NAMES[u_mode])
+                    result.ai_time_ms += (time.perf_counter() - t) * 1000
+                    move = compact_move(move)
+                    if move != recorded:
+                        result.divergences.append((result.decisions, recorded, move))
+            elif kind == "F":
+                _, u_slot, u_mode, m_slot, m_mode, expected, dmg_u, dmg_m = event
+                got = engine.resolve_fight(u_slot, MODE_NAMES[u_mode], m_slot, MODE_NAMES[m_mode])
+                result.fights += 1
+                if list(got) != [expected, dmg_u, dmg_m]:
+                    raise ReplayMismatch(f"evento {n}: pelea registrada {event[5:]} pero dio {list(got)}")
+            elif kind == "E":
+                _, winner, u_life, m_life, u_score, m_score = event
+                # Quien se quedó sin cartas perdió con vida 0 (como en GameEngine.winner)
+                engine.check_deck_exhaustion()
+                now = [model.user_life, model.machine_life, model.user_score, model.machine_score]
+                if now != [u_life, m_life, u_score, m_score]:
+                    raise ReplayMismatch(f"evento {n}: final registrado {event[2:]} pero quedó {now}")
+                result.winner = winner
+    finally:
+        engine.replay = saved
+
+    result.time_ms = (time.perf_counter() - start) * 1000
+    return result
@@ -0,0 +1,62 @@
+# replay.py
+"""
+Repite partidas registradas (model/data/replays/*.jsonl) sin interfaz y verifica que den
+exactamente el mismo resultado.
+
+Con --ai, en cada decisión registrada se le pregunta también a esa IA: muestra cuántas
+jugadas cambiaron y cuánto tardó (para detectar regresiones de la IA).
+
+Ejemplos:
+    python replay.py model/data/replays/20240611-101500-123.jsonl
+    python replay.py model/data/replays/*.jsonl --ai minimax:3 --repeat 5
+"""
+import argparse
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(current_dir)
+
+from model.game_engine import GameEngine
+from model.replay_log import ReplayLog, ReplayMismatch, replay
+from tournament import make_machine_policy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Repite partidas registradas sin interfaz.")
+    parser.add_argument("files", nargs="+", help="registros .jsonl")
+    parser.add_argument("--ai", help="política de la máquina para comparar decisiones (ver tournament.py)")
+    parser.add_argument("--repeat", type=int, default=1, help="repeticiones de cada partida (para medir tiempos)")
+    args = parser.parse_args(argv)
+
+    engine = GameEngine()
+    failed = 0
+    for path in args.files:
+        log = ReplayLog.load(path)
+        seed = log.seed if log.seed is not None else 0
+        best_ms, best_ai_ms, result = None, None, None
+        try:
+            for _ in range(args.repeat):
+                policy = make_machine_policy(args.ai, seed) if args.ai else None
+                result = replay(log, engine, policy)
+                best_ms = result.time_ms if best_ms is None else min(best_ms, result.time_ms)
+                best_ai_ms = result.ai_time_ms if best_ai_ms is None else min(best_ai_ms, result.ai_time_ms)
+        except ReplayMismatch as e:
+            failed += 1
+            print(f"{path}: NO COINCIDE -> {e}")
+            continue
+
+        line = (f"{path}: OK | ganador {result.winner} | {result.fights} peleas | "
+                f"{len(log.events)} eventos | {best_ms:.2f} ms")
+        if args.ai:
+            line += (f" | IA {args.ai}: {len(result.divergences)}/{result.decisions} jugadas distintas, "
+                     f"{best_ai_ms:.1f} ms")
+        print(line)
+        for n, recorded, move in result.divergences[:5]:
+            print(f"    decisión {n}: registrada {recorded} -> ahora {move}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
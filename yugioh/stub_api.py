@@ -0,0 +1,222 @@
+# stub_api.py
+"""
+Servidor local que imita la API de ygoprodeck (para benchmarks y pruebas sin internet).
+
+Rutas:
+    /api/v7/cardinfo.php     todas las cartas del fixture ({"data": [...]}); con ?name= solo esa (400 si no existe)
+    /api/v7/randomcard.php   una carta al azar del fixture ({"data": [carta]})
+    /images/cards/<id>.jpg   una imagen JPEG generada (mismo tamaño que las reales)
+
+Las URLs de imagen de las cartas apuntan al propio servidor.
+cardinfo.php responde con ETag y Last-Modified y contesta 304 a las peticiones condicionales.
+fail_next(n, status) hace fallar las próximas n peticiones (para probar reintentos).
+
+Uso:
+    python stub_api.py --port 8765
+o desde código:
+    with StubAPI() as api:
+        CardAPI.RANDOM_URL = api.random_url
+"""
+import argparse
+import hashlib
+import json
+from urllib.parse import parse_qs
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(current_dir)
+
+from PIL import Image, ImageDraw
+
+from model.card_catalog import FIXTURE_PATH
+
+# Tamaño de las imágenes completas de ygoprodeck
+IMAGE_SIZE = (421, 614)
+
+
+def make_card_image(card_id, size=IMAGE_SIZE, quality=90):
+    """JPEG de prueba con algo de detalle (un color plano comprime y decodifica demasiado rápido)."""
+    rng = random.Random(card_id)
+    img = Image.new("RGB", size, tuple(rng.randrange(256) for _ in range(3)))
+    draw = ImageDraw.Draw(img)
+    for _ in range(60):
+        x0, y0 = rng.randrange(size[0]), rng.randrange(size[1])
+        x1, y1 = x0 + rng.randrange(10, 150), y0 + rng.randrange(10, 150)
+        draw.rectangle((x0, y0, x1, y1), fill=tuple(rng.randrange(256) for _ in range(3)))
+    out = BytesIO()
+    img.save(out, "JPEG", quality=quality)
+    return out.getvalue()
+
+
+class StubAPI:
+    """Servidor HTTP en un hilo. latency_ms agrega una espera por petición (simula la red)."""
+
+    def __init__(self, fixture_path=FIXTURE_PATH, host="127.0.0.1", port=0, latency_ms=0, seed=None):
+        with open(fixture_path, encoding="utf-8") as f:
+            cards = json.load(f)["data"]
+        self.latency_ms = latency_ms
+        self.rng = random.Random(seed)
+        self.stats = {"requests": 0, "cardinfo": 0, "random": 0, "images": 0, "not_found": 0,
+                      "not_modified": 0, "injected_failures": 0}
+        self._lock = threading.Lock()
+        self._images = {}
+        self._failures = []  # estados a devolver en las próximas peticiones
+
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address[:2]
+        self.base_url = f"http://{self.host}:{self.port}"
+
+        # Las cartas del fixture, con las imágenes apuntando a este servidor
+        self.cards = []
+        for card in cards:
+            card = dict(card)
+            card["card_images"] = [{"id": card["id"], "image_url": f"{self.base_url}/images/cards/{card['id']}.jpg"}]
+            self.cards.append(card)
+        self._cardinfo_body = json.dumps({"data": self.cards}).encode("utf-8")
+        self.etag = '"' + hashlib.sha256(self._cardinfo_body).hexdigest()[:16] + '"'
+        self.last_modified = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime())
+        self._thread = None
+
+    @property
+    def cardinfo_url(self):
+        return f"{self.base_url}/api/v7/cardinfo.php"
+
+    @property
+    def random_url(self):
+        return f"{self.base_url}/api/v7/randomcard.php"
+
+    def image_url(self, card_id):
+        return f"{self.base_url}/images/cards/{card_id}.jpg"
+
+    def image_bytes(self, card_id):
+        with self._lock:
+            data = self._images.get(card_id)
+        if data is None:
+            data = make_card_image(card_id)
+            with self._lock:
+                self._images[card_id] = data
+        return data
+
+    def fail_next(self, count=1, status=503):
+        """Las próximas 'count' peticiones responden con 'status'."""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def _take_failure(self):
+        with self._lock:
+            if not self._failures:
+                return None
+            return self._failures.pop(0)
+
+    def _count(self, key):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats[key] += 1
+
+    def _handler_class(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Cabeceras y cuerpo en un solo envío (si no, Nagle + ACK diferido suman ~40 ms por petición)
+            disable_nagle_algorithm = True
+
+            def _send(self, status, body, content_type, headers=None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if api.latency_ms:
+                    time.sleep(api.latency_ms / 1000.0)
+                path, _, query = self.path.partition("?")
+                name = parse_qs(query).get("name", [None])[0]
+
+                failure = api._take_failure()
+                if failure is not None:
+                    api._count("injected_failures")
+                    self._send(failure, b"injected failure", "text/plain", {"Retry-After": "0"})
+                elif path == "/api/v7/cardinfo.php" and name is not None:
+                    api._count("cardinfo")
+                    matches = [card for card in api.cards if card["name"].lower() == name.lower()]
+                    if matches:
+                        self._send(200, json.dumps({"data": matches}).encode("utf-8"), "application/json")
+                    else:
+                        body = {"error": "No card matching your query was found in the database."}
+                        self._send(400, json.dumps(body).encode("utf-8"), "application/json")
+                elif path == "/api/v7/cardinfo.php":
+                    validators = {"ETag": api.etag, "Last-Modified": api.last_modified}
+                    if (self.headers.get("If-None-Match") == api.etag
+                            or self.headers.get("If-Modified-Since") == api.last_modified):
+                        api._count("not_modified")
+                        self._send(304, b"", "application/json", validators)
+                    else:
+                        api._count("cardinfo")
+                        self._send(200, api._cardinfo_body, "application/json", validators)
+                elif path == "/api/v7/randomcard.php":
+                    api._count("random")
+                    with api._lock:
+                        card = api.rng.choice(api.cards)
+                    self._send(200, json.dumps({"data": [card]}).encode("utf-8"), "application/json")
+                elif path.startswith("/images/cards/") and path.endswith(".jpg"):
+                    api._count("images")
+                    try:
+                        card_id = int(path.rsplit("/", 1)[1][:-4])
+                    except ValueError:
+                        card_id = 0
+                    self._send(200, api.image_bytes(card_id), "image/jpeg")
+                else:
+                    api._count("not_found")
+                    self._send(404, b"not found", "text/plain")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API local que imita ygoprodeck.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0, help="espera agregada a cada petición")
+    parser.add_argument("--fixture", default=FIXTURE_PATH)
+    args = parser.parse_args(argv)
+
+    api = StubAPI(args.fixture, port=args.port, latency_ms=args.latency_ms)
+    print(f"API local en {api.base_url} (Ctrl+C para salir)")
+    try:
+        api._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        api._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
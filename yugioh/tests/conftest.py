@@ -0,0 +1,6 @@
+# tests/conftest.py
+import os
+import sys
+
+# Los módulos se importan como en el juego: desde la carpeta yugioh (model., controller., view.)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,75 @@
+# tests/test_ai_minimax.py
+import random
+
+import pytest
+
+from controller.ai_minimax import MinimaxAI
+from model.card_catalog import CardCatalog
+from model.card_sampler import MonsterSampler
+from model.deck_builder import DeckBuilder
+from model.game_engine import GameEngine, RandomMachinePolicy, RandomUserPolicy
+
+
+@pytest.fixture(scope="module")
+def positions():
+    """Posiciones variadas: partidas al azar cortadas en distintos turnos. [(modelo, u_slot, u_mode)]"""
+    sampler = MonsterSampler(CardCatalog(db_path=":memory:"))
+    builder = DeckBuilder(sampler=sampler, fetch_row=lambda: None)
+    result = []
+    for seed in range(12):
+        rng = random.Random(seed)
+        sampler.seed(seed)
+        engine = GameEngine()
+        engine.new_game(builder.build(GameEngine.HAND_SIZE, 6, 6))
+        user, machine = RandomUserPolicy(seed), RandomMachinePolicy(seed)
+        for _ in range(rng.randrange(0, 6)):
+            engine.play_turn(user, machine)
+            if engine.winner():
+                break
+        if engine.winner():
+            continue
+        slots = [i for i, c in enumerate(engine.model.user_cards) if c]
+        result.append((engine.model, rng.choice(slots), rng.choice(("attack", "defense"))))
+    return result
+
+
+def decide(ai, model, u_slot, u_mode):
+    move = ai.get_best_move(model, model.user_cards[u_slot], u_mode)
+    return move, ai.last_stats["score"]
+
+
+@pytest.mark.parametrize("depth", [2, 3])
+def test_transposition_table_does_not_change_the_result(positions, depth):
+    # Sin límite de nodos: la tabla solo puede ahorrar trabajo, no cambiar el valor de la raíz
+    with_tt = MinimaxAI(max_depth=depth, node_budget=None, seed=0)
+    without_tt = MinimaxAI(max_depth=depth, node_budget=None, tt_size=0, seed=0)
+
+    for model, u_slot, u_mode in positions:
+        move, score = decide(with_tt, model, u_slot, u_mode)
+        plain_move, plain_score = decide(without_tt, model, u_slot, u_mode)
+        assert score == plain_score
+        assert move == plain_move
+
+    assert with_tt.tt.stats["hits"] > 0
+
+
+def test_search_is_repeatable(positions):
+    model, u_slot, u_mode = positions[0]
+    ai = MinimaxAI(max_depth=3, node_budget=None, seed=1)
+    first = decide(ai, model, u_slot, u_mode)
+    # La segunda vez la tabla ya tiene la posición: mismo resultado con menos nodos
+    nodes = ai.last_stats["nodes"]
+    assert decide(ai, model, u_slot, u_mode) == first
+    assert ai.last_stats["nodes"] <= nodes
+
+
+def test_search_leaves_model_untouched(positions):
+    model, u_slot, u_mode = positions[1]
+    before = ([c and (c.atk, c.defe) for c in model.user_cards + model.machine_cards],
+              model.user_life, model.machine_life, len(model.user_queue), len(model.machine_queue))
+
+    MinimaxAI(max_depth=3, seed=0).get_best_move(model, model.user_cards[u_slot], u_mode)
+
+    after = ([c and (c.atk, c.defe) for c in model.user_cards + model.machine_cards],
+             model.user_life, model.machine_life, len(model.user_queue), len(model.machine_queue))
+    assert after == before
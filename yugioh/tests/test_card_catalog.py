@@ -0,0 +1,73 @@
+# tests/test_card_catalog.py
+import json
+
+from model.card_catalog import FIXTURE_PATH, CardCatalog
+
+
+def fixture_cards():
+    with open(FIXTURE_PATH, encoding="utf-8") as f:
+        return json.load(f)["data"]
+
+
+def test_loads_fixture_when_empty():
+    catalog = CardCatalog(db_path=":memory:")
+    cards = fixture_cards()
+
+    assert catalog.count() == len(cards)
+    assert len(catalog.monster_rows()) == sum("Monster" in c["type"] for c in cards)
+    catalog.close()
+
+
+def test_lookups_are_local():
+    catalog = CardCatalog(db_path=":memory:")
+    card = next(c for c in fixture_cards() if "Monster" in c["type"])
+    row = (card["name"], card["atk"], card["def"], card["card_images"][0]["image_url"])
+
+    assert catalog.get_by_id(card["id"]) == row
+    assert catalog.get_by_name(card["name"].upper()) == row
+    assert catalog.get_by_name("no existe") is None
+    assert card["name"] in catalog.list_monster_names(limit=100)
+    catalog.close()
+
+
+def test_spells_are_not_monsters():
+    catalog = CardCatalog(db_path=":memory:")
+    spell = next(c for c in fixture_cards() if "Monster" not in c["type"])
+
+    assert catalog.get_by_name(spell["name"]) is not None
+    assert spell["name"] not in [row[0] for row in catalog.monster_rows()]
+    catalog.close()
+
+
+def test_import_skips_incomplete_cards_and_bumps_version():
+    catalog = CardCatalog(db_path=":memory:", fixture_path=None)
+    version = catalog.version
+    cards = [
+        {"id": 1, "name": "Uno", "type": "Effect Monster", "atk": 100, "def": None,
+         "card_images": [{"image_url": "u1"}]},
+        {"id": 2, "name": "Sin imagen", "type": "Normal Monster", "atk": 1, "def": 1},
+        {"name": "Sin id", "type": "Normal Monster", "card_images": [{"image_url": "u3"}]},
+    ]
+
+    assert catalog.import_cards(cards) == 1
+    assert catalog.version == version + 1
+    assert catalog.monster_rows() == [("Uno", 100, 0, "u1")]
+
+    assert catalog.import_cards([], replace=True) == 0
+    assert catalog.count() == 0
+    catalog.close()
+
+
+def test_database_persists_between_runs(tmp_path):
+    path = str(tmp_path / "cards.db")
+    catalog = CardCatalog(db_path=path)
+    count = catalog.count()
+    catalog.set_meta("bulk_validators", "{}")
+    catalog.close()
+
+    # Sin fixture: todo sale de la base ya creada
+    catalog = CardCatalog(db_path=path, fixture_path=None)
+    assert catalog.count() == count
+    assert catalog.get_meta("bulk_validators") == "{}"
+    assert catalog.get_meta("otra", "x") == "x"
+    catalog.close()
@@ -0,0 +1,70 @@
+# tests/test_card_queue.py
+from model.card_model import Card
+from model.card_queue import CardQueue
+from model.game_model import GameModel
+
+
+def cards(n):
+    return [Card(f"c{k}", 100 * k, 100 * k, None) for k in range(n)]
+
+
+def test_fifo_order():
+    deck = cards(4)
+    queue = CardQueue(4, deck)
+
+    assert [queue.draw() for _ in range(4)] == deck
+    assert queue.draw() is None
+    assert not queue
+
+
+def test_capacity_and_none_are_rejected():
+    deck = cards(3)
+    queue = CardQueue(2)
+
+    assert queue.push(deck[0])
+    assert not queue.push(None)
+    assert queue.push(deck[1])
+    assert queue.is_full()
+    assert not queue.push(deck[2])
+    assert len(queue) == 2 and queue.free == 0
+
+    queue.draw()
+    assert queue.free == 1
+    assert queue.push(deck[2])
+    assert list(queue) == [deck[1], deck[2]]
+
+
+def test_peek_does_not_draw():
+    deck = cards(5)
+    queue = CardQueue(5, deck)
+
+    assert queue.peek(3) == deck[:3]
+    assert queue.peek(10) == deck
+    assert len(queue) == 5
+    assert queue[0] is deck[0]
+
+
+def test_set_replaces_or_appends():
+    deck = cards(4)
+    queue = CardQueue(3, deck[:2])
+
+    queue.set(0, deck[3])
+    queue.set(2, deck[2])   # siguiente libre: se agrega al final
+    queue.set(5, deck[0])   # fuera de rango: se ignora
+    assert list(queue) == [deck[3], deck[1], deck[2]]
+
+    queue.clear()
+    assert len(queue) == 0 and queue.free == 3
+
+
+def test_game_model_dequeues_in_order():
+    model = GameModel()
+    model.config_queues(3)
+    deck = cards(3)
+    for k, card in enumerate(deck):
+        model.set_user_queue(k, card)
+        model.set_machine_queue(k, card)
+
+    assert [model.dequeue_user() for _ in range(4)] == deck + [None]
+    assert model.dequeue_machine() is deck[0]
+    assert len(model.machine_queue) == 2
@@ -0,0 +1,84 @@
+# tests/test_card_sampler.py
+import pytest
+
+from model.card_catalog import CardCatalog
+from model.card_sampler import MonsterSampler
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    catalog = CardCatalog(db_path=":memory:")
+    yield catalog
+    catalog.close()
+
+
+def test_same_seed_same_cards(catalog):
+    a = MonsterSampler(catalog, seed=5)
+    b = MonsterSampler(catalog, seed=5)
+    assert [a.draw() for _ in range(20)] == [b.draw() for _ in range(20)]
+    assert a.sample(10) == b.sample(10)
+
+    b.seed(5)
+    a.seed(5)
+    assert a.sample(30) == b.sample(30)
+
+
+def test_only_monsters(catalog):
+    sampler = MonsterSampler(catalog, seed=1)
+    monsters = set(catalog.monster_rows())
+    assert len(sampler) == len(monsters)
+    assert all(sampler.draw() in monsters for _ in range(200))
+
+
+def test_sample_without_replacement(catalog):
+    sampler = MonsterSampler(catalog, seed=2)
+    total = len(sampler)
+
+    hand = sampler.sample(total - 1)
+    assert len(set(hand)) == total - 1
+
+    # Más cartas que el catálogo: cada ronda completa es una permutación sin repetir
+    rows = sampler.sample(2 * total + 3)
+    assert len(rows) == 2 * total + 3
+    assert set(rows[:total]) == set(rows[total:2 * total]) == set(catalog.monster_rows())
+    assert len(set(rows[2 * total:])) == 3
+
+    assert sampler.sample(0) == []
+
+
+def test_fallback_is_bounded():
+    empty = CardCatalog(db_path=":memory:", fixture_path=None)
+    calls = []
+
+    def fallback():
+        calls.append(1)
+        return None
+
+    sampler = MonsterSampler(empty, fallback=fallback, max_fallback_attempts=4)
+    assert sampler.draw() is None
+    assert len(calls) == 4
+    assert sampler.sample(3) == []
+    assert len(calls) == 8
+    empty.close()
+
+
+def test_fallback_fills_empty_catalog():
+    empty = CardCatalog(db_path=":memory:", fixture_path=None)
+    row = ("Remota", 1000, 1000, "url")
+    sampler = MonsterSampler(empty, fallback=lambda: row)
+
+    assert sampler.draw() == row
+    assert sampler.sample(3) == [row] * 3
+    empty.close()
+
+
+def test_reloads_after_catalog_import():
+    catalog = CardCatalog(db_path=":memory:", fixture_path=None)
+    sampler = MonsterSampler(catalog, seed=0)
+    assert len(sampler) == 0
+
+    catalog.import_cards([{"id": 1, "name": "Nueva", "type": "Normal Monster", "atk": 1, "def": 2,
+                           "card_images": [{"image_url": "u"}]}])
+    assert len(sampler) == 1
+    assert sampler.draw() == ("Nueva", 1, 2, "u")
+    catalog.close()
@@ -0,0 +1,130 @@
+# tests/test_compact_state.py
+import random
+
+import pytest
+
+from model.card_catalog import CardCatalog
+from model.card_sampler import MonsterSampler
+from model.compact_state import EMPTY, CompactState
+from model.deck_builder import DeckBuilder
+from model.game_engine import GameEngine
+from model.game_model import ATTACK, DEFENSE, MODE_NAMES, GameModel
+
+
+@pytest.fixture(scope="module")
+def builder():
+    sampler = MonsterSampler(CardCatalog(db_path=":memory:"))
+    return sampler, DeckBuilder(sampler=sampler, fetch_row=lambda: None)
+
+
+def new_engine(builder, seed, queue_size=6):
+    sampler, deck_builder = builder
+    sampler.seed(seed)
+    engine = GameEngine()
+    engine.new_game(deck_builder.build(GameEngine.HAND_SIZE, queue_size, queue_size))
+    return engine
+
+
+def snapshot(st):
+    return (list(st.atk), list(st.defe), list(st.ids), list(st.cursor), list(st.lives),
+            list(st.scores), list(st.can_combine), st.hash)
+
+
+def slots(st, side):
+    H = st.hand_size
+    return [k for k in range(H) if st.ids[side * H + k] != EMPTY]
+
+
+def random_move(st, rng):
+    """Aplica un movimiento legal al azar; retorna su registro de deshacer (o None si no hay)."""
+    user, machine = slots(st, 0), slots(st, 1)
+    if not user or not machine:
+        return None
+    for side, hand in ((0, user), (1, machine)):
+        if st.can_combine[side] and len(hand) >= 2 and rng.random() < 0.2:
+            i, j = rng.sample(hand, 2)
+            return st.make_combine(side, i, j)
+    return st.make_fight(rng.choice(user), rng.choice((ATTACK, DEFENSE)),
+                         rng.choice(machine), rng.choice((ATTACK, DEFENSE)))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_make_unmake_round_trip(builder, seed):
+    rng = random.Random(seed)
+    st = CompactState.from_model(new_engine(builder, seed).model)
+    start = snapshot(st)
+
+    history = []
+    for _ in range(40):
+        undo = random_move(st, rng)
+        if undo is None:
+            break
+        # El hash incremental siempre coincide con el calculado desde cero
+        assert st.hash == st.full_hash()
+        history.append((undo, snapshot(st)))
+
+    for undo, after in reversed(history):
+        assert snapshot(st) == after
+        st.unmake(undo)
+    assert snapshot(st) == start
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_fights_match_game_engine(builder, seed):
+    rng = random.Random(seed)
+    engine = new_engine(builder, seed)
+    st = CompactState.from_model(engine.model)
+
+    for _ in range(30):
+        if engine.winner() or st.winner():
+            break
+        user, machine = slots(st, 0), slots(st, 1)
+        u_slot, m_slot = rng.choice(user), rng.choice(machine)
+        u_mode, m_mode = rng.choice((ATTACK, DEFENSE)), rng.choice((ATTACK, DEFENSE))
+
+        st.make_fight(u_slot, u_mode, m_slot, m_mode)
+        engine.resolve_fight(u_slot, MODE_NAMES[u_mode], m_slot, MODE_NAMES[m_mode])
+
+        model = st.to_model(GameModel())
+        m = engine.model
+        assert (model.user_life, model.machine_life, model.user_score, model.machine_score) == \
+               (m.user_life, m.machine_life, m.user_score, m.machine_score)
+        assert [c and (c.atk, c.defe) for c in model.user_cards] == [c and (c.atk, c.defe) for c in m.user_cards]
+        assert [c and (c.atk, c.defe) for c in model.machine_cards] == [c and (c.atk, c.defe) for c in m.machine_cards]
+        assert (len(model.user_queue), len(model.machine_queue)) == (len(m.user_queue), len(m.machine_queue))
+
+
+def test_combine_matches_game_engine(builder):
+    engine = new_engine(builder, 3)
+    st = CompactState.from_model(engine.model)
+
+    st.make_combine(0, 3, 1)
+    st.make_combine(1, 0, 4)
+    engine.combine(True, 3, 1)
+    engine.combine(False, 0, 4)
+
+    model = st.to_model(GameModel())
+    m = engine.model
+    assert [c and (c.atk, c.defe) for c in model.user_cards] == [c and (c.atk, c.defe) for c in m.user_cards]
+    assert [c and (c.atk, c.defe) for c in model.machine_cards] == [c and (c.atk, c.defe) for c in m.machine_cards]
+    assert (model.user_can_combine, model.machine_can_combine) == (m.user_can_combine, m.machine_can_combine)
+
+
+def test_hash_depends_on_position_not_path(builder):
+    engine = new_engine(builder, 4)
+    a = CompactState.from_model(engine.model)
+    b = CompactState.from_model(engine.model)
+    assert a.hash == b.hash
+
+    # Dos defensas sin daño (nada cambia salvo el fin de turno) en distinto orden
+    a.make_fight(0, DEFENSE, 0, DEFENSE)
+    a.make_fight(1, DEFENSE, 1, DEFENSE)
+    b.make_fight(1, DEFENSE, 1, DEFENSE)
+    b.make_fight(0, DEFENSE, 0, DEFENSE)
+    assert a.hash == b.hash == a.full_hash()
+
+    undo = a.make_fight(0, ATTACK, 0, DEFENSE)
+    if snapshot(a)[:-1] != snapshot(b)[:-1]:
+        assert a.hash != b.hash
+    a.unmake(undo)
+    assert a.hash == b.hash
@@ -0,0 +1,40 @@
+# tests/test_fight_batch.py
+import itertools
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from model.fight_batch import fight_round_batch
+from model.game_model import ATTACK, DEFENSE, fight_outcome_code
+
+
+def test_batch_matches_scalar_on_random_fights():
+    rng = random.Random(7)
+    n = 5000
+    # Valores chicos para que haya muchos empates exactos
+    cols = [[rng.randrange(0, 30) * 100 for _ in range(n)] for _ in range(4)]
+    modes_u = [rng.choice((ATTACK, DEFENSE)) for _ in range(n)]
+    modes_m = [rng.choice((ATTACK, DEFENSE)) for _ in range(n)]
+
+    result, dmg_u, dmg_m = fight_round_batch(*cols, modes_u, modes_m)
+
+    expected = [fight_outcome_code(*args) for args in zip(*cols, modes_u, modes_m)]
+    assert [tuple(row) for row in zip(result.tolist(), dmg_u.tolist(), dmg_m.tolist())] == expected
+
+
+def test_batch_matches_scalar_on_all_orderings():
+    values = (0, 1000, 2000)
+    cases = list(itertools.product(values, values, values, values, (ATTACK, DEFENSE), (ATTACK, DEFENSE)))
+    result, dmg_u, dmg_m = fight_round_batch(*(np.array(col) for col in zip(*cases)))
+
+    for k, case in enumerate(cases):
+        assert (int(result[k]), int(dmg_u[k]), int(dmg_m[k])) == fight_outcome_code(*case), case
+
+
+def test_batch_broadcasts_scalars():
+    result, dmg_u, dmg_m = fight_round_batch(1500, 1000, [1000, 2000], [500, 500], ATTACK, ATTACK)
+    assert result.tolist() == [fight_outcome_code(1500, 1000, a, 500, ATTACK, ATTACK)[0] for a in (1000, 2000)]
+    assert dmg_u.tolist() == [0, 500]
+    assert dmg_m.tolist() == [500, 0]
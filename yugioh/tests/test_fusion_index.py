@@ -0,0 +1,62 @@
+# tests/test_fusion_index.py
+import itertools
+import random
+
+from controller.fusion_index import FusionIndex
+from model.card_model import Card
+
+
+def brute_force(stats, k, min_gain=0):
+    pairs = []
+    for i, j in itertools.combinations(sorted(stats), 2):
+        gain = FusionIndex.gain(stats[i], stats[j])
+        if gain > min_gain:
+            pairs.append((gain, i, j))
+    pairs.sort(key=lambda p: (-p[0], p[1], p[2]))
+    return pairs[:k]
+
+
+def random_hand(rng, size):
+    # Pocos valores distintos: muchos empates de ATK, DEF y ganancia
+    return {slot: (rng.randrange(0, 8) * 100, rng.randrange(0, 8) * 100) for slot in range(size)}
+
+
+def test_top_k_matches_brute_force():
+    rng = random.Random(11)
+    for _ in range(3000):
+        stats = random_hand(rng, rng.randrange(0, 9))
+        index = FusionIndex()
+        for slot, s in stats.items():
+            index.set(slot, s)
+        for k in (1, 3, 100):
+            for min_gain in (-10 ** 6, 0, 500):
+                assert index.top_k(k, min_gain) == brute_force(stats, k, min_gain)
+
+
+def test_updates_keep_index_in_sync():
+    rng = random.Random(3)
+    index = FusionIndex()
+    stats = {}
+    for _ in range(2000):
+        slot = rng.randrange(6)
+        if rng.random() < 0.3:
+            stats.pop(slot, None)
+            index.set(slot, None)
+        else:
+            stats[slot] = (rng.randrange(0, 8) * 100, rng.randrange(0, 8) * 100)
+            index.set(slot, stats[slot])
+        assert index.top_k(3, -10 ** 6) == brute_force(stats, 3, -10 ** 6)
+        assert index.best(-10 ** 6) == (brute_force(stats, 1, -10 ** 6) or [None])[0]
+
+
+def test_sync_with_hand():
+    cards = [Card("a", 1000, 500, None), None, Card("b", 300, 2000, None), Card("c", 300, 100, None), None]
+    index = FusionIndex()
+    assert index.sync(cards) == 3
+    assert index.sync(cards) == 0
+    stats = {i: (c.atk, c.defe) for i, c in enumerate(cards) if c}
+    assert index.top_k(10, -10 ** 6) == brute_force(stats, 10, -10 ** 6)
+
+    assert index.sync(cards[:2]) == 2
+    assert len(index) == 1
+    assert index.best(-10 ** 6) is None
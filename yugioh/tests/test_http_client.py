@@ -0,0 +1,72 @@
+# tests/test_http_client.py
+import pytest
+import requests
+
+from model.http_client import HttpClient
+from stub_api import StubAPI
+
+
+@pytest.fixture
+def api():
+    with StubAPI(seed=0) as stub:
+        yield stub
+
+
+@pytest.fixture
+def client():
+    # Sin limitador ni esperas reales entre reintentos
+    http = HttpClient(retries=3, rate=0, seed=0, sleep=lambda s: None)
+    yield http
+    http.close()
+
+
+def test_retries_until_success(api, client):
+    api.fail_next(2, status=503)
+
+    data = client.get_json(api.random_url)
+
+    assert len(data["data"]) == 1
+    assert client.stats["retries"] == 2
+    assert client.stats["requests"] == 3
+    assert client.stats["ok"] == 1
+    assert api.stats["injected_failures"] == 2
+
+
+def test_gives_up_after_retries(api, client):
+    api.fail_next(client.retries + 1, status=429)
+
+    with pytest.raises(requests.HTTPError):
+        client.get(api.random_url)
+
+    assert client.stats["requests"] == client.retries + 1
+    assert client.stats["failures"] == 1
+
+
+def test_client_errors_are_not_retried(api, client):
+    with pytest.raises(requests.HTTPError):
+        client.get(api.cardinfo_url, params={"name": "no existe"})
+
+    assert client.stats["requests"] == 1
+    assert client.stats["retries"] == 0
+
+
+def test_conditional_request_returns_304(api, client):
+    first = client.get(api.cardinfo_url)
+    validators = HttpClient.validators(first)
+    assert validators == {"etag": api.etag, "last_modified": api.last_modified}
+
+    second = client.get(api.cardinfo_url, validators=validators)
+
+    assert second.status_code == 304
+    assert client.stats["not_modified"] == 1
+    assert api.stats["not_modified"] == 1
+    assert api.stats["cardinfo"] == 1
+
+
+def test_metrics_summary_counts_every_attempt(api, client):
+    api.fail_next(1)
+    client.get(api.random_url)
+
+    summary = client.metrics_summary()
+    assert summary["requests"] == 2
+    assert summary["count"] == 2
@@ -0,0 +1,36 @@
+# tests/test_image_cache.py
+import pytest
+
+from model.http_client import HttpClient
+from stub_api import StubAPI
+from view.image_cache import ImageCache
+
+
+@pytest.fixture
+def api():
+    with StubAPI(seed=0) as stub:
+        yield stub
+
+
+@pytest.fixture
+def cache(api, tmp_path):
+    client = HttpClient(rate=0, seed=0, sleep=lambda s: None)
+    yield ImageCache(cache_dir=str(tmp_path), client=client)
+    client.close()
+
+
+def test_load_pil_counts_misses(api, cache):
+    url = api.image_url(1)
+
+    first = cache.load_pil(url, (60, 80))
+    second = cache.load_pil(url, (60, 80))
+
+    assert first.size == second.size == (60, 80)
+    assert cache.stats["misses"] == 2
+    assert cache.stats["downloads"] == 1
+    assert cache.stats["variant_hits"] == 1
+
+
+def test_build_variants_without_sizes(api, cache):
+    assert cache.build_variants(api.image_url(1)) == {}
+    assert cache.stats["downloads"] == 0
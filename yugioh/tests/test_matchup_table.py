@@ -0,0 +1,74 @@
+# tests/test_matchup_table.py
+import random
+
+from controller.matchup_table import MatchupTable, counter_score
+from model.card_model import Card
+from model.game_model import GameModel, fight_outcome_code
+
+
+def random_card(rng):
+    if rng.random() < 0.15:
+        return None
+    return Card("c", rng.randrange(0, 6) * 500, rng.randrange(0, 6) * 500, None)
+
+
+def assert_matches_hands(table, model):
+    for m_slot, m in enumerate(model.machine_cards):
+        for u_slot, u in enumerate(model.user_cards):
+            for m_mode in (0, 1):
+                for u_mode in (0, 1):
+                    if m is None or u is None:
+                        expected, score = (0, 0, 0), 0
+                    else:
+                        expected = fight_outcome_code(u.atk, u.defe, m.atk, m.defe, u_mode, m_mode)
+                        score = counter_score(m.atk, m.defe, m_mode, u.atk, u.defe, u_mode)
+                    assert table.outcome(m_slot, m_mode, u_slot, u_mode) == expected
+                    assert table.score(m_slot, m_mode, u_slot, u_mode) == score
+
+
+def test_incremental_sync_matches_fresh_table():
+    rng = random.Random(9)
+    model = GameModel()
+    model.user_cards = [random_card(rng) for _ in range(5)]
+    model.machine_cards = [random_card(rng) for _ in range(5)]
+    table = MatchupTable()
+    table.sync(model)
+
+    for _ in range(300):
+        hand = model.user_cards if rng.random() < 0.5 else model.machine_cards
+        hand[rng.randrange(5)] = random_card(rng)
+        table.sync(model)
+        assert_matches_hands(table, model)
+
+
+def test_only_changed_slots_are_recomputed():
+    model = GameModel()
+    model.user_cards = [Card("u", 1000 + k, 500, None) for k in range(5)]
+    model.machine_cards = [Card("m", 800 + k, 900, None) for k in range(5)]
+    table = MatchupTable()
+
+    assert table.sync(model) == 10
+    assert table.sync(model) == 0
+
+    model.machine_cards[2] = Card("n", 3000, 100, None)
+    model.user_cards[4] = None
+    assert table.sync(model) == 2
+    assert table.stats["slot_updates"] == 12
+    assert_matches_hands(table, model)
+
+
+def test_hand_size_change_rebuilds_table():
+    rng = random.Random(2)
+    model = GameModel()
+    model.user_cards = [random_card(rng) for _ in range(5)]
+    model.machine_cards = [random_card(rng) for _ in range(5)]
+    table = MatchupTable()
+    table.sync(model)
+
+    model.user_cards = [random_card(rng) for _ in range(8)]
+    model.machine_cards = [random_card(rng) for _ in range(8)]
+    table.sync(model)
+
+    assert table.hand_size == 8
+    assert table.stats["syncs"] == 2
+    assert_matches_hands(table, model)
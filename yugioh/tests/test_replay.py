@@ -0,0 +1,99 @@
+# tests/test_replay.py
+import json
+
+import pytest
+
+from model.card_catalog import FIXTURE_PATH, CardCatalog
+from model.card_sampler import MonsterSampler
+from model.deck_builder import DeckBuilder
+from model.game_engine import GameEngine, RandomMachinePolicy, RandomUserPolicy
+from model.replay_log import ReplayLog, ReplayMismatch, replay
+from controller.ai_minimax import MinimaxAI
+
+
+@pytest.fixture(scope="module")
+def builder():
+    sampler = MonsterSampler(CardCatalog(db_path=":memory:", fixture_path=FIXTURE_PATH))
+    return sampler, DeckBuilder(sampler=sampler, fetch_row=lambda: None)
+
+
+def play_recorded(builder, seed, path, machine_policy, queue_size=10):
+    sampler, deck_builder = builder
+    sampler.seed(seed)
+    engine = GameEngine(replay=ReplayLog(path, seed=seed))
+    engine.new_game(deck_builder.build(GameEngine.HAND_SIZE, queue_size, queue_size))
+    winner, _ = engine.play_game(RandomUserPolicy(seed, combine_prob=0.3), machine_policy)
+    engine.replay.close()
+    return engine, winner
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_replay_reproduces_game(builder, tmp_path, seed):
+    path = tmp_path / f"{seed}.jsonl"
+    engine, winner = play_recorded(builder, seed, str(path), MinimaxAI(max_depth=2, seed=seed))
+
+    result = replay(ReplayLog.load(str(path)), GameEngine())
+
+    assert result.winner == winner
+    m, r = engine.model, result.engine.model
+    assert (r.user_life, r.machine_life, r.user_score, r.machine_score) == \
+           (m.user_life, m.machine_life, m.user_score, m.machine_score)
+    assert (r.user_can_combine, r.machine_can_combine) == (m.user_can_combine, m.machine_can_combine)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_replay_game_ended_by_deck_exhaustion(builder, tmp_path, seed):
+    # Sin cola (el valor por defecto del juego) la partida suele terminar porque un lado se queda sin cartas
+    path = str(tmp_path / "game.jsonl")
+    engine, winner = play_recorded(builder, seed, path, RandomMachinePolicy(seed + 1), queue_size=0)
+
+    result = replay(ReplayLog.load(path), GameEngine())
+
+    assert result.winner == winner
+    m, r = engine.model, result.engine.model
+    assert (r.user_life, r.machine_life) == (m.user_life, m.machine_life)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_replay_same_policy_has_no_divergences(builder, tmp_path, seed):
+    # La IA ve el mismo estado que en la partida (incluida la fusión del usuario tras una fusión de la IA)
+    path = str(tmp_path / "game.jsonl")
+    play_recorded(builder, seed, path, MinimaxAI(max_depth=3, seed=seed))
+
+    result = replay(ReplayLog.load(path), GameEngine(), machine_policy=MinimaxAI(max_depth=3, seed=seed))
+
+    assert result.decisions > 0
+    assert result.divergences == []
+
+
+def test_machine_fusion_re_enables_user_fusion(builder):
+    # Usuario fusiona y la IA responde fusionando: en el siguiente turno el usuario puede volver a fusionar
+    sampler, deck_builder = builder
+    sampler.seed(1)
+    log = ReplayLog(seed=1)
+    engine = GameEngine(replay=log)
+    engine.new_game(deck_builder.build(GameEngine.HAND_SIZE, 10, 10))
+    engine.combine(True, 0, 1)
+    assert not engine.model.user_can_combine
+    engine.combine(False, 2, 3)
+    assert engine.model.user_can_combine
+
+    result = replay(log, GameEngine())
+
+    replayed = result.engine.model
+    assert (replayed.user_can_combine, replayed.machine_can_combine) == (True, False)
+
+
+def test_replay_detects_tampered_fight(builder, tmp_path):
+    path = tmp_path / "game.jsonl"
+    play_recorded(builder, 5, str(path), RandomMachinePolicy(6))
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    n = next(k for k, line in enumerate(lines) if json.loads(line)[0] == "F")
+    event = json.loads(lines[n])
+    event[6] += 1  # daño al usuario
+    lines[n] = json.dumps(event)
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    with pytest.raises(ReplayMismatch):
+        replay(ReplayLog.load(str(path)), GameEngine())
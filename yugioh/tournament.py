@@ -0,0 +1,212 @@
+# tournament.py
+"""
+Torneo de autojuego sin interfaz: mide qué tan buena es cada política de la máquina.
+
+Cada política de la máquina juega N partidas contra la misma política del usuario y con las
+mismas semillas por partida (comparación pareada). Las partidas se reparten entre todos los
+núcleos con un pool de procesos y se usan solo cartas del fixture local (sin red).
+
+Ejemplos:
+    python tournament.py --games 20000 --machine heuristic random
+    python tournament.py --games 2000 --machine heuristic minimax:3 minimax:4 --workers 4 --json out.json
+
+Políticas de la máquina: random | heuristic | minimax:<profundidad> | anytime:<ms>[:<profundidad>]
+                         | montecarlo:<simulaciones>
+Políticas del usuario:   random[:<probabilidad de combinar>]
+(anytime depende del reloj, así que sus resultados no son reproducibles).
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(current_dir)
+
+from controller.ai_minimax import MinimaxAI
+from controller.ai_montecarlo import MonteCarloAI
+from model.card_catalog import FIXTURE_PATH, CardCatalog
+from model.card_sampler import MonsterSampler
+from model.deck_builder import DeckBuilder
+from model.game_engine import GameEngine, RandomMachinePolicy, RandomUserPolicy
+
+
+# --- Políticas ---
+
+def make_machine_policy(spec, seed):
+    """Crea una política de la máquina desde su nombre (ver el docstring del módulo)."""
+    name, *args = spec.split(":")
+    if name == "random":
+        return RandomMachinePolicy(seed)
+    if name == "heuristic":
+        # La IA de un solo nivel (la del juego con max_depth=1)
+        return MinimaxAI(max_depth=1, tt_size=0, seed=seed)
+    if name == "minimax":
+        depth = int(args[0]) if args else 3
+        return MinimaxAI(max_depth=depth, seed=seed)
+    if name == "anytime":
+        budget = float(args[0]) if args else 50
+        depth = int(args[1]) if len(args) > 1 else 8
+        return MinimaxAI(max_depth=depth, time_budget_ms=budget, seed=seed)
+    if name == "montecarlo":
+        rollouts = int(args[0]) if args else 400
+        return MonteCarloAI(rollouts=rollouts, seed=seed)
+    raise ValueError(f"Política de la máquina desconocida: {spec}")
+
+
+def make_user_policy(spec, seed):
+    name, *args = spec.split(":")
+    if name == "random":
+        return RandomUserPolicy(seed, combine_prob=float(args[0]) if args else 0.1)
+    raise ValueError(f"Política del usuario desconocida: {spec}")
+
+
+def game_seed(base_seed, game):
+    """Semilla de la partida 'game': no depende de qué proceso la juegue."""
+    return (base_seed * 1000003 + game) & 0xFFFFFFFF
+
+
+# --- Trabajo de cada proceso ---
+
+_worker = {}
+
+
+def _offline_row():
+    # Sin red: si el fixture no alcanza, la carta simplemente falta
+    return None
+
+
+def _init_worker(fixture_path):
+    catalog = CardCatalog(db_path=":memory:", fixture_path=fixture_path)
+    sampler = MonsterSampler(catalog)
+    _worker["sampler"] = sampler
+    _worker["builder"] = DeckBuilder(sampler=sampler, fetch_row=_offline_row)
+    _worker["engine"] = GameEngine()
+
+
+def _play_chunk(task):
+    """Juega las partidas [start, stop) de una política. Retorna los totales del bloque."""
+    machine_spec, user_spec, base_seed, start, stop, queue_size, max_turns = task
+    sampler, builder, engine = _worker["sampler"], _worker["builder"], _worker["engine"]
+    totals = {"games": 0, "machine": 0, "user": 0, "unfinished": 0, "turns": 0, "turns_sq": 0}
+
+    for game in range(start, stop):
+        seed = game_seed(base_seed, game)
+        # Todo lo aleatorio de la partida sale de esta semilla (mazo, usuario y máquina)
+        sampler.seed(seed)
+        engine.new_game(builder.build(GameEngine.HAND_SIZE, queue_size, queue_size))
+        # Políticas nuevas por partida: sin estado (tabla de transposición) de partidas anteriores
+        winner, turns = engine.play_game(make_user_policy(user_spec, seed),
+                                         make_machine_policy(machine_spec, seed + 1), max_turns)
+
+        totals["games"] += 1
+        totals[winner or "unfinished"] += 1
+        totals["turns"] += turns
+        totals["turns_sq"] += turns * turns
+    return machine_spec, totals
+
+
+# --- Estadística ---
+
+def wilson_interval(wins, n, z=1.96):
+    """Intervalo de confianza (95% por defecto) de una proporción, método de Wilson."""
+    if n == 0:
+        return 0.0, 0.0
+    p = wins / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return center - half, center + half
+
+
+def summarize(totals, z=1.96):
+    n = totals["games"]
+    mean = totals["turns"] / n if n else 0.0
+    var = totals["turns_sq"] / n - mean * mean if n else 0.0
+    half = z * math.sqrt(max(var, 0.0) / n) if n else 0.0
+    low, high = wilson_interval(totals["machine"], n, z)
+    return {
+        "games": n,
+        "machine_wins": totals["machine"],
+        "user_wins": totals["user"],
+        "unfinished": totals["unfinished"],
+        "machine_win_rate": totals["machine"] / n if n else 0.0,
+        "machine_win_rate_ci": [low, high],
+        "mean_turns": mean,
+        "mean_turns_ci": [mean - half, mean + half],
+    }
+
+
+# --- Torneo ---
+
+def run_tournament(machine_specs, user_spec="random", games=1000, seed=0, workers=None,
+                   queue_size=8, max_turns=1000, chunk_size=250, fixture_path=FIXTURE_PATH):
+    """
+    Juega 'games' partidas por cada política de la máquina y retorna {política: resumen}.
+    Con workers=1 todo corre en este proceso (útil para depurar).
+    """
+    for spec in machine_specs:
+        make_machine_policy(spec, 0)
+    make_user_policy(user_spec, 0)
+
+    tasks = [(spec, user_spec, seed, start, min(start + chunk_size, games), queue_size, max_turns)
+             for spec in machine_specs for start in range(0, games, chunk_size)]
+    totals = {spec: {"games": 0, "machine": 0, "user": 0, "unfinished": 0, "turns": 0, "turns_sq": 0}
+              for spec in machine_specs}
+
+    def add(result):
+        spec, part = result
+        for key, value in part.items():
+            totals[spec][key] += value
+
+    if workers == 1:
+        _init_worker(fixture_path)
+        for task in tasks:
+            add(_play_chunk(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(fixture_path,)) as pool:
+            for result in pool.map(_play_chunk, tasks):
+                add(result)
+
+    return {spec: summarize(totals[spec]) for spec in machine_specs}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Torneo de autojuego entre políticas de la IA.")
+    parser.add_argument("--games", type=int, default=1000, help="partidas por política de la máquina")
+    parser.add_argument("--machine", nargs="+", default=["heuristic", "random"], help="políticas de la máquina")
+    parser.add_argument("--user", default="random", help="política del usuario")
+    parser.add_argument("--seed", type=int, default=0, help="semilla base (cada partida deriva la suya)")
+    parser.add_argument("--workers", type=int, default=None, help="procesos (por defecto todos los núcleos)")
+    parser.add_argument("--queue", type=int, default=8, help="tamaño de la cola de cada jugador")
+    parser.add_argument("--max-turns", type=int, default=1000, help="turnos máximos por partida")
+    parser.add_argument("--chunk", type=int, default=250, help="partidas por tarea enviada a cada proceso")
+    parser.add_argument("--fixture", default=FIXTURE_PATH, help="fixture JSON de cartas (formato ygoprodeck)")
+    parser.add_argument("--json", help="guarda los resultados en este archivo")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = run_tournament(args.machine, args.user, args.games, args.seed, args.workers,
+                             args.queue, args.max_turns, args.chunk, args.fixture)
+    elapsed = time.perf_counter() - start
+    total_games = args.games * len(args.machine)
+
+    print(f"Usuario: {args.user} | {args.games} partidas por política | semilla {args.seed}")
+    print(f"{'máquina':<16}{'gana IA':>10}{'IC 95%':>18}{'turnos':>10}{'sin fin':>9}")
+    for spec, r in results.items():
+        low, high = r["machine_win_rate_ci"]
+        print(f"{spec:<16}{r['machine_win_rate']:>10.1%}{f'[{low:.1%}, {high:.1%}]':>18}"
+              f"{r['mean_turns']:>10.2f}{r['unfinished']:>9}")
+    print(f"{total_games} partidas en {elapsed:.1f} s ({total_games / elapsed * 60:,.0f} partidas/min)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "elapsed_s": elapsed, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,15 @@
 # view/game_view.py
 import customtkinter as ctk
 from PIL import Image, ImageTk
-import requests
-from io import BytesIO
+
+from model.instrumentation import traced
+from view.image_loader import get_image_loader
+from view.image_prefetcher import ImagePrefetcher
+
+# Tamaños de imagen de los slots (las miniaturas de cada carta se generan para estos)
+HAND_IMG_SIZE = (110, 150)
+QUEUE_IMG_SIZE = (90, 130)
+SLOT_IMG_SIZES = (HAND_IMG_SIZE, QUEUE_IMG_SIZE)
 
 
 class CardSlot:
@@ -66,8 +73,13 @@ class CardSlot:
             self.radio.configure(state="disabled")
 
         self.img_cache = None
+        # Carta que muestra el slot (None = vacío) y si su imagen real ya está puesta
+        self.card = None
+        self.image_ready = False
 
+    @traced("view.card_slot.update")
     def update(self, card, card_life=None):
+        self.card = card
         if self.name_label:
             self.name_label.configure(text=card.name)
         if self.atk_label:
@@ -75,20 +87,16 @@ class CardSlot:
         if self.def_label:
             self.def_label.configure(text="DEF: "+str(card.defe))
 
-        try:
-            img_data = requests.get(card.img_url).content
-            pil_img = Image.open(BytesIO(img_data))
-            
-            # Usamos CTkImage en lugar de ImageTk.PhotoImage para mejor calidad en HighDPI
-            self.img_cache = ctk.CTkImage(
-                light_image=pil_img,
-                dark_image=pil_img,
-                size=self.img_size 
-            )
-
+        # La imagen se carga en segundo plano; mientras tanto se ve un placeholder
+        loader = get_image_loader(self.frame)
+        self.image_ready = False
+        if not card.img_url:
+            loader.cancel(self)
+            self.img_cache = loader.placeholder(self.img_size)
+            self.img_label.configure(image=self.img_cache)
+        elif not loader.request(self, card.img_url, self.img_size, self._set_image):
+            self.img_cache = loader.placeholder(self.img_size)
             self.img_label.configure(image=self.img_cache)
-        except Exception as e:
-            print(f"Error cargando imagen: {e}")
 
         # if self.radio:
         #     self.radio.configure(state="normal")
@@ -97,6 +105,68 @@ class CardSlot:
         if card_life is not None:
             self.update_life(card_life)
             
+    def _set_image(self, ctk_img):
+        """Callback del loader (siempre en el hilo de Tk)."""
+        self.img_cache = ctk_img
+        self.image_ready = True
+        self.img_label.configure(image=self.img_cache)
+
+    def show(self, card):
+        """
+        Muestra la carta (o vacía el slot con None) solo si cambió.
+        Retorna True si hubo que tocar los widgets.
+        """
+        if card is self.card:
+            return False
+        if card is None:
+            self.clear()
+        else:
+            self.update(card)
+        return True
+
+    def take_from(self, other):
+        """
+        Copia lo que muestra otro slot del mismo tamaño (para correr la cola un lugar):
+        si su imagen ya llegó se reutiliza tal cual, sin pasar por el loader.
+        """
+        if other.card is None:
+            return self.show(None)
+        if other.card is self.card:
+            return False
+        if not other.image_ready or tuple(other.img_size) != tuple(self.img_size):
+            self.update(other.card)
+            return True
+        self.cancel_image_load()
+        self.card = other.card
+        if self.name_label:
+            self.name_label.configure(text=other.card.name)
+        if self.atk_label:
+            self.atk_label.configure(text="ATK: "+str(other.card.atk))
+        if self.def_label:
+            self.def_label.configure(text="DEF: "+str(other.card.defe))
+        self._set_image(other.img_cache)
+        return True
+
+    def clear(self):
+        """Vacía el slot (sin imagen ni textos); si ya estaba vacío no hace nada."""
+        self.cancel_image_load()
+        if self.card is None and not self.image_ready and self.img_cache is None:
+            return
+        self.card = None
+        self.image_ready = False
+        self.img_cache = None
+        if self.name_label:
+            self.name_label.configure(text="")
+        if self.atk_label:
+            self.atk_label.configure(text="")
+        if self.def_label:
+            self.def_label.configure(text="")
+        self.img_label.configure(image=None)
+
+    def cancel_image_load(self):
+        """Descarta la imagen pendiente para que no pise un slot que se vació."""
+        get_image_loader(self.frame).cancel(self)
+
     # --- NUEVO MÉTODO: Controlar la selección visual ---
     def set_selected(self, selected):
         self.is_selected = selected
@@ -134,6 +204,10 @@ class CardSlot:
             if self.radio:
                 self.radio.configure(state="disabled")
             
+            self.cancel_image_load()
+            self.card = None
+            self.image_ready = False
+
             # Limpiar la selección visual al deshabilitar
             self.frame.configure(border_width=0, border_color="transparent")
             self.img_label.configure(image=None)
@@ -152,6 +226,11 @@ class GameView(ctk.CTkFrame):
         super().__init__(parent)
         self.pack(fill="both", expand=True)
 
+        # Miniaturas por carta para cada tamaño de slot (al doble en pantallas HiDPI)
+        scale = 2 if ctk.ScalingTracker.get_window_scaling(self) > 1 else 1
+        get_image_loader(self).cache.set_variant_sizes(SLOT_IMG_SIZES, scale=scale)
+        self.prefetcher = ImagePrefetcher(get_image_loader(self))
+
         self.grid_rowconfigure(2, weight=1)
         # la fila 3 contiene los radios/segunda fila de los slots
         self.grid_rowconfigure(3, weight=0)
@@ -206,7 +285,7 @@ class GameView(ctk.CTkFrame):
         self.machine_var = ctk.IntVar(value=-1)
 
         # Cinco slots en la misma fila, cartas más pequeñas para que quepan
-        small_size = (110, 150)
+        small_size = HAND_IMG_SIZE
         
         self.user_slots = [
             CardSlot(self, 3, 1, variable=self.user_var, value=0, show_life_bar=False, img_size=small_size, is_user_slot=True, controller=self),
@@ -236,8 +315,8 @@ class GameView(ctk.CTkFrame):
         self.grid_rowconfigure(7, weight=0)
 
         # colocar las colas en los laterales - 4 cartas visibles por lado (más pequeñas)
-        self.user_queue_slots = [CardSlot(self, 3 + i, 0, show_radio=False, img_size=(90, 130), show_labels=False) for i in range(4)]
-        self.machine_queue_slots = [CardSlot(self, 3 + i, 12, show_radio=False, img_size=(90, 130), show_labels=False) for i in range(4)]
+        self.user_queue_slots = [CardSlot(self, 3 + i, 0, show_radio=False, img_size=QUEUE_IMG_SIZE, show_labels=False) for i in range(4)]
+        self.machine_queue_slots = [CardSlot(self, 3 + i, 12, show_radio=False, img_size=QUEUE_IMG_SIZE, show_labels=False) for i in range(4)]
 
         try:
             self.lblUserQueue = ctk.CTkLabel(self, text="Cola usuario")
@@ -324,6 +403,13 @@ class GameView(ctk.CTkFrame):
         if hasattr(self, 'controller') and self.controller:
             self.controller.handle_card_selection_for_fusion(slot_index)
             
+    def prefetch_hand_images(self, urls):
+        """Precarga (en orden) las imágenes de cartas que van a entrar a la mano."""
+        return self.prefetcher.want((url, HAND_IMG_SIZE) for url in urls)
+
+    def cancel_prefetch(self):
+        self.prefetcher.cancel()
+
     def update_card_selection(self, selected_indices):
         """Actualiza la visualización de la selección de cartas."""
         for i, slot in enumerate(self.user_slots):
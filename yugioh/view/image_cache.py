@@ -0,0 +1,215 @@
+# view/image_cache.py
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import customtkinter as ctk
+from PIL import Image
+
+from model.http_client import get_http_client
+from model.instrumentation import traced
+
+# Carpeta donde se guardan las imágenes descargadas (junto al catálogo de cartas)
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "model", "data", "images"
+)
+
+# Escalas de las miniaturas que se guardan por carta (2 = pantallas HiDPI)
+VARIANT_SCALES = (1, 2)
+VARIANT_QUALITY = 90
+
+
+class ImageCache:
+    """
+    Caché de imágenes en dos niveles:
+    1. Disco: los bytes originales, guardados con el hash de la URL como nombre, y al lado
+       las miniaturas ya redimensionadas (una por tamaño de slot y escala, en variants/).
+       La imagen completa se decodifica una sola vez por carta, cuando se generan las miniaturas.
+    2. Memoria: LRU de CTkImage ya decodificadas y redimensionadas, clave (url, tamaño).
+
+    'scale' es la escala de la pantalla: con 2 se cargan las miniaturas al doble de resolución
+    y la CTkImage las dibuja al tamaño lógico del slot.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=64 * 1024 * 1024, timeout=(5, 10),
+                 variant_sizes=(), scale=1, client=None):
+        self.cache_dir = cache_dir
+        self.client = client or get_http_client()
+        self.variant_dir = os.path.join(cache_dir, "variants")
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.variant_sizes = [tuple(size) for size in variant_sizes]
+        self.scale = scale
+        os.makedirs(self.variant_dir, exist_ok=True)
+
+        self._memory = OrderedDict()  # (url, size) -> (CTkImage, bytes_aprox)
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "hits": 0,          # CTkImage servida desde memoria
+            "misses": 0,        # no estaba en memoria (load_pil)
+            "disk_hits": 0,     # bytes leídos del disco
+            "downloads": 0,     # bytes descargados por HTTP
+            "evictions": 0,     # entradas sacadas de memoria por el presupuesto
+            "variant_hits": 0,  # miniatura leída del disco (sin tocar la imagen completa)
+            "variants_built": 0,  # miniaturas generadas a partir de la imagen completa
+        }
+
+    def set_variant_sizes(self, sizes, scale=None):
+        """Tamaños de slot (lógicos) para los que se generan miniaturas al ver cada carta nueva."""
+        self.variant_sizes = [tuple(size) for size in sizes]
+        if scale is not None and scale != self.scale:
+            # Las imágenes en memoria son de la otra escala
+            self.scale = scale
+            self.clear_memory()
+
+    # --- Nivel 1: disco ---
+
+    def path_for(self, url):
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest)
+
+    @traced("image.get_bytes")
+    def get_bytes(self, url):
+        """Retorna los bytes de la imagen, descargándola solo si no está en disco."""
+        path = self.path_for(url)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                data = f.read()
+            with self._lock:
+                self.stats["disk_hits"] += 1
+            return data
+
+        # Reintentos, límite de peticiones y errores HTTP los maneja el cliente compartido
+        data = self.client.get(url, timeout=self.timeout).content
+
+        # Escritura atómica: otro hilo nunca ve un archivo a medias
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self.stats["downloads"] += 1
+        return data
+
+    # --- Miniaturas ---
+
+    def pixel_size(self, size):
+        """Tamaño real en píxeles de la imagen para un slot de tamaño lógico 'size'."""
+        return (size[0] * self.scale, size[1] * self.scale)
+
+    def variant_path(self, url, pixel_size):
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.variant_dir, f"{digest}_{pixel_size[0]}x{pixel_size[1]}.jpg")
+
+    def build_variants(self, url, extra=()):
+        """
+        Decodifica la imagen completa una vez y guarda todas sus miniaturas
+        (cada tamaño registrado en cada escala de VARIANT_SCALES, más los de 'extra').
+        Retorna {tamaño_en_píxeles: imagen PIL}.
+        """
+        targets = {(w * k, h * k) for (w, h) in self.variant_sizes for k in VARIANT_SCALES}
+        targets.update(tuple(size) for size in extra)
+        if not targets:
+            return {}
+
+        pil_img = Image.open(BytesIO(self.get_bytes(url)))
+        # JPEG: el decodificador reduce por potencias de 2 mientras lee (mucho más rápido)
+        pil_img.draft("RGB", max(targets, key=lambda s: s[0] * s[1]))
+        pil_img = pil_img.convert("RGB")
+
+        variants = {}
+        for size in targets:
+            if pil_img.size == size:
+                variant = pil_img
+            else:
+                variant = pil_img.resize(size, Image.LANCZOS, reducing_gap=2.0)
+            path = self.variant_path(url, size)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            variant.save(tmp_path, "JPEG", quality=VARIANT_QUALITY)
+            os.replace(tmp_path, path)
+            variants[size] = variant
+
+        with self._lock:
+            self.stats["variants_built"] += len(variants)
+        return variants
+
+    # --- Nivel 2: memoria ---
+
+    def peek(self, url, size):
+        """Retorna la CTkImage si ya está en memoria (sin I/O ni decodificación), o None."""
+        key = (url, tuple(size))
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            self._memory.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[0]
+
+    @traced("image.load_pil")
+    def load_pil(self, url, size):
+        """Imagen lista para el slot de tamaño 'size' (en píxeles: size * scale). Se llama solo si no estaba en memoria."""
+        with self._lock:
+            self.stats["misses"] += 1
+        pixel_size = self.pixel_size(size)
+        path = self.variant_path(url, pixel_size)
+        if os.path.exists(path):
+            with Image.open(path) as variant:
+                pil_img = variant.convert("RGB")
+            with self._lock:
+                self.stats["variant_hits"] += 1
+            return pil_img
+        return self.build_variants(url, extra=(pixel_size,))[pixel_size]
+
+    def put(self, url, size, pil_img):
+        """Crea la CTkImage (de tamaño lógico size) para pil_img y la guarda en la LRU."""
+        key = (url, tuple(size))
+        ctk_img = ctk.CTkImage(light_image=pil_img, dark_image=pil_img, size=tuple(size))
+        nbytes = pil_img.width * pil_img.height * len(pil_img.getbands())
+
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= old[1]
+            self._memory[key] = (ctk_img, nbytes)
+            self._memory_bytes += nbytes
+
+            # Respetar el presupuesto de memoria sacando las menos usadas
+            while self._memory_bytes > self.max_bytes and len(self._memory) > 1:
+                _, (_, evicted_bytes) = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted_bytes
+                self.stats["evictions"] += 1
+
+        return ctk_img
+
+    def get_image(self, url, size):
+        """Retorna la CTkImage para (url, size). Repetir una carta ya mostrada no hace I/O."""
+        ctk_img = self.peek(url, size)
+        if ctk_img is not None:
+            return ctk_img
+        return self.put(url, size, self.load_pil(url, size))
+
+    def memory_usage(self):
+        with self._lock:
+            return {"entries": len(self._memory), "bytes": self._memory_bytes, "max_bytes": self.max_bytes}
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+
+_shared_cache = None
+
+
+def get_image_cache():
+    """Caché compartida por todos los CardSlot."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = ImageCache()
+    return _shared_cache
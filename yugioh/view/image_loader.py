@@ -0,0 +1,134 @@
+# view/image_loader.py
+import itertools
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import customtkinter as ctk
+from PIL import Image
+
+from model.instrumentation import traced
+from view.image_cache import get_image_cache
+
+PLACEHOLDER_COLOR = "#3a3a3a"
+
+
+class AsyncImageLoader:
+    """
+    Carga imágenes fuera del hilo de Tk.
+    Los hilos del pool solo descargan y decodifican (PIL); la CTkImage se crea y se
+    entrega en el hilo de Tk, que revisa los resultados con after().
+    """
+
+    def __init__(self, root, cache=None, max_workers=8, poll_ms=16, frame_budget_ms=8):
+        self.root = root
+        self.cache = cache or get_image_cache()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="img")
+        self.poll_ms = poll_ms
+        self.frame_budget = frame_budget_ms / 1000.0
+
+        self._results = queue.Queue()
+        self._tokens = itertools.count(1)
+        self._pending = {}  # owner -> [token, callback, future, errback]
+        self._polling = False
+        self._placeholders = {}
+
+    def placeholder(self, size):
+        """Imagen gris del tamaño del slot para mostrar mientras llega la real."""
+        size = tuple(size)
+        if size not in self._placeholders:
+            pil_img = Image.new("RGB", size, PLACEHOLDER_COLOR)
+            self._placeholders[size] = ctk.CTkImage(light_image=pil_img, dark_image=pil_img, size=size)
+        return self._placeholders[size]
+
+    def request(self, owner, url, size, callback, errback=None):
+        """
+        Pide la imagen (url, size) para 'owner' (normalmente un CardSlot).
+        Si el owner pide otra imagen antes de que llegue esta, la anterior se descarta.
+        Retorna True si la imagen ya estaba en memoria y se entregó de inmediato.
+        errback(error) se llama (en el hilo de Tk) si la carga falla.
+        """
+        self.cancel(owner)
+
+        ctk_img = self.cache.peek(url, size)
+        if ctk_img is not None:
+            callback(ctk_img)
+            return True
+
+        # Registramos el pedido ANTES de enviarlo al pool: el hilo verifica que siga vigente
+        token = next(self._tokens)
+        entry = [token, callback, None, errback]
+        self._pending[owner] = entry
+        entry[2] = self.executor.submit(self._work, owner, token, url, tuple(size))
+        self._ensure_polling()
+        return False
+
+    def cancel(self, owner):
+        """Cancela la carga pendiente del owner (si el hilo aún no empezó, ni se descarga)."""
+        entry = self._pending.pop(owner, None)
+        if entry and entry[2] is not None:
+            entry[2].cancel()
+
+    def _is_current(self, owner, token):
+        entry = self._pending.get(owner)
+        return entry is not None and entry[0] == token
+
+    def _work(self, owner, token, url, size):
+        """Se ejecuta en un hilo del pool."""
+        # El slot ya cambió de carta: no vale la pena descargar
+        if not self._is_current(owner, token):
+            return
+        try:
+            pil_img = self.cache.load_pil(url, size)
+            self._results.put((owner, token, url, size, pil_img, None))
+        except Exception as e:
+            self._results.put((owner, token, url, size, None, e))
+
+    def _ensure_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+
+    @traced("view.image_loader.poll")
+    def _poll(self):
+        """Entrega resultados en el hilo de Tk sin pasarse del presupuesto por frame."""
+        start = time.perf_counter()
+        while time.perf_counter() - start < self.frame_budget:
+            try:
+                owner, token, url, size, pil_img, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            if not self._is_current(owner, token):
+                continue  # resultado viejo: el slot ya muestra otra carta
+            _, callback, _, errback = self._pending.pop(owner)
+
+            if error is not None:
+                print(f"Error cargando imagen: {error}")
+                if errback is not None:
+                    errback(error)
+                continue
+            callback(self.cache.put(url, size, pil_img))
+
+        if self._pending or not self._results.empty():
+            self.root.after(self.poll_ms, self._poll)
+        else:
+            self._polling = False
+
+    def pending_count(self):
+        return len(self._pending)
+
+    def shutdown(self):
+        self._pending.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_shared_loader = None
+
+
+def get_image_loader(widget):
+    """Loader compartido por todos los CardSlot de la ventana."""
+    global _shared_loader
+    if _shared_loader is None:
+        _shared_loader = AsyncImageLoader(widget.winfo_toplevel())
+    return _shared_loader
@@ -0,0 +1,79 @@
+# view/image_prefetcher.py
+from collections import deque
+
+from model.instrumentation import traced
+
+
+class ImagePrefetcher:
+    """
+    Precarga en segundo plano las imágenes que se van a necesitar pronto
+    (las próximas cartas de las colas al tamaño de la mano, el arte de la próxima fusión),
+    para que al reponer un slot la imagen ya esté en la caché de memoria.
+
+    - Usa el mismo AsyncImageLoader que los CardSlot, con a lo sumo 'max_in_flight'
+      pedidos a la vez para no quitarle hilos a las imágenes visibles.
+    - want() reemplaza la lista de deseos: lo que ya no está en ella se cancela.
+    - cancel() descarta todo (al reiniciar la partida o cambiar el tamaño de las colas).
+    """
+
+    def __init__(self, loader, max_in_flight=2):
+        self.loader = loader
+        self.max_in_flight = max_in_flight
+        self._queued = deque()   # (url, size) esperando turno
+        self._in_flight = set()  # (url, size) pedidos al loader
+        self.stats = {"requested": 0, "already_cached": 0, "loaded": 0, "cancelled": 0, "errors": 0}
+
+    @traced("view.prefetch.want")
+    def want(self, items):
+        """items: (url, size) en orden de prioridad. Retorna cuántos quedaron pendientes."""
+        wanted = []
+        seen = set()
+        for url, size in items:
+            key = (url, tuple(size))
+            if url and key not in seen:
+                seen.add(key)
+                wanted.append(key)
+
+        # Lo que dejó de interesar se cancela (si el hilo no empezó, ni se descarga)
+        for key in list(self._in_flight):
+            if key not in seen:
+                self._drop(key)
+
+        self._queued = deque(key for key in wanted
+                             if key not in self._in_flight and self.loader.cache.peek(*key) is None)
+        self.stats["already_cached"] += len(wanted) - len(self._queued) - len(self._in_flight)
+        self._pump()
+        return len(self._queued) + len(self._in_flight)
+
+    def cancel(self):
+        for key in list(self._in_flight):
+            self._drop(key)
+        self.stats["cancelled"] += len(self._queued)
+        self._queued.clear()
+
+    def pending_count(self):
+        return len(self._queued) + len(self._in_flight)
+
+    def _owner(self, key):
+        # Cada precarga es su propio "owner" en el loader, así se puede cancelar por separado
+        return ("prefetch",) + key
+
+    def _drop(self, key):
+        self._in_flight.discard(key)
+        self.loader.cancel(self._owner(key))
+        self.stats["cancelled"] += 1
+
+    def _pump(self):
+        while self._queued and len(self._in_flight) < self.max_in_flight:
+            key = self._queued.popleft()
+            self._in_flight.add(key)
+            self.stats["requested"] += 1
+            done = lambda _img, key=key: self._finish(key, "loaded")
+            failed = lambda _error, key=key: self._finish(key, "errors")
+            self.loader.request(self._owner(key), key[0], key[1], done, failed)
+
+    def _finish(self, key, outcome):
+        if key in self._in_flight:
+            self._in_flight.discard(key)
+            self.stats[outcome] += 1
+        self._pump()